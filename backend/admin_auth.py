@@ -0,0 +1,26 @@
+"""
+Admin Authorization
+Operational endpoints (profiler output and the like) require the shared
+ADMIN_API_TOKEN as a bearer token. With no token configured they are off.
+"""
+from flask import current_app, jsonify, request
+from functools import wraps
+import hmac
+
+def _request_token():
+    header = request.headers.get('Authorization', '')
+    if header.lower().startswith('bearer '):
+        return header[7:].strip()
+    return request.headers.get('X-Admin-Token', '')
+
+def require_admin_token(view):
+    """Reject the request unless it carries ADMIN_API_TOKEN"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        expected = current_app.config.get('ADMIN_API_TOKEN') or ''
+        if not expected:
+            return jsonify({'error': 'Admin API is disabled (ADMIN_API_TOKEN is not set)'}), 403
+        if not hmac.compare_digest(_request_token().encode(), expected.encode()):
+            return jsonify({'error': 'Invalid admin token'}), 401
+        return view(*args, **kwargs)
+    return wrapper
@@ -1,8 +1,9 @@
 from flask import Flask
 from flask_cors import CORS
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from dotenv import load_dotenv
+import click
+import logging
 import os
 import sys
 
@@ -12,12 +13,28 @@ load_dotenv()
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backend.db_routing import RoutingSession, engine_options, init_db_routing
+from backend.json_provider import FastJSONProvider
+from backend.schema import MIGRATIONS_DIRECTORY, init_schema
+
 # Initialize extensions
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def init_migrate(app):
+    """
+    Register Flask-Migrate's `flask db` commands
+
+    Alembic is only imported when create_app runs under the `flask` CLI;
+    web workers never need it.
+    """
+    if click.get_current_context(silent=True) is None:
+        return None
+    from flask_migrate import Migrate
+    return Migrate(app, db, directory=MIGRATIONS_DIRECTORY)
 
 def create_app():
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Configuration
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
@@ -25,28 +42,172 @@ def create_app():
         'postgresql://aarush@localhost/tokenchamp'  # Using local user (no password)
     )
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    
+    # Connection pool (sizing is ignored for SQLite)
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', '10'))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+    app.config['DB_POOL_TIMEOUT'] = int(os.getenv('DB_POOL_TIMEOUT', '30'))  # seconds to wait for a connection
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # seconds
+    app.config['DB_POOL_PRE_PING'] = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    app.config['DB_STATEMENT_TIMEOUT_MS'] = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000'))  # PostgreSQL only, 0 disables
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'], app.config)
+    
+    # Optional read replica for GET requests
+    app.config['DATABASE_REPLICA_URL'] = os.getenv('DATABASE_REPLICA_URL', '')
+    app.config['DB_REPLICA_STICKY_SECONDS'] = int(os.getenv('DB_REPLICA_STICKY_SECONDS', '5'))  # primary reads after a client's write
+    if app.config['DATABASE_REPLICA_URL']:
+        replica_url = app.config['DATABASE_REPLICA_URL']
+        app.config['SQLALCHEMY_BINDS'] = {'replica': {'url': replica_url, **engine_options(replica_url, app.config)}}
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-change-me')
     app.config['SOLANA_NETWORK'] = os.getenv('SOLANA_NETWORK', 'devnet')
     app.config['SOLANA_PRIVATE_KEY'] = os.getenv('SOLANA_PRIVATE_KEY', '')
+    app.config['SOLANA_RPC_URL'] = os.getenv('SOLANA_RPC_URL', '')  # overrides the SOLANA_NETWORK endpoint
+    
+    # Tournament registration passwords
+    app.config['TOURNAMENT_PASSWORD_METHOD'] = os.getenv('TOURNAMENT_PASSWORD_METHOD', 'pbkdf2:sha256:600000')
+    app.config['REGISTRATION_TICKET_TTL'] = int(os.getenv('REGISTRATION_TICKET_TTL', '900'))  # seconds
+    
+    # Standings points per match result
+    app.config['STANDINGS_POINTS_WIN'] = int(os.getenv('STANDINGS_POINTS_WIN', '3'))
+    app.config['STANDINGS_POINTS_DRAW'] = int(os.getenv('STANDINGS_POINTS_DRAW', '1'))
+    app.config['STANDINGS_POINTS_LOSS'] = int(os.getenv('STANDINGS_POINTS_LOSS', '0'))
+    
+    # List endpoint pages (?limit=&cursor=)
+    app.config['PAGE_SIZE_DEFAULT'] = int(os.getenv('PAGE_SIZE_DEFAULT', '50'))
+    app.config['PAGE_SIZE_MAX'] = int(os.getenv('PAGE_SIZE_MAX', '200'))
+    
+    # Search (GET /api/search)
+    app.config['SEARCH_MIN_SIMILARITY'] = float(os.getenv('SEARCH_MIN_SIMILARITY', '0.4'))  # share of a query word's trigrams a match must contain
+    app.config['SEARCH_RESULTS_DEFAULT'] = int(os.getenv('SEARCH_RESULTS_DEFAULT', '10'))  # per kind
+    app.config['SEARCH_RESULTS_MAX'] = int(os.getenv('SEARCH_RESULTS_MAX', '50'))
+    app.config['SEARCH_PREWARM'] = os.getenv('SEARCH_PREWARM', 'true').lower() == 'true'  # build the SQLite index in the background
+    
+    # Per-winner badge rendering (GET /badges/<file>)
+    app.config['BADGE_RENDER_ENABLED'] = os.getenv('BADGE_RENDER_ENABLED', 'true').lower() == 'true'  # off: mint with the tournament badge
+    app.config['BADGE_RENDER_DIR'] = os.getenv('BADGE_RENDER_DIR') or os.path.join(app.instance_path, 'badges')
+    app.config['BADGE_RENDER_WORKERS'] = int(os.getenv('BADGE_RENDER_WORKERS', '2'))  # render processes
+    app.config['BADGE_RENDER_SIZE'] = int(os.getenv('BADGE_RENDER_SIZE', '1024'))  # pixels
+    app.config['BADGE_THUMBNAIL_SIZES'] = [int(size) for size in os.getenv('BADGE_THUMBNAIL_SIZES', '512,256,128').split(',') if size]
+    app.config['BADGE_RENDER_TIMEOUT'] = int(os.getenv('BADGE_RENDER_TIMEOUT', '60'))  # seconds a mint waits for its badge
+    
+    # Response cache: memory (per process), redis (shared) or none
+    app.config['CACHE_BACKEND'] = os.getenv('CACHE_BACKEND', 'memory')
+    app.config['CACHE_DEFAULT_TTL'] = int(os.getenv('CACHE_DEFAULT_TTL', '60'))  # seconds
+    app.config['CACHE_LIST_REFRESH'] = int(os.getenv('CACHE_LIST_REFRESH', '60'))  # seconds team counts and search may lag team writes
+    app.config['CACHE_MAX_ENTRIES'] = int(os.getenv('CACHE_MAX_ENTRIES', '1024'))
+    app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    
+    # Live events (GET /api/events)
+    app.config['EVENTS_MAX_SUBSCRIBERS'] = int(os.getenv('EVENTS_MAX_SUBSCRIBERS', '10000'))  # per process
+    app.config['EVENTS_QUEUE_SIZE'] = int(os.getenv('EVENTS_QUEUE_SIZE', '100'))  # undelivered events per stream
+    app.config['EVENTS_REPLAY_SIZE'] = int(os.getenv('EVENTS_REPLAY_SIZE', '1000'))  # kept for Last-Event-ID
+    app.config['EVENTS_HEARTBEAT_SECONDS'] = int(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15'))
+    
+    # Mint job queue
+    app.config['MINT_WORKER_CONCURRENCY'] = int(os.getenv('MINT_WORKER_CONCURRENCY', '2'))  # 0 disables workers in this process
+    app.config['MINT_MAX_ATTEMPTS'] = int(os.getenv('MINT_MAX_ATTEMPTS', '5'))
+    app.config['MINT_VISIBILITY_TIMEOUT'] = int(os.getenv('MINT_VISIBILITY_TIMEOUT', '300'))  # seconds
+    app.config['MINT_POLL_INTERVAL'] = float(os.getenv('MINT_POLL_INTERVAL', '5'))  # seconds
+    app.config['MINT_RETRY_BACKOFF'] = int(os.getenv('MINT_RETRY_BACKOFF', '30'))  # seconds
+    app.config['MINT_RETRY_BACKOFF_MAX'] = int(os.getenv('MINT_RETRY_BACKOFF_MAX', '900'))  # seconds
+    app.config['MINT_BATCH_MAX'] = int(os.getenv('MINT_BATCH_MAX', '200'))  # winners per /api/nft/mint-batch call
+    app.config['MINT_BATCH_TIMEOUT'] = int(os.getenv('MINT_BATCH_TIMEOUT', '240'))  # seconds, keep below the server's request timeout
+    
+    # Mint reconciliation against the chain
+    app.config['MINT_RECONCILE_INTERVAL'] = int(os.getenv('MINT_RECONCILE_INTERVAL', '600'))  # seconds, 0 disables
+    app.config['MINT_RECONCILE_BATCH'] = int(os.getenv('MINT_RECONCILE_BATCH', '1000'))  # winners checked per pass
+    app.config['MINT_CONFIRM_COMMITMENT'] = os.getenv('MINT_CONFIRM_COMMITMENT', 'finalized')
+    app.config['MINT_DROP_AFTER'] = int(os.getenv('MINT_DROP_AFTER', '600'))  # seconds before an unknown signature counts as dropped
+    
+    # On-chain NFT holder index (GET /api/winner/by-wallet)
+    app.config['HOLDER_INDEX_INTERVAL'] = int(os.getenv('HOLDER_INDEX_INTERVAL', '300'))  # seconds, 0 disables
+    app.config['HOLDER_INDEX_BATCH'] = int(os.getenv('HOLDER_INDEX_BATCH', '5000'))  # NFTs checked per pass
+    app.config['HOLDER_INDEX_COMMITMENT'] = os.getenv('HOLDER_INDEX_COMMITMENT', 'confirmed')
+    
+    # Observability
+    app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'  # GET /metrics
+    app.config['LOG_LEVEL'] = os.getenv('LOG_LEVEL', 'INFO')
+    app.config['ADMIN_API_TOKEN'] = os.getenv('ADMIN_API_TOKEN', '')  # bearer token for operational admin endpoints
+    logging.basicConfig(level=app.config['LOG_LEVEL'], format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    
+    # Slow query profiler (GET /api/admin/slow-queries)
+    app.config['SLOW_QUERY_ENABLED'] = os.getenv('SLOW_QUERY_ENABLED', 'false').lower() == 'true'
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = int(os.getenv('SLOW_QUERY_THRESHOLD_MS', '200'))
+    app.config['SLOW_QUERY_SAMPLE_RATE'] = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', '0.1'))  # share of slow statements captured
+    app.config['SLOW_QUERY_BUFFER_SIZE'] = int(os.getenv('SLOW_QUERY_BUFFER_SIZE', '100'))
+    app.config['SLOW_QUERY_EXPLAIN'] = os.getenv('SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'
+    app.config['SLOW_QUERY_EXPLAIN_INTERVAL'] = int(os.getenv('SLOW_QUERY_EXPLAIN_INTERVAL', '60'))  # seconds between plans of one statement
+    
+    # Startup
+    app.config['DB_SCHEMA_MODE'] = os.getenv('DB_SCHEMA_MODE', 'create')  # create (create_all), check (Alembic revision) or skip
+    app.config['MINT_PREWARM'] = os.getenv('MINT_PREWARM', 'true').lower() == 'true'  # load the minting stack in the background
     
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    init_migrate(app)
     CORS(app)
+    init_db_routing(app, db)
+    
+    from backend.metrics import init_metrics
+    init_metrics(app)
+    
+    from backend.profiler import init_profiler
+    init_profiler(app)
+    
+    from backend.cache import init_response_cache
+    init_response_cache(app)
+    
+    from backend.events import init_event_broker
+    init_event_broker(app)
     
     # Register blueprints
     from backend.routes.admin import admin_bp
     from backend.routes.tournament import tournament_bp
     from backend.routes.winner import winner_bp
     from backend.routes.nft import nft_bp
+    from backend.routes.events import events_bp
+    from backend.routes.player import player_bp
+    from backend.routes.search import search_bp
+    from backend.routes.badges import badges_bp
     
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     app.register_blueprint(tournament_bp, url_prefix='/api/tournament')
     app.register_blueprint(winner_bp, url_prefix='/api/winner')
     app.register_blueprint(nft_bp, url_prefix='/api/nft')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+    app.register_blueprint(player_bp, url_prefix='/api/player')
+    app.register_blueprint(search_bp, url_prefix='/api/search')
+    app.register_blueprint(badges_bp, url_prefix='/badges')
+    
+    # CLI commands
+    from backend.standings import rebuild_standings_command
+    app.cli.add_command(rebuild_standings_command)
+    from backend.mint_reconciler import reconcile_mints_command
+    app.cli.add_command(reconcile_mints_command)
+    from backend.holder_index import index_holders_command
+    app.cli.add_command(index_holders_command)
+    
+    # Create tables, or only check the migration revision (DB_SCHEMA_MODE)
+    init_schema(app, db)
+    
+    # Start mint workers (also picks up jobs left over from a previous run)
+    from backend.mint_queue import init_mint_queue
+    init_mint_queue(app)
+    
+    from backend.mint_reconciler import init_mint_reconciler
+    init_mint_reconciler(app)
+    
+    from backend.holder_index import init_holder_indexer
+    init_holder_indexer(app)
+    
+    from backend.search import init_search
+    init_search(app)
+    
+    from backend.badge_render import init_badge_renderer
+    init_badge_renderer(app)
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
+    from backend.solana_service import prewarm_solana_service
+    prewarm_solana_service(app)
     
     return app
 
@@ -0,0 +1,222 @@
+"""
+Badge Upload Cache
+Content-addressed cache of badge images uploaded to Arweave, so each
+distinct image is fetched and uploaded once instead of on every mint
+"""
+from backend.app import db
+from backend.models import BadgeUpload, Tournament
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.exc import IntegrityError
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT = 30  # seconds
+
+def is_cacheable_url(url):
+    """Same rules the minter uses: local, Arweave and IPFS images are used as-is"""
+    return bool(url) and not url.startswith('http://localhost') \
+        and 'arweave.net' not in url and 'ipfs.io' not in url
+
+def fetch_image(url):
+    """
+    Download an image
+
+    Returns:
+        tuple: (content bytes, content type)
+    """
+    import requests
+    response = requests.get(url, timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    return response.content, response.headers.get('Content-Type')
+
+def store_badge(data, content_type=None, source_url=None):
+    """
+    Return the cached upload for these bytes, uploading them if they are new
+
+    Returns:
+        BadgeUpload: Cache entry for the image (committed)
+    """
+    from backend.solana_service import get_solana_service
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    upload = BadgeUpload.query.filter_by(content_hash=content_hash).first()
+    if upload:
+        return upload
+
+    arweave_uri = get_solana_service().upload_file(data, content_type)
+    upload = BadgeUpload(
+        content_hash=content_hash,
+        arweave_uri=arweave_uri,
+        content_type=content_type,
+        size_bytes=len(data),
+        source_url=source_url
+    )
+    db.session.add(upload)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker uploaded the same image first; use its entry
+        db.session.rollback()
+        upload = BadgeUpload.query.filter_by(content_hash=content_hash).one()
+    return upload
+
+def store_badges(images):
+    """
+    store_badge for many images: one lookup, and one commit for the new uploads
+
+    Args:
+        images: List of (data, content_type, source_url)
+
+    Returns:
+        list: BadgeUpload per image, or None where the upload failed (logged)
+    """
+    from backend.solana_service import get_solana_service
+
+    hashes = [hashlib.sha256(data).hexdigest() for data, _, _ in images]
+    uploads = {u.content_hash: u for u in BadgeUpload.query.filter(BadgeUpload.content_hash.in_(set(hashes)))}
+    new = {}
+    for content_hash, (data, content_type, source_url) in zip(hashes, images):
+        if content_hash in uploads or content_hash in new:
+            continue
+        try:
+            arweave_uri = get_solana_service().upload_file(data, content_type)
+        except Exception as e:
+            logger.warning('Error uploading badge %s: %s', source_url, e)
+            continue
+        new[content_hash] = dict(content_hash=content_hash, arweave_uri=arweave_uri, content_type=content_type,
+                                 size_bytes=len(data), source_url=source_url)
+
+    if new:
+        try:
+            db.session.add_all([BadgeUpload(**row) for row in new.values()])
+            db.session.commit()
+        except IntegrityError:
+            # Another worker stored some of them first; keep its entries and add the rest one by one
+            db.session.rollback()
+            for row in new.values():
+                if BadgeUpload.query.filter_by(content_hash=row['content_hash']).first() is None:
+                    db.session.add(BadgeUpload(**row))
+                    try:
+                        db.session.commit()
+                    except IntegrityError:
+                        db.session.rollback()
+        uploads.update({
+            u.content_hash: u for u in BadgeUpload.query.filter(BadgeUpload.content_hash.in_(list(new)))
+        })
+    return [uploads.get(content_hash) for content_hash in hashes]
+
+def cache_tournament_badge(tournament):
+    """
+    Fetch, hash and upload a tournament's badge image unless already cached
+
+    The upload is committed to the cache; tournament.badge_content_hash is
+    set for the caller to commit.
+
+    Returns:
+        str: Arweave URI, or None if the badge is not cacheable
+    """
+    if not is_cacheable_url(tournament.badge_image_url):
+        return None
+    data, content_type = fetch_image(tournament.badge_image_url)
+    upload = store_badge(data, content_type, tournament.badge_image_url)
+    tournament.badge_content_hash = upload.content_hash
+    return upload.arweave_uri
+
+# One background thread uploads new tournaments' badges, started on first use
+_background = None
+_background_lock = threading.Lock()
+
+def cache_tournament_badge_later(app, tournament):
+    """
+    Cache a new tournament's badge in a background thread
+
+    The request returns without waiting for the download and upload. If it
+    fails, or the process exits first, resolve_badge_uris caches the badge
+    on the tournament's first mint instead.
+
+    Returns:
+        Future: Resolves to the Arweave URI (or None), or None if the badge is not cacheable
+    """
+    global _background
+    if not is_cacheable_url(tournament.badge_image_url):
+        return None
+    with _background_lock:
+        if _background is None:
+            _background = ThreadPoolExecutor(max_workers=1, thread_name_prefix='badge-cache')
+    return _background.submit(_cache_tournament_badge_task, app, tournament.id)
+
+def _cache_tournament_badge_task(app, tournament_id):
+    with app.app_context():
+        try:
+            tournament = db.session.get(Tournament, tournament_id)
+            if tournament is None or tournament.badge_content_hash:
+                return None
+            uri = cache_tournament_badge(tournament)
+            db.session.commit()
+            return uri
+        except Exception as e:
+            db.session.rollback()
+            logger.warning('Error caching badge for tournament %s: %s', tournament_id, e)
+            return None
+
+def resolve_badge_uris(tournaments):
+    """
+    Map tournaments to the Arweave URI of their badge image
+
+    Cache hits for all tournaments are resolved with one query. Tournaments
+    created before the cache existed are fetched and uploaded on first use,
+    once per badge URL, with new uploads committed together; every
+    tournament sharing the URL gets its badge_content_hash set (caller
+    commits). Failures are logged and leave the tournament out of the
+    result, so the minter falls back to the original URL.
+
+    Returns:
+        dict: tournament_id -> Arweave URI
+    """
+    hashes = {t.id: t.badge_content_hash for t in tournaments if t.badge_content_hash}
+    uploads = {}
+    if hashes:
+        uploads = {
+            u.content_hash: u.arweave_uri
+            for u in BadgeUpload.query.filter(BadgeUpload.content_hash.in_(set(hashes.values())))
+        }
+
+    uris = {}
+    by_url = {}  # badge URL -> tournaments without a cached upload of it
+    for tournament in tournaments:
+        uri = uploads.get(hashes.get(tournament.id))
+        if uri:
+            uris[tournament.id] = uri
+        elif is_cacheable_url(tournament.badge_image_url):
+            by_url.setdefault(tournament.badge_image_url, []).append(tournament)
+    if not by_url:
+        return uris
+
+    urls, images = [], []
+    for url in by_url:
+        try:
+            data, content_type = fetch_image(url)
+        except Exception as e:
+            logger.warning('Error fetching badge %s: %s', url, e)
+            continue
+        urls.append(url)
+        images.append((data, content_type, url))
+    if not images:
+        return uris
+    try:
+        new_uploads = store_badges(images)
+    except Exception as e:
+        db.session.rollback()
+        logger.warning('Error uploading tournament badges: %s', e)
+        return uris
+
+    for url, upload in zip(urls, new_uploads):
+        if upload is None:
+            continue
+        for tournament in by_url[url]:
+            tournament.badge_content_hash = upload.content_hash
+            uris[tournament.id] = upload.arweave_uri
+    return uris
@@ -0,0 +1,107 @@
+"""
+Bulk Ingestion Helpers
+Shared by the bulk upload routes: record streaming, chunking and
+row-level error collection
+"""
+from flask import request
+from itertools import islice
+import csv
+import io
+import json
+import re
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+CSV_MIMETYPES = ('text/csv', 'application/csv')
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+def is_ndjson_request():
+    return request.mimetype in NDJSON_MIMETYPES
+
+def iter_ndjson(stream):
+    """
+    Yield (line_number, record) from a newline-delimited JSON stream
+
+    Lines that are not valid JSON objects are yielded as (line_number, ValueError)
+    so callers can report them without stopping the upload.
+    """
+    for index, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8'), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield index, ValueError(f'Invalid JSON: {e.msg}')
+            continue
+        if not isinstance(record, dict):
+            yield index, ValueError('Expected a JSON object')
+            continue
+        yield index, record
+
+def iter_csv(stream):
+    """Yield (line_number, record) from a CSV stream with a header row"""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    for record in reader:
+        yield reader.line_num, record
+
+def iter_request_records(key):
+    """
+    Yield (row_number, record) from the current request
+
+    NDJSON and CSV bodies are streamed line by line; JSON bodies are read
+    from the list under `key` (or the body itself when it is a list).
+    """
+    if is_ndjson_request():
+        yield from iter_ndjson(request.stream)
+        return
+    if request.mimetype in CSV_MIMETYPES:
+        yield from iter_csv(request.stream)
+        return
+
+    data = request.get_json()
+    records = data if isinstance(data, list) else (data or {}).get(key, [])
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            yield index, ValueError('Expected a JSON object')
+            continue
+        yield index, record
+
+# Solana addresses are 32-byte keys in base58: 32 to 44 characters, no 0/O/I/l
+WALLET_ADDRESS_RE = re.compile(r'^[1-9A-HJ-NP-Za-km-z]{32,44}$')
+
+def is_valid_wallet_address(address):
+    """Cheap structural check of a Solana address (no PublicKey construction)"""
+    return isinstance(address, str) and WALLET_ADDRESS_RE.match(address) is not None
+
+def chunked(iterable, size=CHUNK_SIZE):
+    """Yield lists of up to `size` items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class RowErrors:
+    """Collects per-row errors, keeping only the first MAX_REPORTED_ERRORS"""
+
+    def __init__(self, limit=MAX_REPORTED_ERRORS):
+        self.limit = limit
+        self.count = 0
+        self.errors = []
+
+    def add(self, row, error):
+        self.count += 1
+        if len(self.errors) < self.limit:
+            self.errors.append({'row': row, 'error': str(error)})
+
+    def __bool__(self):
+        return self.count > 0
+
+    def to_dict(self):
+        return {
+            'rejected': self.count,
+            'errors': self.errors,
+            'errors_truncated': self.count > len(self.errors)
+        }
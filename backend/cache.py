@@ -0,0 +1,340 @@
+"""
+Response Cache
+Caches serialized GET responses keyed by route and arguments, with
+tag-based invalidation driven by committed writes and single-flight
+coalescing of concurrent misses. Each tag also has a version row in
+cache_versions, bumped in the writing transaction, from which GET routes
+derive strong ETags and answer If-None-Match without running the view.
+"""
+try:
+    import redis
+except ImportError:
+    # Only needed for CACHE_BACKEND=redis
+    redis = None
+
+from backend.app import db
+from backend.models import CacheVersion
+from collections import OrderedDict
+from datetime import datetime
+from flask import Response, current_app, request
+from functools import wraps
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+import hashlib
+import threading
+import time
+
+class MemoryCacheBackend:
+    """In-process LRU with per-entry TTL"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}  # tag -> set of keys
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl, tags):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for tag in entry[2]:
+                keys = self._tags.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tags[tag]
+
+class RedisCacheBackend:
+    """Shared cache for multi-worker deployments; tags are Redis sets of keys"""
+
+    def __init__(self, url, prefix='tokenchamp:cache:'):
+        if redis is None:
+            raise RuntimeError('CACHE_BACKEND=redis requires the redis package')
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl, tags):
+        pipe = self.client.pipeline()
+        pipe.setex(self.prefix + key, ttl, value)
+        for tag in tags:
+            tag_key = f'{self.prefix}tag:{tag}'
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl * 2)
+        pipe.execute()
+
+    def invalidate(self, tags):
+        for tag in tags:
+            tag_key = f'{self.prefix}tag:{tag}'
+            keys = self.client.smembers(tag_key)
+            pipe = self.client.pipeline()
+            for key in keys:
+                pipe.delete(self.prefix + key.decode())
+            pipe.delete(tag_key)
+            pipe.execute()
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.body = None
+
+class ResponseCache:
+    def __init__(self, backend, default_ttl=60, flight_timeout=30):
+        """
+        Args:
+            backend: MemoryCacheBackend or RedisCacheBackend
+            default_ttl: Seconds an entry lives without being invalidated
+            flight_timeout: Seconds a coalesced miss waits for the leader
+        """
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.flight_timeout = flight_timeout
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped on every invalidation
+
+    def get_response(self, key, tags, compute, ttl=None):
+        """
+        Return the cached response for key, computing it once on a miss
+
+        Concurrent misses on the same key wait for a single computation.
+        Only 200 JSON bodies are stored, and not when an invalidation
+        happened while they were being computed.
+
+        Args:
+            key: Cache key
+            tags: Tags whose invalidation drops the entry
+            compute: Callable returning a Flask Response
+            ttl: Seconds to keep the entry
+        """
+        body = self.backend.get(key)
+        if body is not None:
+            return _json_response(body)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            generation = self._generation
+
+        if not leader:
+            flight.done.wait(self.flight_timeout)
+            if flight.body is not None:
+                return _json_response(flight.body)
+            return compute()
+
+        try:
+            response = compute()
+            if response.status_code == 200 and response.is_json:
+                flight.body = response.get_data()
+                if generation == self._generation:
+                    self.backend.set(key, flight.body, ttl or self.default_ttl, tags)
+            return response
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def invalidate(self, tags):
+        with self._lock:
+            self._generation += 1
+        self.backend.invalidate(tags)
+
+def _json_response(body):
+    return Response(body, status=200, mimetype='application/json')
+
+# Singleton instance
+_response_cache = None
+
+def init_response_cache(app):
+    """Create the cache from app config (CACHE_BACKEND=none disables it)"""
+    global _response_cache
+    backend_name = app.config['CACHE_BACKEND']
+    if backend_name == 'memory':
+        backend = MemoryCacheBackend(app.config['CACHE_MAX_ENTRIES'])
+    elif backend_name == 'redis':
+        backend = RedisCacheBackend(app.config['CACHE_REDIS_URL'])
+    else:
+        _response_cache = None
+        return None
+    _response_cache = ResponseCache(backend, app.config['CACHE_DEFAULT_TTL'])
+    return _response_cache
+
+def get_response_cache():
+    return _response_cache
+
+BUMP_BATCH_SIZE = 1000
+
+# Tags shared by cached reads and the writes that invalidate them
+TOURNAMENTS_TAG = 'tournaments'
+WINNERS_TAG = 'winners'
+
+def tournament_tag(tournament_id):
+    return f'tournament:{tournament_id}'
+
+def wallet_tag(wallet_address):
+    return f'wallet:{wallet_address}'
+
+def winner_tag(winner_id):
+    return f'winner:{winner_id}'
+
+def player_tag(name_key):
+    return f'player:{name_key}'
+
+def list_refresh():
+    """
+    Refresh window of tournament lists and search, whose team counts and
+    team results are not invalidated by team writes (those only bump the
+    tournament's own tag)
+    """
+    return current_app.config['CACHE_LIST_REFRESH']
+
+def invalidate_tags(*tags):
+    """
+    Mark cache tags stale once the current transaction commits
+
+    Call before db.session.commit(). The tag versions are bumped inside the
+    transaction; nothing is invalidated if it rolls back.
+    """
+    db.session.info.setdefault('cache_tags', set()).update(tags)
+
+def bump_versions(session, tags):
+    """Increment the version of each tag, creating missing rows at version 1"""
+    table = CacheVersion.__table__
+    now = datetime.utcnow()
+    rows = [{'tag': tag, 'version': 1, 'updated_at': now} for tag in sorted(tags)]  # fixed lock order
+    dialect = session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql_insert if dialect == 'postgresql' else sqlite_insert
+        # Bulk imports touch a tag per player; stay under the bind parameter limit
+        for start in range(0, len(rows), BUMP_BATCH_SIZE):
+            stmt = insert(table).values(rows[start:start + BUMP_BATCH_SIZE])
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.tag],
+                set_={'version': table.c.version + 1, 'updated_at': now}
+            ))
+        return
+
+    session.execute(
+        update(table).where(table.c.tag.in_(tags)).values(version=table.c.version + 1, updated_at=now)
+    )
+    existing = {tag for (tag,) in session.execute(select(table.c.tag).where(table.c.tag.in_(tags)))}
+    missing = [row for row in rows if row['tag'] not in existing]
+    if missing:
+        session.execute(table.insert(), missing)
+
+def tag_versions(tags):
+    """
+    Current versions of the given tags (0 for tags never written)
+
+    Returns:
+        dict: tag -> version
+    """
+    versions = dict.fromkeys(tags, 0)
+    versions.update(db.session.query(CacheVersion.tag, CacheVersion.version)
+                    .filter(CacheVersion.tag.in_(versions)))
+    return versions
+
+@event.listens_for(Session, 'before_commit')
+def _bump_before_commit(session):
+    tags = session.info.get('cache_tags')
+    if tags:
+        bump_versions(session, tags)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    tags = session.info.pop('cache_tags', None)
+    if tags and _response_cache is not None:
+        _response_cache.invalidate(tags)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('cache_tags', None)
+
+def _cache_key(endpoint, view_args, args):
+    view_part = '/'.join(f'{k}={v}' for k, v in sorted(view_args.items()))
+    query_part = '&'.join(f'{k}={v}' for k, v in sorted(args.items(multi=True)))
+    return f'{endpoint}:{view_part}?{query_part}'
+
+def _etag(key, versions):
+    fingerprint = ','.join(f'{tag}={version}' for tag, version in sorted(versions.items()))
+    return hashlib.sha1(f'{key}|{fingerprint}'.encode()).hexdigest()
+
+def cached_response(tags, ttl=None, refresh=None):
+    """
+    Serve a GET view with an ETag and cache its serialized 200 responses
+
+    The ETag is derived from the route, its arguments and the versions of
+    the view's tags, so a matching If-None-Match gets 304 Not Modified
+    after one primary-key lookup, without running the view.
+
+    Args:
+        tags: Callable receiving the view arguments and returning the tags
+              whose writes change the response
+        ttl: Seconds to keep the entry, defaults to CACHE_DEFAULT_TTL
+        refresh: Callable returning the seconds after which the response
+                 may change without a tag bump (the ETag changes with them)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            if request.method != 'GET':
+                return view(**kwargs)
+
+            view_tags = tags(**kwargs)
+            key = _cache_key(request.endpoint, kwargs, request.args)
+            if refresh is not None:
+                # One entry and ETag per refresh window
+                key = f'{key}@{int(time.time() // max(refresh(), 1))}'
+            etag = _etag(key, tag_versions(view_tags))
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+
+            def compute():
+                return current_app.make_response(view(**kwargs))
+
+            cache = get_response_cache()
+            if cache is None:
+                response = compute()
+            else:
+                # Versioned key: an entry can never be served under a newer ETag
+                response = cache.get_response(f'{key}#{etag}', view_tags, compute, ttl)
+            if response.status_code == 200:
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
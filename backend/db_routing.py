@@ -0,0 +1,88 @@
+"""
+Database Routing
+Engine options from config, and an optional read replica: GET requests to
+the API blueprints read from the replica, while writes, any query after a
+write in the same request, and a client's requests shortly after its own
+writes stay on the primary
+"""
+from flask import request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+import time
+
+REPLICA_BIND = 'replica'
+REPLICA_BLUEPRINTS = ('admin', 'tournament', 'winner', 'nft', 'player', 'search')
+READ_METHODS = ('GET', 'HEAD')
+PRIMARY_COOKIE = 'db_primary_until'
+
+def engine_options(url, config):
+    """
+    SQLAlchemy create_engine options for one database URL
+
+    Pool sizing is skipped for SQLite, and the statement timeout is only
+    applied on PostgreSQL.
+
+    Returns:
+        dict: Keyword arguments for create_engine
+    """
+    options = {
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+        'pool_recycle': config['DB_POOL_RECYCLE']
+    }
+    if url.startswith('sqlite'):
+        return options
+
+    options.update(
+        pool_size=config['DB_POOL_SIZE'],
+        max_overflow=config['DB_MAX_OVERFLOW'],
+        pool_timeout=config['DB_POOL_TIMEOUT']
+    )
+    if url.startswith('postgres') and config['DB_STATEMENT_TIMEOUT_MS']:
+        options['connect_args'] = {'options': f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"}
+    return options
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the replica bind while session.info['use_replica'] is set
+
+    The first flush or DML statement clears the flag, so everything after
+    a write in the same session reads its own changes from the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('use_replica'):
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info['use_replica'] = False
+            else:
+                replica = self._db.engines.get(REPLICA_BIND)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def _reads_from_replica():
+    if request.method not in READ_METHODS or request.blueprint not in REPLICA_BLUEPRINTS:
+        return False
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+    return primary_until < time.time()
+
+def init_db_routing(app, db):
+    """Route API reads to the replica bind when DATABASE_REPLICA_URL is set"""
+    if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+
+    sticky_seconds = app.config['DB_REPLICA_STICKY_SECONDS']
+
+    @app.before_request
+    def _route_reads():
+        db.session.info['use_replica'] = _reads_from_replica()
+
+    @app.after_request
+    def _stick_to_primary(response):
+        # Replicas lag behind; keep this client's reads on the primary for a while after it writes
+        if request.method not in READ_METHODS and response.status_code < 400 and sticky_seconds:
+            response.set_cookie(PRIMARY_COOKIE, str(time.time() + sticky_seconds),
+                                max_age=sticky_seconds, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,143 @@
+"""
+Live Events
+In-process pub/sub behind the GET /api/events Server-Sent Events stream.
+Write routes and the mint path publish match, winner and mint events;
+each subscriber gets the ones matching its tournament/wallet filter.
+
+Subscribers block on an Event rather than a socket, so under a gevent
+worker an idle connection costs one greenlet, not one thread.
+"""
+from collections import deque, namedtuple
+import itertools
+import json
+import threading
+import uuid
+
+RETRY_MS = 3000  # client reconnect delay sent with the stream
+
+Event = namedtuple('Event', ['id', 'type', 'data', 'tournament_id', 'wallet_address'])
+
+class Subscription:
+    def __init__(self, tournament_ids, wallets, queue_size):
+        self.tournament_ids = tournament_ids
+        self.wallets = wallets
+        # A client that stops reading drops its oldest events instead of growing memory
+        self.events = deque(maxlen=queue_size)
+        self.ready = threading.Event()
+
+    def matches(self, event):
+        return (not self.tournament_ids or event.tournament_id in self.tournament_ids) and \
+            (not self.wallets or event.wallet_address in self.wallets)
+
+    def push(self, event):
+        self.events.append(event)
+        self.ready.set()
+
+    def wait(self, timeout):
+        """Block until events arrive or timeout; returns the pending events"""
+        self.ready.wait(timeout)
+        self.ready.clear()
+        pending = []
+        while self.events:
+            pending.append(self.events.popleft())
+        return pending
+
+class EventBroker:
+    def __init__(self, max_subscribers=10000, queue_size=100, replay_size=1000):
+        """
+        Args:
+            max_subscribers: Open streams allowed in this process
+            queue_size: Undelivered events kept per subscriber
+            replay_size: Recent events kept for clients resuming with Last-Event-ID
+        """
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.boot_id = uuid.uuid4().hex[:8]  # event IDs from a previous process are not replayed
+        self._sequence = itertools.count(1)
+        self._recent = deque(maxlen=replay_size)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event_type, data, tournament_id=None, wallet_address=None):
+        """Deliver an event to every matching subscriber"""
+        with self._lock:
+            event = Event(f'{self.boot_id}-{next(self._sequence)}', event_type, data,
+                          tournament_id, wallet_address)
+            self._recent.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if subscription.matches(event):
+                subscription.push(event)
+
+    def subscribe(self, tournament_ids=(), wallets=(), last_event_id=None):
+        """
+        Open a subscription
+
+        Returns:
+            Subscription: or None when max_subscribers are already connected
+        """
+        subscription = Subscription(set(tournament_ids), set(wallets), self.queue_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(subscription)
+            for event in self._missed_since(last_event_id):
+                if subscription.matches(event):
+                    subscription.push(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def _missed_since(self, last_event_id):
+        boot_id, _, sequence = (last_event_id or '').partition('-')
+        if boot_id != self.boot_id or not sequence.isdigit():
+            return []
+        return [e for e in self._recent if int(e.id.partition('-')[2]) > int(sequence)]
+
+def format_event(event):
+    return f'id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data)}\n\n'
+
+def stream(broker, subscription, heartbeat):
+    """
+    Yield a subscription as text/event-stream chunks until the client disconnects
+
+    Comment lines are sent every `heartbeat` seconds so proxies keep the
+    connection open and dead clients are noticed.
+    """
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        while True:
+            events = subscription.wait(heartbeat)
+            if not events:
+                yield ': keepalive\n\n'
+                continue
+            for event in events:
+                yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+# Singleton instance
+_event_broker = None
+
+def init_event_broker(app):
+    global _event_broker
+    _event_broker = EventBroker(
+        max_subscribers=app.config['EVENTS_MAX_SUBSCRIBERS'],
+        queue_size=app.config['EVENTS_QUEUE_SIZE'],
+        replay_size=app.config['EVENTS_REPLAY_SIZE']
+    )
+    return _event_broker
+
+def get_event_broker():
+    return _event_broker
+
+def publish_event(event_type, data, tournament_id=None, wallet_address=None):
+    """Publish an event to this process's subscribers (call after the write commits)"""
+    if _event_broker is not None:
+        _event_broker.publish(event_type, data, tournament_id, wallet_address)
@@ -0,0 +1,143 @@
+"""
+Fake Mint Backend
+Drop-in replacement for MintDaemonClient that never touches Metaplex or
+the chain. Each call sleeps for a simulated latency and fails at a
+configured rate, so mint throughput and queue behaviour can be measured
+offline (MINT_BACKEND=fake). Idempotency keys, cancellation and late
+results behave like the real daemon's.
+"""
+from backend.metrics import observe_mint_stage
+from backend.mint_daemon import MintDaemonError
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import hashlib
+import itertools
+import random
+import threading
+import time
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+# Share of a simulated mint spent in each stage, reported like the real daemon's stage events
+MINT_STAGE_SHARES = (('metadata_upload', 0.3), ('create', 0.4), ('confirm', 0.3))
+
+def _fake_base58(seed, length):
+    digest = hashlib.sha256(seed.encode()).digest() * 2
+    return ''.join(BASE58_ALPHABET[b % 58] for b in digest[:length])
+
+class FakeMinter:
+    def __init__(self, latency=0.5, jitter=0.25, failure_rate=0.0, concurrency=4, request_timeout=120, seed=None,
+                 idempotency_ttl=300, on_late_result=None):
+        """
+        Args:
+            latency: Mean seconds per mint or upload
+            jitter: Fraction of latency added or removed at random
+            failure_rate: Probability (0-1) that a call fails
+            concurrency: Calls served at once, like MINT_DAEMON_CONCURRENCY
+            request_timeout: Default seconds to wait for a result
+            seed: Random seed for reproducible runs
+            idempotency_ttl: Seconds a succeeded call is returned again for its idempotencyKey
+            on_late_result: Called with (op, params, result) when a call
+                succeeds after its caller stopped waiting
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.request_timeout = request_timeout
+        self.idempotency_ttl = idempotency_ttl
+        self.on_late_result = on_late_result
+        self._runs = {}  # (op, idempotencyKey) -> (future, expires at or None while running)
+        self._runs_lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix='fake-minter')
+
+    def call(self, op, params=None, timeout=None):
+        """Same contract as MintDaemonClient.call"""
+        return self.submit(op, params).result_or_raise(timeout or self.request_timeout)
+
+    def submit(self, op, params=None):
+        """Same contract as MintDaemonClient.submit"""
+        params = params or {}
+        key = (op, params['idempotencyKey']) if params.get('idempotencyKey') else None
+        with self._runs_lock:
+            now = time.monotonic()
+            for run_key, (_, expires) in list(self._runs.items()):
+                if expires is not None and expires <= now:
+                    del self._runs[run_key]
+            if key in self._runs:
+                return _FakeCall(self, self._runs[key][0], op, params)
+            with self._random_lock:
+                delay = self.latency * (1 + self.jitter * (2 * self._random.random() - 1))
+                fails = self._random.random() < self.failure_rate
+            future = self._executor.submit(self._run, next(self._ids), op, params, delay, fails)
+            if key is not None:
+                self._runs[key] = (future, None)
+        if key is not None:
+            future.add_done_callback(lambda done: self._finish_run(key, done))
+        return _FakeCall(self, future, op, params)
+
+    def _finish_run(self, key, future):
+        with self._runs_lock:
+            if self._runs.get(key, (None,))[0] is not future:
+                return
+            if future.cancelled() or future.exception() is not None:
+                del self._runs[key]
+            else:
+                self._runs[key] = (future, time.monotonic() + self.idempotency_ttl)
+
+    def abandon(self, call):
+        """Same contract as MintDaemonClient.abandon"""
+        if call.future.cancel():
+            return
+        call.future.add_done_callback(lambda future: self._late_result(call, future))
+
+    def _late_result(self, call, future):
+        if future.cancelled() or future.exception() is not None or self.on_late_result is None:
+            return
+        thread = threading.Thread(target=self.on_late_result, args=(call.op, call.params, future.result()),
+                                  name='fake-minter-late-result')
+        thread.daemon = True
+        thread.start()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, call_id, op, params, delay, fails):
+        delay = max(delay, 0)
+        if op == 'mint' and not fails:
+            for stage, share in MINT_STAGE_SHARES:
+                time.sleep(delay * share)
+                observe_mint_stage(stage, delay * share)
+        else:
+            time.sleep(delay)
+        if fails:
+            raise MintDaemonError(f'Simulated {op} failure')
+        if op == 'ping':
+            return {'pong': True}
+        if op == 'upload':
+            return {'uri': f'https://arweave.net/{_fake_base58(f"upload-{call_id}", 43)}'}
+        if op == 'mint':
+            return {
+                # The mint address follows the seed, as with Keypair.fromSeed in minter.js
+                'tokenId': _fake_base58(f'token-{params.get("mintSeed") or call_id}', 44),
+                'metadataUri': f'https://arweave.net/{_fake_base58(f"metadata-{call_id}", 43)}',
+                'imageUri': params.get('imageUri') or params.get('imageUrl'),
+                'signature': _fake_base58(f'signature-{call_id}', 88)
+            }
+        raise MintDaemonError(f'Unknown op: {op}')
+
+class _FakeCall:
+    def __init__(self, minter, future, op, params):
+        self.minter = minter
+        self.future = future
+        self.op = op
+        self.params = params
+
+    def result_or_raise(self, timeout=None):
+        try:
+            return self.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.minter.abandon(self)
+            raise MintDaemonError('NFT minting timed out')
+        except CancelledError:
+            raise MintDaemonError('Cancelled before it started')
@@ -0,0 +1,222 @@
+"""
+NFT Ownership Index
+Keeps nft_holders, the current on-chain holder of every minted champion
+NFT, so wallet lookups are one indexed query instead of RPC calls.
+
+Each pass (every HOLDER_INDEX_INTERVAL seconds, or `flask index-holders`)
+checks the newly minted NFTs and the least recently checked rows:
+- known token accounts are re-read in bulk with getMultipleAccounts; an
+  account still holding the NFT only moves the row's slot forward
+- NFTs without a row, or whose account was emptied or closed (the token
+  moved), are located with getTokenLargestAccounts and their new account
+  read the same way
+- rows for NFTs that were dropped or re-minted are removed
+
+Reads pass the highest slot already stored as minContextSlot, so a
+lagging RPC node cannot roll a holder back to an older state.
+"""
+from backend.app import db
+from backend.cache import invalidate_tags, wallet_tag
+from backend.leases import acquire_lease, lease_holder
+from backend.mint_reconciler import get_rpc_client
+from backend.models import NftHolder, Winner
+from backend.projections import current_holder_join
+from backend.solana_rpc import token_account_owner
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import delete, func, insert, update
+import click
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+def _largest_holding(holding):
+    """Address of the first token account with a non-zero balance"""
+    for entry in holding or []:
+        try:
+            if int(entry['amount']) > 0:
+                return entry['address']
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+def _locate(rpc, nfts, commitment, min_slot):
+    """
+    Find the current token account and owner of NFTs from their mint
+
+    Args:
+        nfts: (winner_id, mint_address) tuples
+
+    Returns:
+        dict: winner_id -> (token_account, owner_wallet, slot), both None when
+        burned; mints the node rejected are left out
+    """
+    if not nfts:
+        return {}
+    holdings, slot = rpc.get_token_largest_accounts([mint for _, mint in nfts], commitment)
+    found = [(winner_id, mint, _largest_holding(holding))
+             for (winner_id, mint), holding in zip(nfts, holdings) if holding is not None]
+
+    located = {winner_id: (None, None, slot) for winner_id, _, account in found if account is None}
+    found = [nft for nft in found if nft[2] is not None]
+    if found:
+        accounts, slot = rpc.get_multiple_accounts([account for _, _, account in found], commitment,
+                                                   min_context_slot=min_slot)
+        for (winner_id, mint, address), account in zip(found, accounts):
+            owner = token_account_owner(account, mint)
+            located[winner_id] = (address if owner else None, owner, slot)
+    return located
+
+def index_holders(rpc=None, limit=None):
+    """
+    Run one indexing pass and commit its changes in one transaction
+
+    Args:
+        rpc: SolanaRPCClient, defaults to get_rpc_client()
+        limit: Max NFTs checked per pass (HOLDER_INDEX_BATCH)
+
+    Returns:
+        dict: Counts of checked, new, unchanged, transferred, burned and removed NFTs, and the newest slot read
+    """
+    rpc = rpc or get_rpc_client()
+    limit = limit or current_app.config['HOLDER_INDEX_BATCH']
+    commitment = current_app.config['HOLDER_INDEX_COMMITMENT']
+    now = datetime.utcnow()
+
+    # Rows whose mint was dropped or replaced by reconciliation
+    stale = db.session.query(NftHolder.id, NftHolder.owner_wallet) \
+        .outerjoin(Winner, current_holder_join()).filter(Winner.id.is_(None)).all()
+    if stale:
+        db.session.execute(delete(NftHolder).where(NftHolder.id.in_([row.id for row in stale])))
+
+    new = db.session.query(Winner.id, Winner.nft_token_id, Winner.wallet_address) \
+        .outerjoin(NftHolder, NftHolder.winner_id == Winner.id) \
+        .filter(Winner.nft_token_id.isnot(None), NftHolder.id.is_(None)) \
+        .order_by(Winner.id).limit(limit).all()
+    known = db.session.query(
+        NftHolder.id, NftHolder.winner_id, NftHolder.mint_address, NftHolder.token_account, NftHolder.owner_wallet
+    ).order_by(NftHolder.checked_at).limit(max(limit - len(new), 0)).all()
+    min_slot = db.session.query(func.max(NftHolder.slot)).scalar()
+
+    # Known accounts that still hold their NFT
+    tracked = [row for row in known if row.token_account]
+    resolved = {}
+    moved = [(row.winner_id, row.mint_address) for row in known if not row.token_account]
+    if tracked:
+        accounts, slot = rpc.get_multiple_accounts([row.token_account for row in tracked], commitment,
+                                                   min_context_slot=min_slot)
+        for row, account in zip(tracked, accounts):
+            owner = token_account_owner(account, row.mint_address)
+            if owner:
+                resolved[row.winner_id] = (row.token_account, owner, slot)
+            else:
+                moved.append((row.winner_id, row.mint_address))
+    resolved.update(_locate(rpc, [(w.id, w.nft_token_id) for w in new] + moved, commitment, min_slot))
+
+    tags = {wallet_tag(row.owner_wallet) for row in stale if row.owner_wallet}
+    unchanged, changed, burned = [], [], 0
+    for row in known:
+        if row.winner_id not in resolved:
+            # The node could not locate the mint; keep the last known holder
+            unchanged.append({'id': row.id, 'checked_at': now})
+            continue
+        token_account, owner, slot = resolved[row.winner_id]
+        if owner == row.owner_wallet:
+            unchanged.append({'id': row.id, 'token_account': token_account, 'slot': slot, 'checked_at': now})
+            continue
+        changed.append({'id': row.id, 'token_account': token_account, 'owner_wallet': owner, 'slot': slot,
+                        'checked_at': now, 'changed_at': now})
+        tags.update(wallet_tag(wallet) for wallet in (row.owner_wallet, owner) if wallet)
+        burned += owner is None
+    transferred = len(changed) - burned
+    # Bulk UPDATEs by primary key, one statement per set of columns
+    for values in ([v for v in unchanged if 'slot' in v], [v for v in unchanged if 'slot' not in v], changed):
+        if values:
+            db.session.execute(update(NftHolder), values)
+
+    rows = []
+    for winner in new:
+        if winner.id not in resolved:
+            continue  # not visible to the node yet; retried next pass
+        token_account, owner, slot = resolved[winner.id]
+        rows.append({'winner_id': winner.id, 'mint_address': winner.nft_token_id, 'token_account': token_account,
+                     'owner_wallet': owner, 'slot': slot, 'checked_at': now, 'changed_at': now})
+        # by-wallet switches from the recipient to the indexed holder
+        tags.update(wallet_tag(wallet) for wallet in (winner.wallet_address, owner) if wallet)
+        burned += owner is None
+    if rows:
+        db.session.execute(insert(NftHolder), rows)
+
+    if tags:
+        invalidate_tags(*tags)
+    db.session.commit()
+
+    slots = [slot for _, _, slot in resolved.values() if slot is not None]
+    return {
+        'checked': len(known) + len(new),
+        'new': len(rows),
+        'unchanged': len(unchanged),
+        'transferred': transferred,
+        'burned': burned,
+        'removed': len(stale),
+        'slot': max(slots) if slots else min_slot
+    }
+
+class HolderIndexer:
+    """
+    Background thread running index_holders every `interval` seconds
+
+    Every process with HOLDER_INDEX_INTERVAL set starts one, but a pass
+    only runs while this process holds the 'holder-indexer' lease, which
+    lasts two intervals so another process takes over if the holder exits.
+    """
+
+    LEASE_NAME = 'holder-indexer'
+
+    def __init__(self, app, interval=300):
+        self.app = app
+        self.interval = interval
+        self.holder = lease_holder()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='holder-indexer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                with self.app.app_context():
+                    if acquire_lease(self.LEASE_NAME, self.holder, self.interval * 2):
+                        index_holders()
+            except Exception as e:
+                logger.exception('Holder indexing error: %s', e)
+
+# Singleton instance
+_holder_indexer = None
+
+def init_holder_indexer(app):
+    """Start periodic indexing unless HOLDER_INDEX_INTERVAL is 0"""
+    global _holder_indexer
+    if _holder_indexer is None and app.config['HOLDER_INDEX_INTERVAL'] > 0:
+        _holder_indexer = HolderIndexer(app, app.config['HOLDER_INDEX_INTERVAL'])
+        _holder_indexer.start()
+    return _holder_indexer
+
+@click.command('index-holders')
+@click.option('--limit', type=int, default=None, help='NFTs checked in this pass (default HOLDER_INDEX_BATCH)')
+def index_holders_command(limit):
+    """Refresh the on-chain holders of minted NFTs"""
+    summary = index_holders(limit=limit)
+    click.echo(f"Checked {summary['checked']} NFT(s) ({summary['new']} new): {summary['unchanged']} unchanged, "
+               f"{summary['transferred']} transferred, {summary['burned']} burned, "
+               f"{summary['removed']} removed; slot {summary['slot']}")
@@ -0,0 +1,67 @@
+"""
+JSON Provider
+Flask JSON provider backed by orjson when it is installed (pip install
+orjson), falling back to the standard library. Either way datetimes and
+dates are written as ISO 8601, so list queries can hand raw column
+values to jsonify without formatting each row.
+"""
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+import decimal
+import json
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(o):
+    """Types neither encoder handles natively"""
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+def loads_text(text):
+    """Parse a JSON column value with the fastest available parser"""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    app.json provider: orjson when available, ISO 8601 datetimes either way
+
+    Keys stay sorted (Flask's default), so bodies and their ETags do not
+    change with the encoder.
+    """
+    default = staticmethod(_default)
+
+    def _orjson_option(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default,
+                            option=self._orjson_option(kwargs.get('indent') is not None)).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=_default, option=self._orjson_option(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
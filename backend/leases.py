@@ -0,0 +1,62 @@
+"""
+Scheduler Leases
+Periodic background tasks start in every process (each gunicorn worker
+runs create_app), but some must only run in one. A task takes a named
+lease in the scheduler_leases table before each run: the holder renews it,
+and any other process can take it over once it expires.
+"""
+from backend.app import db
+from backend.models import SchedulerLease
+from datetime import datetime, timedelta
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+import os
+import socket
+
+def lease_holder():
+    """Identify this process as a lease holder"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+def acquire_lease(name, holder, seconds):
+    """
+    Take or renew a named lease and commit
+
+    Args:
+        name: Lease name, one per task
+        holder: This process (see lease_holder)
+        seconds: How long the lease lasts unless renewed
+
+    Returns:
+        bool: True if `holder` now holds the lease
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=seconds)
+    result = db.session.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name,
+               or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now))
+        .values(holder=holder, expires_at=expires_at)
+    )
+    if result.rowcount == 1:
+        db.session.commit()
+        return True
+    if db.session.get(SchedulerLease, name) is not None:
+        db.session.rollback()
+        return False
+    try:
+        db.session.add(SchedulerLease(name=name, holder=holder, expires_at=expires_at))
+        db.session.commit()
+        return True
+    except IntegrityError:
+        # Another process created it first
+        db.session.rollback()
+        return False
+
+def release_lease(name, holder):
+    """Give up a lease held by `holder` so another process can take it now, and commit"""
+    db.session.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+        .values(expires_at=datetime.utcnow())
+    )
+    db.session.commit()
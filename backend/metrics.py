@@ -0,0 +1,233 @@
+"""
+Metrics
+In-process counters and histograms exposed at GET /metrics in the
+Prometheus text format: per-route request latency, SQL statements and
+time per request, and mint stage timings reported by the Metaplex daemon.
+
+Recording a sample is a dict lookup, a bisect and a few additions under
+a per-metric lock; nothing is formatted until /metrics is scraped.
+Values are per process, so scrape each worker (or run one gevent worker).
+"""
+from bisect import bisect_left
+from contextvars import ContextVar
+from flask import Response, g, request
+import threading
+import time
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+MINT_STAGE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+MINT_STAGES = ('spawn', 'image_upload', 'metadata_upload', 'create', 'confirm')
+
+# SQL work of the current request: [statements, seconds], or None outside a request
+_request_sql = ContextVar('request_sql', default=None)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            lines.append(f'{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}')
+        return lines
+
+class Gauge:
+    """Value read from a callback at scrape time"""
+
+    def __init__(self, name, documentation, collect):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        try:
+            value = self.collect()
+        except Exception:
+            return []
+        if value is not None:
+            lines.append(f'{self.name} {_format_value(value)}')
+        return lines
+
+class Histogram:
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for label_values, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                labels = _format_labels(self.labels, label_values, ('le', _format_value(float(bound))))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labels, label_values, ('le', '+Inf'))
+            lines.append(f'{self.name}_bucket{labels} {values[-1]}')
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f'{self.name}_sum{labels} {_format_value(float(values[-2]))}')
+            lines.append(f'{self.name}_count{labels} {values[-1]}')
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    'http_requests_total', 'HTTP requests by route and status', ('method', 'route', 'status')))
+HTTP_LATENCY = registry.register(Histogram(
+    'http_request_duration_seconds', 'Time to produce a response, by route', ('method', 'route')))
+HTTP_SQL_STATEMENTS = registry.register(Histogram(
+    'http_request_sql_statements', 'SQL statements executed per request', ('method', 'route'),
+    buckets=SQL_COUNT_BUCKETS))
+HTTP_SQL_DURATION = registry.register(Histogram(
+    'http_request_sql_duration_seconds', 'Time spent in SQL per request', ('method', 'route')))
+SQL_STATEMENTS = registry.register(Counter(
+    'sql_statements_total', 'SQL statements executed, including background work'))
+SQL_DURATION = registry.register(Counter(
+    'sql_statement_seconds_total', 'Seconds spent executing SQL statements, including background work'))
+SQL_SLOW_STATEMENTS = registry.register(Counter(
+    'sql_slow_statements_total', 'Statements over SLOW_QUERY_THRESHOLD_MS (counted only while the profiler is on)'))
+MINT_STAGE_DURATION = registry.register(Histogram(
+    'mint_stage_duration_seconds', 'Mint pipeline stage timings reported by the Metaplex daemon', ('stage',),
+    buckets=MINT_STAGE_BUCKETS))
+MINT_RESULTS = registry.register(Counter(
+    'mint_results_total', 'Completed mint attempts by outcome', ('outcome',)))
+
+def _event_subscribers():
+    from backend.events import get_event_broker
+    broker = get_event_broker()
+    return broker.subscriber_count() if broker is not None else None
+
+EVENT_SUBSCRIBERS = registry.register(Gauge(
+    'event_stream_subscribers', 'Open /api/events streams in this process', _event_subscribers))
+
+def observe_mint_stage(stage, seconds):
+    """Record one mint stage timing (unknown stage names are ignored)"""
+    if stage in MINT_STAGES:
+        MINT_STAGE_DURATION.observe(float(seconds), stage)
+
+def count_mint_result(result):
+    """Count a mint_nft-style result dict"""
+    MINT_RESULTS.inc('success' if result.get('success') else 'failure')
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_metrics_start', None)
+    elapsed = time.perf_counter() - start if start is not None else 0.0
+    SQL_STATEMENTS.inc()
+    SQL_DURATION.inc(amount=elapsed)
+    stats = _request_sql.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
+
+def _start_request():
+    g._metrics_start = time.perf_counter()
+    g._metrics_sql_token = _request_sql.set([0, 0.0])
+
+def _record_request(response):
+    start = g.pop('_metrics_start', None)
+    token = g.pop('_metrics_sql_token', None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    # The URL rule, not the path, so IDs and wallets do not become label values
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    method = request.method
+    HTTP_REQUESTS.inc(method, route, str(response.status_code))
+    HTTP_LATENCY.observe(elapsed, method, route)
+    if token is not None:
+        statements, sql_seconds = token.var.get()
+        _request_sql.reset(token)
+        HTTP_SQL_STATEMENTS.observe(statements, method, route)
+        HTTP_SQL_DURATION.observe(sql_seconds, method, route)
+    return response
+
+def metrics_endpoint():
+    return Response(registry.render(), content_type=CONTENT_TYPE)
+
+def init_metrics(app):
+    """
+    Install the request middleware, SQL listeners and GET /metrics
+
+    Skipped entirely when METRICS_ENABLED is false.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    # Listening on the Engine class covers the primary, the replica and any later bind
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    app.before_request(_start_request)
+    app.after_request(_record_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint)
@@ -26,6 +26,13 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Use the database configured on the Flask app
+from flask import current_app, has_app_context
+app = current_app if has_app_context() else create_app()
+config.set_main_option(
+    'sqlalchemy.url', app.config['SQLALCHEMY_DATABASE_URI'].replace('%', '%%')
+)
+
 target_metadata = db.metadata
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,104 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+Tables as originally created by db.create_all(). Databases created that
+way should be stamped at this revision: flask db stamp 0001
+Tables that already exist (create_all ran on boot) are skipped.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'tournaments' not in existing:
+        _create_tournaments()
+    if 'teams' not in existing:
+        _create_teams()
+    if 'matches' not in existing:
+        _create_matches()
+    if 'winners' not in existing:
+        _create_winners()
+
+
+def _create_tournaments():
+    op.create_table('tournaments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('tournament_name', sa.String(length=100), nullable=False),
+        sa.Column('format_type', sa.String(length=50), nullable=False),
+        sa.Column('month', sa.String(length=50), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('badge_image_url', sa.String(length=500), nullable=True),
+        sa.Column('badge_metadata_url', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('password_hash', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def _create_teams():
+    op.create_table('teams',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+        sa.Column('team_name', sa.String(length=200), nullable=False),
+        sa.Column('player_names', sa.Text(), nullable=True),
+        sa.Column('captain_wallet_address', sa.String(length=100), nullable=False),
+        sa.Column('registered_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def _create_matches():
+    op.create_table('matches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+        sa.Column('team1_id', sa.Integer(), nullable=False),
+        sa.Column('team2_id', sa.Integer(), nullable=False),
+        sa.Column('round', sa.Integer(), nullable=False),
+        sa.Column('team1_score', sa.Integer(), nullable=True),
+        sa.Column('team2_score', sa.Integer(), nullable=True),
+        sa.Column('winner_id', sa.Integer(), nullable=True),
+        sa.Column('played_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['team1_id'], ['teams.id'], ),
+        sa.ForeignKeyConstraint(['team2_id'], ['teams.id'], ),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+        sa.ForeignKeyConstraint(['winner_id'], ['teams.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def _create_winners():
+    op.create_table('winners',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('wallet_address', sa.String(length=100), nullable=False),
+        sa.Column('nft_token_id', sa.String(length=100), nullable=True),
+        sa.Column('nft_metadata_uri', sa.String(length=500), nullable=True),
+        sa.Column('minted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('winners')
+    op.drop_table('matches')
+    op.drop_table('teams')
+    op.drop_table('tournaments')
@@ -0,0 +1,62 @@
+"""mint jobs and badge upload cache
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:10:00.000000
+
+Tables may already exist when db.create_all() ran on boot first, so each
+step checks the live schema.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('mint_jobs'):
+        op.create_table('mint_jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('winner_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('max_attempts', sa.Integer(), nullable=False),
+            sa.Column('available_at', sa.DateTime(), nullable=False),
+            sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['winner_id'], ['winners.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('winner_id')
+        )
+
+    if not inspector.has_table('badge_uploads'):
+        op.create_table('badge_uploads',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('content_hash', sa.String(length=64), nullable=False),
+            sa.Column('arweave_uri', sa.String(length=500), nullable=False),
+            sa.Column('content_type', sa.String(length=100), nullable=True),
+            sa.Column('size_bytes', sa.Integer(), nullable=True),
+            sa.Column('source_url', sa.String(length=500), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('content_hash')
+        )
+
+    if 'badge_content_hash' not in {c['name'] for c in inspector.get_columns('tournaments')}:
+        op.add_column('tournaments', sa.Column('badge_content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    op.drop_column('tournaments', 'badge_content_hash')
+    op.drop_table('badge_uploads')
+    op.drop_table('mint_jobs')
@@ -0,0 +1,46 @@
+"""indexes for API lookup paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:20:00.000000
+
+- winners.wallet_address: Dashboard lookup by wallet
+- winners.tournament_id (unique): one champion per tournament
+- winners.created_at: Hall of Champions ordering
+- teams.tournament_id: team list per tournament
+- matches(tournament_id, round): results per tournament and round
+- tournaments.status: open tournament listing
+- mint_jobs(status, available_at): mint worker claim query
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_winners_wallet_address', 'winners', ['wallet_address'], False),
+    ('ix_winners_tournament_id', 'winners', ['tournament_id'], True),
+    ('ix_winners_created_at', 'winners', ['created_at'], False),
+    ('ix_teams_tournament_id', 'teams', ['tournament_id'], False),
+    ('ix_matches_tournament_id_round', 'matches', ['tournament_id', 'round'], False),
+    ('ix_tournaments_status', 'tournaments', ['status'], False),
+    ('ix_mint_jobs_status_available_at', 'mint_jobs', ['status', 'available_at'], False),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns, unique in INDEXES:
+        if name not in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for name, table, columns, unique in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
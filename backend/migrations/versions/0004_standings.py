@@ -0,0 +1,46 @@
+"""standings table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:30:00.000000
+
+Backfill existing tournaments afterwards with: flask rebuild-standings
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('standings'):
+        return
+    op.create_table('standings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('played', sa.Integer(), nullable=False),
+        sa.Column('won', sa.Integer(), nullable=False),
+        sa.Column('drawn', sa.Integer(), nullable=False),
+        sa.Column('lost', sa.Integer(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('score_for', sa.Integer(), nullable=False),
+        sa.Column('score_against', sa.Integer(), nullable=False),
+        sa.Column('last_round_won', sa.Integer(), nullable=False),
+        sa.Column('eliminated_round', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tournament_id', 'team_id', name='uq_standings_tournament_id_team_id')
+    )
+
+
+def downgrade():
+    op.drop_table('standings')
@@ -0,0 +1,31 @@
+"""winner mint signature and confirmation
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('winners')}
+    with op.batch_alter_table('winners') as batch_op:
+        if 'nft_signature' not in columns:
+            batch_op.add_column(sa.Column('nft_signature', sa.String(length=100), nullable=True))
+        if 'nft_confirmed_at' not in columns:
+            batch_op.add_column(sa.Column('nft_confirmed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('winners') as batch_op:
+        batch_op.drop_column('nft_confirmed_at')
+        batch_op.drop_column('nft_signature')
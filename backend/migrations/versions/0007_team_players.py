@@ -0,0 +1,99 @@
+"""normalized team rosters
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 16:00:00.000000
+
+Moves teams.player_names (a JSON array in a text column) into one
+team_players row per player, then drops the column.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+teams = sa.table('teams', sa.column('id', sa.Integer), sa.column('player_names', sa.Text))
+team_players = sa.table('team_players',
+    sa.column('team_id', sa.Integer),
+    sa.column('position', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('name_key', sa.String)
+)
+
+
+def _roster(value):
+    """Player names from a player_names cell, matching clean_player_names in models.py"""
+    try:
+        names = json.loads(value) if value else []
+    except ValueError:
+        return []
+    if not isinstance(names, list):
+        return []
+    return [' '.join(str(name).split()) for name in names if name is not None and str(name).strip()]
+
+
+def _backfill(bind):
+    """Copy player_names into team_players, a batch of teams at a time"""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(teams.c.id, teams.c.player_names)
+            .where(teams.c.id > last_id)
+            .order_by(teams.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        players = [{'team_id': row.id, 'position': position, 'name': name, 'name_key': name.casefold()}
+                   for row in rows for position, name in enumerate(_roster(row.player_names))]
+        if players:
+            bind.execute(team_players.insert(), players)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('team_players'):
+        op.create_table('team_players',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('team_id', sa.Integer(), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=200), nullable=False),
+            sa.Column('name_key', sa.String(length=200), nullable=False),
+            sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('team_id', 'position', name='uq_team_players_team_id_position')
+        )
+        op.create_index('ix_team_players_name_key', 'team_players', ['name_key'])
+
+    if 'player_names' in {c['name'] for c in inspector.get_columns('teams')}:
+        _backfill(bind)
+        with op.batch_alter_table('teams') as batch_op:
+            batch_op.drop_column('player_names')
+
+
+def downgrade():
+    bind = op.get_bind()
+    with op.batch_alter_table('teams') as batch_op:
+        batch_op.add_column(sa.Column('player_names', sa.Text(), nullable=True))
+
+    rosters = {}
+    for team_id, name in bind.execute(
+            sa.select(team_players.c.team_id, team_players.c.name)
+            .order_by(team_players.c.team_id, team_players.c.position)):
+        rosters.setdefault(team_id, []).append(name)
+    for team_id, names in rosters.items():
+        bind.execute(teams.update().where(teams.c.id == team_id).values(player_names=json.dumps(names)))
+
+    op.drop_index('ix_team_players_name_key', table_name='team_players')
+    op.drop_table('team_players')
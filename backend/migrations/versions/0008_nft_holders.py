@@ -0,0 +1,42 @@
+"""nft_holders table for the ownership indexer
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('nft_holders'):
+        return
+    op.create_table('nft_holders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('winner_id', sa.Integer(), nullable=False),
+        sa.Column('mint_address', sa.String(length=100), nullable=False),
+        sa.Column('token_account', sa.String(length=100), nullable=True),
+        sa.Column('owner_wallet', sa.String(length=100), nullable=True),
+        sa.Column('slot', sa.BigInteger(), nullable=True),
+        sa.Column('checked_at', sa.DateTime(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['winner_id'], ['winners.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('winner_id')
+    )
+    op.create_index('ix_nft_holders_owner_wallet', 'nft_holders', ['owner_wallet'])
+    op.create_index('ix_nft_holders_checked_at', 'nft_holders', ['checked_at'])
+
+
+def downgrade():
+    op.drop_index('ix_nft_holders_checked_at', table_name='nft_holders')
+    op.drop_index('ix_nft_holders_owner_wallet', table_name='nft_holders')
+    op.drop_table('nft_holders')
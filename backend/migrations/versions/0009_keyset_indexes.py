@@ -0,0 +1,47 @@
+"""composite indexes for keyset pagination
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 20:00:00.000000
+
+- tournaments(status, id) replaces tournaments(status): pages of a status by id
+- tournaments(year, month): season filters
+- teams(tournament_id, id) replaces teams(tournament_id): pages of a tournament's teams
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_tournaments_status_id', 'tournaments', ['status', 'id']),
+    ('ix_tournaments_year_month', 'tournaments', ['year', 'month']),
+    ('ix_teams_tournament_id_id', 'teams', ['tournament_id', 'id']),
+]
+REPLACED = [
+    ('ix_tournaments_status', 'tournaments', ['status']),
+    ('ix_teams_tournament_id', 'teams', ['tournament_id']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+    for name, table, columns in REPLACED:
+        if name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    for name, table, columns in REPLACED:
+        op.create_index(name, table, columns)
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
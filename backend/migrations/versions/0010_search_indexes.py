@@ -0,0 +1,44 @@
+"""trigram search indexes (PostgreSQL)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 22:00:00.000000
+
+GiST pg_trgm indexes behind GET /api/search, which read the best
+matches in word similarity order (`<<->`). Other databases search an
+in-process index, so this revision is a no-op there.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_tournaments_search', 'tournaments', "(tournament_name || ' ' || name)"),
+    ('ix_teams_search', 'teams', 'team_name'),
+    ('ix_team_players_search', 'team_players', 'name_key'),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    inspector = sa.inspect(bind)
+    for name, table, expression in INDEXES:
+        if name not in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, [sa.text(f'{expression} gist_trgm_ops')], postgresql_using='gist')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table, expression in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,28 @@
+"""winner rendered badge
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('winners')}
+    if 'rendered_badge_url' not in columns:
+        with op.batch_alter_table('winners') as batch_op:
+            batch_op.add_column(sa.Column('rendered_badge_url', sa.String(length=200), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('winners') as batch_op:
+        batch_op.drop_column('rendered_badge_url')
@@ -0,0 +1,28 @@
+"""mint job keypair seed
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('mint_jobs')}
+    if 'mint_seed' not in columns:
+        with op.batch_alter_table('mint_jobs') as batch_op:
+            batch_op.add_column(sa.Column('mint_seed', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('mint_jobs') as batch_op:
+        batch_op.drop_column('mint_seed')
@@ -0,0 +1,241 @@
+"""
+Metaplex Minting Daemon Client
+Keeps one long-lived Node.js process (metaplex/mint_daemon.js) and talks to
+it with line-delimited JSON, so several mints can be in flight at once
+
+A caller that times out does not abandon the work silently: requests still
+waiting in the daemon are cancelled, and a request that already started is
+left to finish and its result handed to on_late_result.
+"""
+from backend.metrics import observe_mint_stage
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import itertools
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCRIPT_PATH = os.path.join(os.path.dirname(__file__), '..', 'metaplex', 'mint_daemon.js')
+
+class MintDaemonError(Exception):
+    """Raised when the daemon reports an error or cannot be reached"""
+
+class MintDaemonClient:
+    def __init__(self, rpc_url, script_path=DEFAULT_SCRIPT_PATH, request_timeout=120,
+                 restart_backoff=1.0, restart_backoff_max=30.0, env=None, on_late_result=None):
+        """
+        Initialize the client (the daemon is spawned on first use)
+
+        Args:
+            rpc_url: Solana RPC endpoint passed to the daemon
+            script_path: Path to mint_daemon.js
+            request_timeout: Default seconds to wait for a response
+            restart_backoff: Initial delay before respawning a crashed daemon
+            restart_backoff_max: Upper bound for the respawn delay
+            env: Extra environment variables for the daemon
+            on_late_result: Called with (op, params, result) when a request
+                succeeds after its caller stopped waiting
+        """
+        self.rpc_url = rpc_url
+        self.script_path = script_path
+        self.request_timeout = request_timeout
+        self.restart_backoff = restart_backoff
+        self.restart_backoff_max = restart_backoff_max
+        self.env = env or {}
+        self.on_late_result = on_late_result
+
+        self._process = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._crashes = 0
+        self._last_crash = 0.0
+        self._closed = False
+        self._spawned_at = None
+
+    def call(self, op, params=None, timeout=None):
+        """
+        Send a request and wait for its response
+
+        Args:
+            op: Daemon operation ('mint', 'ping', ...)
+            params: JSON-serializable parameters
+            timeout: Seconds to wait, defaults to request_timeout
+
+        Returns:
+            dict: The operation result
+
+        Raises:
+            MintDaemonError: On daemon errors, crashes or timeouts
+        """
+        return self.submit(op, params).result_or_raise(timeout or self.request_timeout)
+
+    def submit(self, op, params=None):
+        """
+        Send a request without waiting, so many can be in flight at once
+
+        Returns:
+            _PendingCall: Handle whose result_or_raise() waits for the response
+        """
+        request_id = next(self._ids)
+        future = Future()
+        params = params or {}
+        line = json.dumps({'id': request_id, 'op': op, 'params': params}) + '\n'
+
+        process = self._ensure_started()
+        with self._lock:
+            self._pending[request_id] = future
+        try:
+            with self._write_lock:
+                process.stdin.write(line)
+                process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            future.set_exception(MintDaemonError(f'Mint daemon unavailable: {e}'))
+        return _PendingCall(self, request_id, future, op, params)
+
+    def abandon(self, call):
+        """
+        The caller stopped waiting for a request
+
+        Cancels it if it is still queued in the daemon. Otherwise it runs to
+        the end, and a successful result goes to on_late_result.
+        """
+        try:
+            self.submit('cancel', {'id': call.request_id})
+        except MintDaemonError as e:
+            logger.warning('Could not cancel daemon request %s: %s', call.request_id, e)
+        call.future.add_done_callback(lambda future: self._late_result(call, future))
+
+    def _late_result(self, call, future):
+        if future.exception() is not None or self.on_late_result is None:
+            return
+        # Off the reader thread, which must keep delivering other responses
+        thread = threading.Thread(target=self._record_late_result, args=(call, future.result()),
+                                  name='mint-daemon-late-result')
+        thread.daemon = True
+        thread.start()
+
+    def _record_late_result(self, call, result):
+        try:
+            self.on_late_result(call.op, call.params, result)
+        except Exception:
+            logger.exception('Error recording late %s result for daemon request %s', call.op, call.request_id)
+
+    def close(self):
+        """Close stdin so the daemon finishes in-flight work and exits"""
+        self._closed = True
+        with self._lock:
+            process = self._process
+            self._process = None
+        if process is not None and process.poll() is None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=self.request_timeout)
+            except Exception:
+                process.kill()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._closed:
+                raise MintDaemonError('Mint daemon client is closed')
+            if self._process is not None and self._process.poll() is None:
+                return self._process
+
+            # Respawn with exponential backoff after repeated crashes
+            if self._crashes:
+                delay = min(self.restart_backoff_max, self.restart_backoff * (2 ** (self._crashes - 1)))
+                remaining = self._last_crash + delay - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+
+            env = dict(os.environ)
+            env.update(self.env)
+            self._spawned_at = time.perf_counter()
+            self._process = subprocess.Popen(
+                ['node', self.script_path, self.rpc_url],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                env=env
+            )
+            for target in (self._read_stdout, self._read_stderr):
+                thread = threading.Thread(target=target, args=(self._process,), name='mint-daemon-reader')
+                thread.daemon = True
+                thread.start()
+            return self._process
+
+    def _read_stdout(self, process):
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning('unexpected daemon output: %s', line.rstrip())
+                continue
+
+            if 'event' in message:
+                self._handle_event(message)
+                continue
+
+            with self._lock:
+                future = self._pending.pop(message.get('id'), None)
+            if future is None:
+                continue
+            if message.get('ok'):
+                future.set_result(message.get('result') or {})
+            else:
+                future.set_exception(MintDaemonError(message.get('error', 'Unknown error')))
+
+        # stdout closed: the daemon exited, fail everything still waiting on it
+        process.wait()
+        with self._lock:
+            if self._process is process:
+                self._process = None
+            if not self._closed:
+                self._crashes += 1
+                self._last_crash = time.monotonic()
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(MintDaemonError(f'Mint daemon exited with code {process.returncode}'))
+
+    def _read_stderr(self, process):
+        for line in process.stderr:
+            logger.info('%s', line.rstrip())
+
+    def _handle_event(self, message):
+        if message['event'] == 'stage':
+            observe_mint_stage(message.get('stage'), message.get('seconds', 0))
+        elif message['event'] == 'ready':
+            # A healthy start resets the respawn backoff
+            self._crashes = 0
+            if self._spawned_at is not None:
+                observe_mint_stage('spawn', time.perf_counter() - self._spawned_at)
+                self._spawned_at = None
+        elif message['event'] == 'fatal':
+            logger.error('daemon failed to start: %s', message.get('error'))
+
+class _PendingCall:
+    def __init__(self, client, request_id, future, op, params):
+        self.client = client
+        self.request_id = request_id
+        self.future = future
+        self.op = op
+        self.params = params
+
+    def result_or_raise(self, timeout=None):
+        try:
+            return self.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Stays in _pending: a late response is still delivered to the future
+            self.client.abandon(self)
+            raise MintDaemonError('NFT minting timed out')
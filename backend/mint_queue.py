@@ -0,0 +1,313 @@
+"""
+Durable NFT Mint Queue
+Mint jobs are persisted in the mint_jobs table and drained by a bounded
+pool of worker threads, so in-flight mints survive restarts
+"""
+from backend.app import db
+from backend.cache import invalidate_tags, winner_tag
+from backend.models import MintJob
+from sqlalchemy import and_, func, or_, update
+from datetime import datetime, timedelta
+import logging
+import random
+import secrets
+import threading
+
+logger = logging.getLogger(__name__)
+
+def enqueue_mint(winner, max_attempts=None):
+    """
+    Add a mint job for a winner to the current session
+
+    The job is committed together with the caller's transaction, so a
+    declared winner is never left without a job. Call notify_mint_queue()
+    after the commit to wake an idle worker.
+
+    Args:
+        winner: Winner instance (may not be flushed yet)
+        max_attempts: Override for the configured retry limit
+
+    Returns:
+        MintJob: The pending job
+    """
+    job = MintJob(winner=winner, status='pending', attempts=0, available_at=datetime.utcnow())
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    elif _mint_queue is not None:
+        job.max_attempts = _mint_queue.max_attempts
+    db.session.add(job)
+    return job
+
+class MintWorkerPool:
+    def __init__(self, app, concurrency=2, max_attempts=5, visibility_timeout=300,
+                 poll_interval=5.0, backoff_base=30, backoff_max=900):
+        """
+        Initialize the worker pool
+
+        Args:
+            app: Flask application, pushed as app context in every worker
+            concurrency: Number of worker threads (max mints in flight per process)
+            max_attempts: Attempts before a job is marked failed
+            visibility_timeout: Seconds a claimed job stays invisible to other workers
+            poll_interval: Seconds an idle worker sleeps between claims
+            backoff_base: Retry delay in seconds after the first failure
+            backoff_max: Upper bound for the retry delay in seconds
+        """
+        self.app = app
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self):
+        """Start the worker threads"""
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._run, name=f'mint-worker-{i}')
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Ask workers to exit after their current job and wait for them"""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        """Wake idle workers after new jobs were committed"""
+        self._wake.set()
+
+    def backoff(self, attempts):
+        """Exponential backoff with jitter for the given attempt number"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(attempts - 1, 0)))
+        return delay * (0.5 + random.random() / 2)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    job_id = self.claim()
+                    if job_id is not None:
+                        self.process(job_id)
+            except Exception as e:
+                logger.exception('Mint worker error: %s', e)
+                job_id = None
+
+            if job_id is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def claim(self):
+        """
+        Claim the next due job
+
+        A job is claimable when it is pending and due, or when it is running
+        but its lease expired (the worker holding it died). The conditional
+        UPDATE makes the claim atomic across threads and processes, and
+        gives the job its mint seed (see new_mint_seed) if it has none yet.
+
+        Returns:
+            int: Claimed job ID, or None if nothing is due
+        """
+        now = datetime.utcnow()
+        claimable = or_(
+            and_(MintJob.status == 'pending', MintJob.available_at <= now),
+            and_(MintJob.status == 'running', MintJob.lease_expires_at < now)
+        )
+        try:
+            job = db.session.query(MintJob.id, MintJob.winner_id).filter(claimable) \
+                .order_by(MintJob.available_at).limit(1).first()
+            if job is None:
+                return None
+            job_id = job.id
+
+            result = db.session.execute(
+                update(MintJob)
+                .where(MintJob.id == job_id, claimable)
+                .values(
+                    status='running',
+                    attempts=MintJob.attempts + 1,
+                    lease_expires_at=now + timedelta(seconds=self.visibility_timeout),
+                    mint_seed=func.coalesce(MintJob.mint_seed, new_mint_seed()),
+                    updated_at=now
+                )
+            )
+            if result.rowcount == 1:
+                invalidate_tags(winner_tag(job.winner_id))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if result.rowcount != 1:
+            # Another worker won the race; poll again right away
+            self._wake.set()
+            return None
+        return job_id
+
+    def process(self, job_id):
+        """Run a claimed job and record the outcome"""
+        from backend.routes.nft import mint_champion_nft
+
+        job = db.session.get(MintJob, job_id)
+        if job.attempts > job.max_attempts:
+            # Lease expired on the final attempt
+            result = {'success': False, 'error': job.last_error or 'Visibility timeout exceeded'}
+        else:
+            result = mint_champion_nft(job.winner_id)
+
+        job = db.session.get(MintJob, job_id)
+        self.record_result(job, result)
+        db.session.commit()
+
+    def record_result(self, job, result):
+        """Update a job from a mint result: succeed, schedule a retry, or fail (caller commits)"""
+        invalidate_tags(winner_tag(job.winner_id))
+        job.lease_expires_at = None
+        if result['success']:
+            job.status = 'succeeded'
+            job.last_error = None
+        elif job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            job.last_error = result.get('error')
+        else:
+            job.status = 'pending'
+            job.last_error = result.get('error')
+            job.available_at = datetime.utcnow() + timedelta(seconds=self.backoff(job.attempts))
+
+    def lease_for_winners(self, winners, lease_seconds=None):
+        """
+        Lease mint jobs for winners minted outside the workers (batch minting)
+
+        Winners without a job get one created in the running state. Jobs
+        already leased by a worker are left alone, so the same winner is
+        never minted twice at once, and so are succeeded jobs.
+
+        Args:
+            winners: Winners about to be minted
+            lease_seconds: How long the caller may hold the jobs, at least
+                the visibility timeout
+
+        Returns:
+            dict: winner_id -> leased MintJob, for winners safe to mint now
+        """
+        now = datetime.utcnow()
+        lease_expires_at = now + timedelta(seconds=max(self.visibility_timeout, lease_seconds or 0))
+        leasable = or_(
+            MintJob.status.in_(('pending', 'failed')),
+            and_(MintJob.status == 'running', MintJob.lease_expires_at < now)
+        )
+        jobs = {j.winner_id: j for j in MintJob.query.filter(MintJob.winner_id.in_([w.id for w in winners]))}
+
+        leased = {}
+        for winner in winners:
+            job = jobs.get(winner.id)
+            if job is None:
+                job = MintJob(winner_id=winner.id, status='running', attempts=1, max_attempts=self.max_attempts,
+                              lease_expires_at=lease_expires_at, mint_seed=new_mint_seed())
+                db.session.add(job)
+            else:
+                result = db.session.execute(
+                    update(MintJob)
+                    .where(MintJob.id == job.id, leasable)
+                    .values(
+                        status='running',
+                        attempts=MintJob.attempts + 1,
+                        lease_expires_at=lease_expires_at,
+                        mint_seed=func.coalesce(MintJob.mint_seed, new_mint_seed()),
+                        updated_at=now
+                    )
+                    .execution_options(synchronize_session='fetch')
+                )
+                if result.rowcount != 1:
+                    continue
+            invalidate_tags(winner_tag(winner.id))
+            leased[winner.id] = job
+        db.session.commit()
+        return leased
+
+def new_mint_seed():
+    """
+    Seed for the keypair of a winner's NFT mint account
+
+    It is stored on the job before the first attempt is sent and kept by
+    every retry, so a retry mints to the same address and finds an NFT an
+    earlier attempt already created instead of minting a second one.
+    """
+    return secrets.token_hex(32)
+
+def requeue_mints(winner_ids, reason):
+    """
+    Queue winners whose mint has to be redone (caller commits)
+
+    Failed and finished jobs are reset to pending with a fresh attempt
+    budget, and winners without a job get one. Jobs still pending or held
+    by a worker with a live lease are left alone. A reset job drops its
+    mint seed, so the redo gets a new mint address and idempotency key
+    rather than the daemon's cached result for the old ones.
+
+    Returns:
+        list: IDs of the winners that were queued
+    """
+    now = datetime.utcnow()
+    resettable = or_(
+        MintJob.status.in_(('failed', 'succeeded')),
+        and_(MintJob.status == 'running', MintJob.lease_expires_at < now)
+    )
+    jobs = {j.winner_id: j for j in MintJob.query.filter(MintJob.winner_id.in_(winner_ids))}
+
+    queued = []
+    for winner_id in winner_ids:
+        job = jobs.get(winner_id)
+        if job is None:
+            db.session.add(MintJob(winner_id=winner_id, status='pending', attempts=0, available_at=now,
+                                   max_attempts=_mint_queue.max_attempts if _mint_queue else 5,
+                                   last_error=reason))
+        else:
+            result = db.session.execute(
+                update(MintJob)
+                .where(MintJob.id == job.id, resettable)
+                .values(status='pending', attempts=0, available_at=now, lease_expires_at=None,
+                        mint_seed=None, last_error=reason, updated_at=now)
+                .execution_options(synchronize_session='fetch')
+            )
+            if result.rowcount != 1:
+                continue
+        invalidate_tags(winner_tag(winner_id))
+        queued.append(winner_id)
+    return queued
+
+# Singleton instance
+_mint_queue = None
+
+def init_mint_queue(app):
+    """Create and start the worker pool from app config"""
+    global _mint_queue
+    if _mint_queue is None:
+        _mint_queue = MintWorkerPool(
+            app,
+            concurrency=app.config['MINT_WORKER_CONCURRENCY'],
+            max_attempts=app.config['MINT_MAX_ATTEMPTS'],
+            visibility_timeout=app.config['MINT_VISIBILITY_TIMEOUT'],
+            poll_interval=app.config['MINT_POLL_INTERVAL'],
+            backoff_base=app.config['MINT_RETRY_BACKOFF'],
+            backoff_max=app.config['MINT_RETRY_BACKOFF_MAX']
+        )
+        if _mint_queue.concurrency > 0:
+            _mint_queue.start()
+    return _mint_queue
+
+def get_mint_queue():
+    return _mint_queue
+
+def notify_mint_queue():
+    if _mint_queue is not None:
+        _mint_queue.notify()
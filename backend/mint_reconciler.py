@@ -0,0 +1,184 @@
+"""
+Mint Reconciliation
+Periodically (or on demand) checks minted winners against the chain and
+finds winners left without a mint:
+- unconfirmed mint signatures are looked up in bulk with getSignatureStatuses
+- finalized mints are marked confirmed
+- mints that failed on-chain are cleared and re-queued, and so are
+  signatures unknown after MINT_DROP_AFTER whose mint account does not
+  exist either (getMultipleAccounts)
+- unminted winners without a mint job are queued again
+
+The periodic sweep runs in one process at a time: each pass first takes
+the 'mint-reconciler' lease (see backend.leases).
+"""
+from backend.app import db
+from backend.cache import WINNERS_TAG, invalidate_tags, wallet_tag, winner_tag
+from backend.events import publish_event
+from backend.leases import acquire_lease, lease_holder
+from backend.mint_queue import notify_mint_queue, requeue_mints
+from backend.models import MintJob, Winner
+from backend.solana_rpc import SolanaRPCClient, cluster_endpoint, is_confirmed
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_, update
+import click
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+def get_rpc_client():
+    """RPC client for SOLANA_RPC_URL, or the public endpoint of SOLANA_NETWORK"""
+    endpoint = current_app.config['SOLANA_RPC_URL'] or cluster_endpoint(current_app.config['SOLANA_NETWORK'])
+    return SolanaRPCClient(endpoint)
+
+def reconcile_mints(rpc=None, retry_failed=False, limit=None):
+    """
+    Run one reconciliation pass and commit its changes in one transaction
+
+    Args:
+        rpc: SolanaRPCClient, defaults to get_rpc_client()
+        retry_failed: Also re-queue winners whose mint job exhausted its attempts
+        limit: Max unconfirmed winners checked per pass (MINT_RECONCILE_BATCH)
+
+    Returns:
+        dict: Counts of checked, confirmed and pending mints, and the re-queued winner IDs
+    """
+    rpc = rpc or get_rpc_client()
+    limit = limit or current_app.config['MINT_RECONCILE_BATCH']
+    commitment = current_app.config['MINT_CONFIRM_COMMITMENT']
+    now = datetime.utcnow()
+    drop_before = now - timedelta(seconds=current_app.config['MINT_DROP_AFTER'])
+
+    # Minted but not yet finalized
+    unconfirmed = db.session.query(
+        Winner.id, Winner.tournament_id, Winner.wallet_address, Winner.nft_token_id, Winner.nft_signature,
+        Winner.minted_at
+    ).filter(
+        Winner.nft_signature.isnot(None), Winner.nft_confirmed_at.is_(None)
+    ).order_by(Winner.minted_at).limit(limit).all()
+
+    statuses = rpc.get_signature_statuses([w.nft_signature for w in unconfirmed]) if unconfirmed else []
+
+    confirmed, dropped, pending, unknown = [], {}, 0, []
+    for winner, status in zip(unconfirmed, statuses):
+        if is_confirmed(status, commitment):
+            confirmed.append(winner)
+        elif status is not None and status.get('err') is not None:
+            dropped[winner.id] = (winner, f"Mint transaction failed on-chain: {status['err']}")
+        elif status is None and winner.minted_at and winner.minted_at < drop_before:
+            unknown.append(winner)
+        else:
+            pending += 1
+
+    # A signature the node no longer knows is not proof of a dropped mint:
+    # only clear winners whose mint account does not exist either
+    if unknown:
+        accounts, _ = rpc.get_multiple_accounts([w.nft_token_id for w in unknown], commitment=commitment)
+        for winner, account in zip(unknown, accounts):
+            if account is not None:
+                confirmed.append(winner)
+            else:
+                dropped[winner.id] = (winner, 'Mint transaction not found on-chain')
+
+    # Never minted and nothing left to retry it
+    orphaned = Winner.query.outerjoin(MintJob, MintJob.winner_id == Winner.id) \
+        .filter(Winner.nft_token_id.is_(None))
+    if retry_failed:
+        orphaned = orphaned.filter(or_(MintJob.id.is_(None), MintJob.status == 'failed'))
+    else:
+        orphaned = orphaned.filter(MintJob.id.is_(None))
+    orphaned = orphaned.with_entities(Winner.id).limit(limit).all()
+
+    if confirmed:
+        db.session.execute(
+            update(Winner).where(Winner.id.in_([w.id for w in confirmed])).values(nft_confirmed_at=now)
+        )
+    if dropped:
+        db.session.execute(
+            update(Winner).where(Winner.id.in_(list(dropped))).values(
+                nft_token_id=None, nft_metadata_uri=None, nft_signature=None, minted_at=None
+            )
+        )
+    changed = confirmed + [w for w, _ in dropped.values()]
+    if changed:
+        invalidate_tags(WINNERS_TAG, *(wallet_tag(w.wallet_address) for w in changed),
+                        *(winner_tag(w.id) for w in changed))
+
+    requeued = requeue_mints(list(dropped), 'Re-queued by reconciliation') if dropped else []
+    requeued += requeue_mints([w.id for w in orphaned], 'Re-queued by reconciliation') if orphaned else []
+    db.session.commit()
+
+    if requeued:
+        notify_mint_queue()
+    for winner, reason in dropped.values():
+        publish_event('mint_failed', {'winner_id': winner.id, 'tournament_id': winner.tournament_id,
+                                      'wallet_address': winner.wallet_address, 'error': reason},
+                      tournament_id=winner.tournament_id, wallet_address=winner.wallet_address)
+
+    return {
+        'checked': len(unconfirmed),
+        'confirmed': len(confirmed),
+        'pending': pending,
+        'dropped': len(dropped),
+        'requeued': requeued
+    }
+
+class MintReconciler:
+    """
+    Background thread running reconcile_mints every `interval` seconds
+
+    Every process with MINT_RECONCILE_INTERVAL set starts one, but a pass
+    only runs while this process holds the 'mint-reconciler' lease, which
+    lasts two intervals so another process takes over if the holder exits.
+    """
+
+    LEASE_NAME = 'mint-reconciler'
+
+    def __init__(self, app, interval=600):
+        self.app = app
+        self.interval = interval
+        self.holder = lease_holder()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='mint-reconciler')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                with self.app.app_context():
+                    if acquire_lease(self.LEASE_NAME, self.holder, self.interval * 2):
+                        reconcile_mints()
+            except Exception as e:
+                logger.exception('Mint reconciliation error: %s', e)
+
+# Singleton instance
+_mint_reconciler = None
+
+def init_mint_reconciler(app):
+    """Start periodic reconciliation unless MINT_RECONCILE_INTERVAL is 0"""
+    global _mint_reconciler
+    if _mint_reconciler is None and app.config['MINT_RECONCILE_INTERVAL'] > 0:
+        _mint_reconciler = MintReconciler(app, app.config['MINT_RECONCILE_INTERVAL'])
+        _mint_reconciler.start()
+    return _mint_reconciler
+
+@click.command('reconcile-mints')
+@click.option('--retry-failed', is_flag=True, help='Also re-queue winners whose mint job ran out of attempts')
+def reconcile_mints_command(retry_failed):
+    """Confirm minted NFTs on-chain and re-queue missing or dropped mints"""
+    summary = reconcile_mints(retry_failed=retry_failed)
+    click.echo(f"Checked {summary['checked']} signature(s): {summary['confirmed']} confirmed, "
+               f"{summary['pending']} pending, {summary['dropped']} dropped; "
+               f"re-queued {len(summary['requeued'])} winner(s)")
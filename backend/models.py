@@ -1,6 +1,5 @@
 from datetime import datetime
-from sqlalchemy import JSON
-import json
+from sqlalchemy import DDL, JSON, event, literal_column
 from werkzeug.security import generate_password_hash, check_password_hash
 
 # Import db from app module
@@ -13,6 +12,11 @@ except ImportError:
 
 class Tournament(db.Model):
     __tablename__ = 'tournaments'
+    __table_args__ = (
+        # Keyset pages of a status, newest first
+        db.Index('ix_tournaments_status_id', 'status', 'id'),
+        db.Index('ix_tournaments_year_month', 'year', 'month'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -22,6 +26,7 @@ class Tournament(db.Model):
     year = db.Column(db.Integer, nullable=False)
     badge_image_url = db.Column(db.String(500))
     badge_metadata_url = db.Column(db.String(500))
+    badge_content_hash = db.Column(db.String(64))  # sha256 of the badge image, key into badge_uploads
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default='open')  # open, in_progress, completed
     password_hash = db.Column(db.String(255))  # optional registration password
@@ -42,12 +47,16 @@ class Tournament(db.Model):
             'badge_metadata_url': self.badge_metadata_url,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'status': self.status,
-            'team_count': len(self.teams) if self.teams else 0
+            'team_count': self.team_count or 0
         }
 
-    def set_password(self, password: str):
+    def set_password(self, password: str, method: str = None):
+        """Hash the registration password; method is a Werkzeug hash spec such as 'pbkdf2:sha256:600000'"""
         if password:
-            self.password_hash = generate_password_hash(password)
+            if method:
+                self.password_hash = generate_password_hash(password, method=method)
+            else:
+                self.password_hash = generate_password_hash(password)
         else:
             self.password_hash = None
 
@@ -61,30 +70,96 @@ class Tournament(db.Model):
 
 class Team(db.Model):
     __tablename__ = 'teams'
+    __table_args__ = (
+        # Keyset pages of a tournament's teams
+        db.Index('ix_teams_tournament_id_id', 'tournament_id', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id'), nullable=False)
     team_name = db.Column(db.String(200), nullable=False)
-    player_names = db.Column(db.Text)  # JSON array of player names
     captain_wallet_address = db.Column(db.String(100), nullable=False)  # Solana wallet
     registered_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
     matches_as_team1 = db.relationship('Match', foreign_keys='Match.team1_id', backref='team1', lazy=True)
     matches_as_team2 = db.relationship('Match', foreign_keys='Match.team2_id', backref='team2', lazy=True)
+    players = db.relationship('TeamPlayer', backref='team', lazy=True, order_by='TeamPlayer.position',
+                              cascade='all, delete-orphan')
+    
+    @property
+    def player_names(self):
+        return [player.name for player in self.players]
+    
+    @player_names.setter
+    def player_names(self, names):
+        self.players = [TeamPlayer(position=position, name=name, name_key=player_key(name))
+                        for position, name in enumerate(clean_player_names(names))]
     
     def to_dict(self):
         return {
             'id': self.id,
             'tournament_id': self.tournament_id,
             'team_name': self.team_name,
-            'player_names': json.loads(self.player_names) if self.player_names else [],
+            'player_names': self.player_names,
             'captain_wallet_address': self.captain_wallet_address,
             'registered_at': self.registered_at.isoformat() if self.registered_at else None
         }
 
+def clean_player_names(names):
+    """Roster names as trimmed strings, dropping blanks"""
+    if not isinstance(names, (list, tuple)):
+        raise ValueError('player_names must be a list')
+    return [' '.join(str(name).split()) for name in names if name is not None and str(name).strip()]
+
+def player_key(name):
+    """Lookup key for a player name: whitespace-collapsed and case-folded"""
+    return ' '.join(name.split()).casefold()
+
+class TeamPlayer(db.Model):
+    __tablename__ = 'team_players'
+    __table_args__ = (
+        # Also serves loading a team's roster in order
+        db.UniqueConstraint('team_id', 'position', name='uq_team_players_team_id_position'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)  # order on the roster
+    name = db.Column(db.String(200), nullable=False)
+    name_key = db.Column(db.String(200), nullable=False, index=True)  # player_key(name), for GET /api/player/<name>
+
+# Team count as a correlated subquery, loaded in the same SELECT as the
+# tournament instead of lazily loading every team row
+Tournament.team_count = db.column_property(
+    db.select(db.func.count(Team.id))
+    .where(Team.tournament_id == Tournament.id)
+    .correlate_except(Team)
+    .scalar_subquery()
+)
+
+def tournament_search_text():
+    """Tournament text matched by GET /api/search: tournament_name and name"""
+    return (Tournament.tournament_name + literal_column("' '") + Tournament.name).self_group()
+
+# Trigram indexes for GET /api/search on PostgreSQL (pg_trgm); GiST so the
+# best matches are read in similarity order. Other databases search the
+# in-process index in backend/search.py instead
+event.listen(db.metadata, 'before_create',
+             DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
+db.Index('ix_tournaments_search', tournament_search_text().label('search_text'), postgresql_using='gist',
+         postgresql_ops={'search_text': 'gist_trgm_ops'}).ddl_if(dialect='postgresql')
+db.Index('ix_teams_search', Team.team_name, postgresql_using='gist',
+         postgresql_ops={'team_name': 'gist_trgm_ops'}).ddl_if(dialect='postgresql')
+db.Index('ix_team_players_search', TeamPlayer.name_key, postgresql_using='gist',
+         postgresql_ops={'name_key': 'gist_trgm_ops'}).ddl_if(dialect='postgresql')
+
 class Match(db.Model):
     __tablename__ = 'matches'
+    __table_args__ = (
+        # Also serves lookups by tournament_id alone
+        db.Index('ix_matches_tournament_id_round', 'tournament_id', 'round'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id'), nullable=False)
@@ -113,13 +188,16 @@ class Winner(db.Model):
     __tablename__ = 'winners'
     
     id = db.Column(db.Integer, primary_key=True)
-    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id'), nullable=False)
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id'), nullable=False, unique=True, index=True)  # one champion per tournament
     team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
-    wallet_address = db.Column(db.String(100), nullable=False)
+    wallet_address = db.Column(db.String(100), nullable=False, index=True)
     nft_token_id = db.Column(db.String(100))  # Solana token ID
     nft_metadata_uri = db.Column(db.String(500))
+    nft_signature = db.Column(db.String(100))  # mint transaction, checked by the reconciler
+    nft_confirmed_at = db.Column(db.DateTime)  # set once the mint transaction is finalized
     minted_at = db.Column(db.DateTime)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    rendered_badge_url = db.Column(db.String(200))  # /badges/<key>.png, the per-winner badge the NFT was minted with
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     team = db.relationship('Team', backref='wins', lazy=True)
@@ -137,8 +215,145 @@ class Winner(db.Model):
             'wallet_address': self.wallet_address,
             'nft_token_id': self.nft_token_id,
             'nft_metadata_uri': self.nft_metadata_uri,
+            'nft_signature': self.nft_signature,
+            'nft_confirmed_at': self.nft_confirmed_at.isoformat() if self.nft_confirmed_at else None,
             'badge_image_url': self.tournament.badge_image_url if self.tournament else None,
+            'rendered_badge_url': self.rendered_badge_url,
             'minted_at': self.minted_at.isoformat() if self.minted_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
+class MintJob(db.Model):
+    __tablename__ = 'mint_jobs'
+    __table_args__ = (
+        # Worker claim query: due pending jobs and expired leases
+        db.Index('ix_mint_jobs_status_available_at', 'status', 'available_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    winner_id = db.Column(db.Integer, db.ForeignKey('winners.id'), nullable=False, unique=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, succeeded, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # next time a worker may claim it
+    lease_expires_at = db.Column(db.DateTime)  # visibility timeout while running
+    mint_seed = db.Column(db.String(64))  # hex seed of the NFT mint keypair, kept across retries
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    winner = db.relationship('Winner', backref=db.backref('mint_job', uselist=False), lazy=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'winner_id': self.winner_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'available_at': self.available_at.isoformat() if self.available_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class BadgeUpload(db.Model):
+    __tablename__ = 'badge_uploads'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False, unique=True)  # sha256 hex of the image bytes
+    arweave_uri = db.Column(db.String(500), nullable=False)
+    content_type = db.Column(db.String(100))
+    size_bytes = db.Column(db.Integer)
+    source_url = db.Column(db.String(500))  # first URL the image was fetched from
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'content_hash': self.content_hash,
+            'arweave_uri': self.arweave_uri,
+            'content_type': self.content_type,
+            'size_bytes': self.size_bytes,
+            'source_url': self.source_url,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class Standing(db.Model):
+    __tablename__ = 'standings'
+    __table_args__ = (
+        db.UniqueConstraint('tournament_id', 'team_id', name='uq_standings_tournament_id_team_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id'), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    played = db.Column(db.Integer, nullable=False, default=0)
+    won = db.Column(db.Integer, nullable=False, default=0)
+    drawn = db.Column(db.Integer, nullable=False, default=0)
+    lost = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    score_for = db.Column(db.Integer, nullable=False, default=0)
+    score_against = db.Column(db.Integer, nullable=False, default=0)
+    # Knockout bracket state
+    last_round_won = db.Column(db.Integer, nullable=False, default=0)
+    eliminated_round = db.Column(db.Integer)  # null while still in the bracket
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'tournament_id': self.tournament_id,
+            'team_id': self.team_id,
+            'played': self.played,
+            'won': self.won,
+            'drawn': self.drawn,
+            'lost': self.lost,
+            'points': self.points,
+            'score_for': self.score_for,
+            'score_against': self.score_against,
+            'score_diff': self.score_for - self.score_against,
+            'last_round_won': self.last_round_won,
+            'eliminated_round': self.eliminated_round
+        }
+
+class CacheVersion(db.Model):
+    __tablename__ = 'cache_versions'
+    
+    # Bumped in the same transaction as every write touching the tag; GET routes derive ETags from it
+    tag = db.Column(db.String(255), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SchedulerLease(db.Model):
+    __tablename__ = 'scheduler_leases'
+    
+    # Which process runs a periodic background task (see backend.leases)
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(100), nullable=False)  # host:pid of the process holding it
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class NftHolder(db.Model):
+    __tablename__ = 'nft_holders'
+    
+    # Current on-chain holder of a winner's NFT, maintained by the holder indexer
+    id = db.Column(db.Integer, primary_key=True)
+    winner_id = db.Column(db.Integer, db.ForeignKey('winners.id'), nullable=False, unique=True)
+    mint_address = db.Column(db.String(100), nullable=False)  # the Winner.nft_token_id this row describes
+    token_account = db.Column(db.String(100))  # account holding the token, null if burned
+    owner_wallet = db.Column(db.String(100), index=True)  # wallet owning token_account
+    slot = db.Column(db.BigInteger)  # context slot the owner was read at
+    checked_at = db.Column(db.DateTime, index=True)  # oldest rows are re-checked first
+    changed_at = db.Column(db.DateTime)  # when owner_wallet last changed
+    
+    def to_dict(self):
+        return {
+            'winner_id': self.winner_id,
+            'mint_address': self.mint_address,
+            'token_account': self.token_account,
+            'owner_wallet': self.owner_wallet,
+            'slot': self.slot,
+            'checked_at': self.checked_at.isoformat() if self.checked_at else None,
+            'changed_at': self.changed_at.isoformat() if self.changed_at else None
+        }
@@ -0,0 +1,115 @@
+"""
+Keyset Pagination
+List endpoints return one page at a time, ordered by a unique key (the
+primary key), with an opaque cursor for the next page. A page is found
+with `WHERE key < last key` instead of OFFSET, so every page costs the
+same however deep the client pages.
+
+Query params:
+    limit: Rows per page (PAGE_SIZE_DEFAULT, at most PAGE_SIZE_MAX)
+    cursor: next_cursor from the previous page
+"""
+from backend.models import Tournament
+from flask import current_app, request
+import base64
+import json
+
+class PaginationError(ValueError):
+    """Raised for an invalid cursor, limit or filter; routes answer 400"""
+
+def encode_cursor(key):
+    """Opaque cursor for the row with this key"""
+    return base64.urlsafe_b64encode(json.dumps([key], separators=(',', ':')).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Returns:
+        int: The key encoded by encode_cursor
+
+    Raises:
+        PaginationError: If the cursor was not issued by encode_cursor
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise PaginationError('Invalid cursor')
+    if not (isinstance(values, list) and len(values) == 1 and type(values[0]) is int):
+        raise PaginationError('Invalid cursor')
+    return values[0]
+
+class Page:
+    """
+    One page of a list query, read from the request's limit and cursor
+
+    Usage:
+        page = Page(Tournament.id)
+        rows, next_cursor = page.finish(tournament_dicts(page.apply(tournament_query())))
+    """
+
+    def __init__(self, key, descending=True, field='id'):
+        """
+        Args:
+            key: Unique column the list is ordered by
+            descending: Newest (highest key) first
+            field: Name of the key in the row dicts
+        """
+        self.key = key
+        self.descending = descending
+        self.field = field
+        default_size = current_app.config['PAGE_SIZE_DEFAULT']
+        max_size = current_app.config['PAGE_SIZE_MAX']
+        try:
+            self.limit = int(request.args.get('limit', default_size))
+        except ValueError:
+            raise PaginationError('limit must be an integer')
+        if not 1 <= self.limit <= max_size:
+            raise PaginationError(f'limit must be between 1 and {max_size}')
+        cursor = request.args.get('cursor')
+        self.after = decode_cursor(cursor) if cursor else None
+
+    def apply(self, query):
+        """Order the query by the key, start after the cursor and fetch one extra row"""
+        if self.after is not None:
+            query = query.where(self.key < self.after if self.descending else self.key > self.after)
+        return query.order_by(self.key.desc() if self.descending else self.key.asc()).limit(self.limit + 1)
+
+    def finish(self, rows):
+        """
+        Returns:
+            tuple: (rows of this page, next_cursor or None on the last page)
+        """
+        if len(rows) <= self.limit:
+            return rows, None
+        rows = rows[:self.limit]
+        return rows, encode_cursor(rows[-1][self.field])
+
+def tournament_filters(*, status=True):
+    """
+    WHERE clauses for the tournament filters in the query string
+
+    Query params:
+        year, month, status, format_type: Exact matches
+        name_prefix: tournament_name starts with this (case-insensitive)
+
+    Args:
+        status: Accept the status filter (off where the route fixes it)
+
+    Raises:
+        PaginationError: If year is not an integer
+    """
+    args = request.args
+    filters = []
+    if args.get('year'):
+        try:
+            filters.append(Tournament.year == int(args['year']))
+        except ValueError:
+            raise PaginationError('year must be an integer')
+    if args.get('month'):
+        filters.append(Tournament.month == args['month'])
+    if status and args.get('status'):
+        filters.append(Tournament.status == args['status'])
+    if args.get('format_type'):
+        filters.append(Tournament.format_type == args['format_type'])
+    if args.get('name_prefix'):
+        filters.append(Tournament.tournament_name.istartswith(args['name_prefix'], autoescape=True))
+    return filters
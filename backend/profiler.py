@@ -0,0 +1,216 @@
+"""
+Slow Query Profiler
+Opt-in (SLOW_QUERY_ENABLED) engine hook that captures statements slower
+than SLOW_QUERY_THRESHOLD_MS: the SQL, redacted parameters, the route or
+background thread that issued it and its query plan, kept in a ring
+buffer behind GET /api/admin/slow-queries.
+
+Only a sample of slow statements is captured (SLOW_QUERY_SAMPLE_RATE),
+and each distinct statement is EXPLAINed at most once per
+SLOW_QUERY_EXPLAIN_INTERVAL seconds, so it is safe to leave on under load.
+On PostgreSQL, SELECTs get EXPLAIN (ANALYZE, BUFFERS), which runs the
+query a second time inside a savepoint; writes only get a plain EXPLAIN.
+SQLite gets EXPLAIN QUERY PLAN.
+"""
+from backend.metrics import SQL_SLOW_STATEMENTS
+from collections import deque
+from datetime import datetime
+from flask import has_request_context, request
+import random
+import threading
+import time
+
+MAX_STATEMENT_LENGTH = 5000
+EXPLAIN_SAVEPOINT = 'slow_query_explain'
+# Statements EXPLAIN ANALYZE may run again: only reads, never writes
+ANALYZE_VERBS = ('SELECT',)
+EXPLAIN_VERBS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+def _redact_value(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return f'<str len={len(value)}>'
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f'<bytes len={len(value)}>'
+    return f'<{type(value).__name__}>'
+
+def redact_parameters(parameters, executemany=False):
+    """
+    Replace string and binary parameters with their type and length
+
+    Numbers and NULLs are kept, since IDs are what a plan depends on.
+    For executemany only the first row is shown.
+    """
+    if executemany:
+        rows = list(parameters or [])
+        return {'rows': len(rows), 'first': redact_parameters(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+def _issuer():
+    if has_request_context():
+        rule = request.url_rule.rule if request.url_rule is not None else request.path
+        return f'{request.method} {rule}'
+    return f'background:{threading.current_thread().name}'
+
+class SlowQueryProfiler:
+    def __init__(self, threshold_ms=200, sample_rate=0.1, buffer_size=100, explain=True, explain_interval=60):
+        """
+        Args:
+            threshold_ms: Statements at least this slow are candidates
+            sample_rate: Fraction (0-1) of slow statements captured
+            buffer_size: Captured statements kept, oldest dropped first
+            explain: Attach a query plan to captured statements
+            explain_interval: Seconds before the same statement is EXPLAINed again
+        """
+        self.threshold = threshold_ms / 1000.0
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self.seen = 0
+        self.captured = 0
+        self._entries = deque(maxlen=buffer_size)
+        self._explained = {}  # statement -> monotonic time of its last EXPLAIN
+        self._random = random.Random()
+        self._lock = threading.Lock()
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._profiler_start = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, '_profiler_start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        if elapsed < self.threshold:
+            return
+
+        SQL_SLOW_STATEMENTS.inc()
+        with self._lock:
+            self.seen += 1
+            if self._random.random() >= self.sample_rate:
+                return
+            explain = self.explain and not executemany and self._claim_explain(statement)
+
+        entry = {
+            'captured_at': datetime.utcnow().isoformat(),
+            'duration_ms': round(elapsed * 1000, 3),
+            'issuer': _issuer(),
+            'database': f'{conn.engine.url.host or ""}/{conn.engine.url.database or ""}',
+            'statement': statement[:MAX_STATEMENT_LENGTH],
+            'parameters': redact_parameters(parameters, executemany),
+            'plan': self._explain(conn, statement, parameters) if explain else None
+        }
+        with self._lock:
+            self.captured += 1
+            self._entries.append(entry)
+
+    def entries(self, limit=None):
+        """Captured statements, newest first"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._explained.clear()
+            self.seen = 0
+            self.captured = 0
+
+    def _claim_explain(self, statement):
+        """Rate-limit EXPLAINs per statement (caller holds the lock)"""
+        now = time.monotonic()
+        last = self._explained.get(statement)
+        if last is not None and now - last < self.explain_interval:
+            return False
+        if len(self._explained) >= 10 * self._entries.maxlen:
+            self._explained.clear()
+        self._explained[statement] = now
+        return True
+
+    def _explain(self, conn, statement, parameters):
+        """
+        Run EXPLAIN for a statement on the connection that issued it
+
+        Uses a fresh DBAPI cursor so the original result set is untouched.
+
+        Returns:
+            str: The plan, a note when the statement cannot be explained, or the EXPLAIN error
+        """
+        dialect = conn.dialect.name
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+        if verb not in EXPLAIN_VERBS:
+            return None
+        if dialect == 'postgresql':
+            prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if verb in ANALYZE_VERBS else 'EXPLAIN '
+        elif dialect == 'sqlite':
+            prefix = 'EXPLAIN QUERY PLAN '
+        else:
+            return f'EXPLAIN is not supported for {dialect}'
+
+        cursor = conn.connection.cursor()
+        try:
+            if dialect == 'postgresql':
+                # A failing EXPLAIN must not abort the caller's transaction
+                cursor.execute(f'SAVEPOINT {EXPLAIN_SAVEPOINT}')
+            try:
+                if parameters:
+                    cursor.execute(prefix + statement, parameters)
+                else:
+                    cursor.execute(prefix + statement)
+                rows = cursor.fetchall()
+            except Exception as e:
+                if dialect == 'postgresql':
+                    cursor.execute(f'ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}')
+                return f'EXPLAIN failed: {e}'
+            if dialect == 'postgresql':
+                cursor.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+                return '\n'.join(row[0] for row in rows)
+            # SQLite: (id, parent, notused, detail)
+            return '\n'.join(row[-1] for row in rows)
+        except Exception as e:
+            return f'EXPLAIN failed: {e}'
+        finally:
+            cursor.close()
+
+# Singleton instance
+_profiler = None
+
+def _before_cursor_execute(*args):
+    if _profiler is not None:
+        _profiler.before_cursor_execute(*args)
+
+def _after_cursor_execute(*args):
+    if _profiler is not None:
+        _profiler.after_cursor_execute(*args)
+
+def init_profiler(app):
+    """Install the slow query hook when SLOW_QUERY_ENABLED is set"""
+    global _profiler
+    if not app.config['SLOW_QUERY_ENABLED']:
+        return None
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    _profiler = SlowQueryProfiler(
+        threshold_ms=app.config['SLOW_QUERY_THRESHOLD_MS'],
+        sample_rate=app.config['SLOW_QUERY_SAMPLE_RATE'],
+        buffer_size=app.config['SLOW_QUERY_BUFFER_SIZE'],
+        explain=app.config['SLOW_QUERY_EXPLAIN'],
+        explain_interval=app.config['SLOW_QUERY_EXPLAIN_INTERVAL']
+    )
+    # Listening on the Engine class covers the primary and the replica
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    return _profiler
+
+def get_profiler():
+    return _profiler
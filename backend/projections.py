@@ -0,0 +1,113 @@
+"""
+Column-Projected List Queries
+List endpoints select only the columns they return, as plain rows,
+instead of hydrating ORM objects and calling to_dict on each. The dicts
+have the same keys as the matching to_dict; datetimes are left for the
+JSON provider to encode.
+"""
+from backend.app import db
+from backend.bulk import chunked
+from backend.models import NftHolder, Team, TeamPlayer, Tournament, Winner
+from sqlalchemy import and_, distinct, func, select, union_all
+
+TOURNAMENT_COLUMNS = (
+    Tournament.id, Tournament.name, Tournament.tournament_name, Tournament.format_type, Tournament.month,
+    Tournament.year, Tournament.badge_image_url, Tournament.badge_metadata_url, Tournament.created_at,
+    Tournament.status, Tournament.team_count.label('team_count')
+)
+
+TEAM_COLUMNS = (
+    Team.id, Team.tournament_id, Team.team_name, Team.captain_wallet_address, Team.registered_at
+)
+
+WINNER_COLUMNS = (
+    Winner.id, Winner.tournament_id, Winner.team_id, Team.team_name, Tournament.tournament_name,
+    Tournament.month, Tournament.year, Winner.wallet_address, Winner.nft_token_id, Winner.nft_metadata_uri,
+    Winner.nft_signature, Winner.nft_confirmed_at, Tournament.badge_image_url, Winner.rendered_badge_url,
+    Winner.minted_at, Winner.created_at
+)
+
+PLAYER_TEAM_COLUMNS = (
+    TeamPlayer.name.label('player_name'), Team.id.label('team_id'), Team.team_name, Team.tournament_id,
+    Tournament.tournament_name, Tournament.month, Tournament.year, Team.captain_wallet_address,
+    Team.registered_at, (Winner.id.isnot(None)).label('won')
+)
+
+def tournament_query():
+    return select(*TOURNAMENT_COLUMNS)
+
+def team_query():
+    return select(*TEAM_COLUMNS)
+
+def winner_query():
+    return select(*WINNER_COLUMNS) \
+        .outerjoin(Tournament, Tournament.id == Winner.tournament_id) \
+        .outerjoin(Team, Team.id == Winner.team_id)
+
+def current_holder_join():
+    """Join condition for the holder row describing a winner's current mint"""
+    return and_(NftHolder.winner_id == Winner.id, NftHolder.mint_address == Winner.nft_token_id)
+
+def held_winner_query(wallet_address):
+    """
+    Wins whose NFT the wallet holds now, plus its unindexed wins
+
+    A win counts for its indexed holder once the holder indexer has seen
+    the NFT, and for the recipient wallet until then (not yet minted or
+    indexed). Each half is a lookup on an indexed wallet column.
+    """
+    current_holder = current_holder_join()
+    held = select(NftHolder.winner_id).join(Winner, current_holder) \
+        .where(NftHolder.owner_wallet == wallet_address)
+    unindexed = select(Winner.id).outerjoin(NftHolder, current_holder) \
+        .where(Winner.wallet_address == wallet_address, NftHolder.id.is_(None))
+    return winner_query() \
+        .add_columns(NftHolder.owner_wallet.label('holder_wallet_address')) \
+        .outerjoin(NftHolder, current_holder) \
+        .where(Winner.id.in_(union_all(held, unindexed)))
+
+def player_team_query(name_key):
+    """Teams a player (by player_key) registered with, through ix_team_players_name_key"""
+    return select(*PLAYER_TEAM_COLUMNS) \
+        .join(Team, Team.id == TeamPlayer.team_id) \
+        .join(Tournament, Tournament.id == Team.tournament_id) \
+        .outerjoin(Winner, and_(Winner.tournament_id == Team.tournament_id, Winner.team_id == Team.id)) \
+        .where(TeamPlayer.name_key == name_key)
+
+def player_summary(name_key):
+    """
+    Returns:
+        dict: Teams, distinct tournaments and championships of a player, over their whole history
+    """
+    query = player_team_query(name_key).with_only_columns(
+        func.count(Team.id).label('teams'),
+        func.count(distinct(Team.tournament_id)).label('tournaments_played'),
+        func.count(Winner.id).label('championships')
+    )
+    return db.session.execute(query).one()._asdict()
+
+def tournament_dicts(query):
+    """Rows of a tournament_query() as Tournament.to_dict-shaped dicts"""
+    return [row._asdict() for row in db.session.execute(query)]
+
+def team_dicts(query):
+    """Rows of a team_query() as Team.to_dict-shaped dicts, rosters loaded in one query per 500 teams"""
+    teams = [row._asdict() for row in db.session.execute(query)]
+    rosters = {team['id']: [] for team in teams}
+    for team_ids in chunked(rosters, 500):
+        players = select(TeamPlayer.team_id, TeamPlayer.name) \
+            .where(TeamPlayer.team_id.in_(team_ids)) \
+            .order_by(TeamPlayer.team_id, TeamPlayer.position)
+        for team_id, name in db.session.execute(players):
+            rosters[team_id].append(name)
+    for team in teams:
+        team['player_names'] = rosters[team['id']]
+    return teams
+
+def player_team_dicts(query):
+    """Rows of a player_team_query() as dicts"""
+    return [row._asdict() for row in db.session.execute(query)]
+
+def winner_dicts(query):
+    """Rows of a winner_query() as Winner.to_dict-shaped dicts"""
+    return [row._asdict() for row in db.session.execute(query)]
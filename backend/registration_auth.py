@@ -0,0 +1,80 @@
+"""
+Registration Authorization
+Amortizes tournament password checks during registration bursts:
+- signed, short-lived registration tickets scoped to one tournament
+- an in-process cache of recently verified passwords, so the shared
+  tournament password only pays the KDF once per process
+"""
+from collections import OrderedDict
+from flask import current_app
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+import hashlib
+import hmac
+import threading
+
+TICKET_SALT = 'registration-ticket'
+VERIFIED_CACHE_SIZE = 1024
+
+_verified = OrderedDict()
+_verified_lock = threading.Lock()
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=TICKET_SALT)
+
+def _hash_fingerprint(tournament):
+    """Changes whenever the tournament password changes, revoking old tickets"""
+    return hashlib.sha256((tournament.password_hash or '').encode()).hexdigest()[:16]
+
+def issue_ticket(tournament):
+    """
+    Create a registration ticket for a tournament
+
+    Returns:
+        str: Signed ticket, valid for REGISTRATION_TICKET_TTL seconds
+    """
+    return _serializer().dumps({'t': tournament.id, 'h': _hash_fingerprint(tournament)})
+
+def verify_ticket(tournament, ticket):
+    """Check a ticket is valid, unexpired and issued for this tournament's current password"""
+    try:
+        payload = _serializer().loads(ticket, max_age=current_app.config['REGISTRATION_TICKET_TTL'])
+    except (BadSignature, SignatureExpired):
+        return False
+    return payload.get('t') == tournament.id and \
+        hmac.compare_digest(payload.get('h', ''), _hash_fingerprint(tournament))
+
+def verify_password(tournament, password):
+    """
+    Tournament.check_password with a cache of successful checks
+
+    Only successful checks are cached, keyed by an HMAC of the stored hash
+    and the candidate password, so wrong guesses always pay the full KDF.
+    """
+    if not tournament.password_hash:
+        return True
+
+    key = hmac.new(
+        current_app.config['SECRET_KEY'].encode(),
+        f'{tournament.password_hash}\0{password or ""}'.encode(),
+        hashlib.sha256
+    ).digest()
+    with _verified_lock:
+        if key in _verified:
+            _verified.move_to_end(key)
+            return True
+
+    if not tournament.check_password(password):
+        return False
+
+    with _verified_lock:
+        _verified[key] = True
+        if len(_verified) > VERIFIED_CACHE_SIZE:
+            _verified.popitem(last=False)
+    return True
+
+def authorize_registration(tournament, data):
+    """Accept either a registration_ticket or the tournament_password from a request body"""
+    ticket = data.get('registration_ticket')
+    if ticket:
+        return verify_ticket(tournament, ticket)
+    return verify_password(tournament, data.get('tournament_password'))
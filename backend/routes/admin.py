@@ -1,8 +1,20 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+from backend.admin_auth import require_admin_token
 from backend.app import db
-from backend.models import Tournament
+from backend.badge_cache import cache_tournament_badge_later
+from backend.bulk import RowErrors, chunked, is_valid_wallet_address, iter_request_records
+from backend.cache import TOURNAMENTS_TAG, cached_response, invalidate_tags, list_refresh, player_tag, tournament_tag
+from backend.models import Tournament, Team, TeamPlayer, clean_player_names, player_key
+from backend.pagination import Page, PaginationError, tournament_filters
+from backend.profiler import get_profiler
+from backend.projections import tournament_dicts, tournament_query
+from sqlalchemy import insert
+from datetime import datetime
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 admin_bp = Blueprint('admin', __name__)
 
 @admin_bp.route('/create-tournament', methods=['POST'])
@@ -19,7 +31,8 @@ def create_tournament():
         "year": 2024,
         "badge_image_url": "https://...",
         "badge_metadata_url": "https://...",
-        "tournament_password": "optional-plaintext"
+        "tournament_password": "optional-plaintext",
+        "password_hash_method": "optional, e.g. pbkdf2:sha256:260000"
     }
     """
     try:
@@ -43,11 +56,19 @@ def create_tournament():
             status='open'
         )
         # set password if provided
-        tournament.set_password(data.get('tournament_password'))
+        method = data.get('password_hash_method') or current_app.config['TOURNAMENT_PASSWORD_METHOD']
+        try:
+            tournament.set_password(data.get('tournament_password'), method=method)
+        except ValueError as e:
+            return jsonify({'error': f'Invalid password_hash_method: {e}'}), 400
         
         db.session.add(tournament)
+        invalidate_tags(TOURNAMENTS_TAG)
         db.session.commit()
         
+        # Upload the badge image in the background so mints reuse the Arweave copy
+        cache_tournament_badge_later(current_app._get_current_object(), tournament)
+        
         return jsonify({
             'success': True,
             'tournament': tournament.to_dict()
@@ -58,22 +79,173 @@ def create_tournament():
         return jsonify({'error': str(e)}), 500
 
 @admin_bp.route('/tournaments', methods=['GET'])
+@cached_response(tags=lambda: [TOURNAMENTS_TAG], refresh=list_refresh)
 def list_tournaments():
-    """List all tournaments"""
+    """
+    List tournaments, newest first, one page at a time
+
+    Query params: limit, cursor, year, month, status, format_type, name_prefix
+    """
     try:
-        tournaments = Tournament.query.all()
+        page = Page(Tournament.id)
+        tournaments, next_cursor = page.finish(
+            tournament_dicts(page.apply(tournament_query().where(*tournament_filters()))))
         return jsonify({
-            'tournaments': [t.to_dict() for t in tournaments]
+            'tournaments': tournaments,
+            'next_cursor': next_cursor
         }), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @admin_bp.route('/tournament/<int:tournament_id>', methods=['GET'])
+@cached_response(tags=lambda tournament_id: [tournament_tag(tournament_id)])
 def get_tournament(tournament_id):
     """Get a specific tournament"""
     try:
-        tournament = Tournament.query.get_or_404(tournament_id)
+        tournament = db.session.get(Tournament, tournament_id)
+        if tournament is None:
+            return jsonify({'error': 'Tournament not found'}), 404
         return jsonify({'tournament': tournament.to_dict()}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+
+def _parse_team(record):
+    """
+    Validate one imported team record
+
+    Returns:
+        tuple: (team_name, captain_wallet_address, player_names list)
+
+    Raises:
+        ValueError: If the record is invalid
+    """
+    team_name = (record.get('team_name') or '').strip()
+    wallet = (record.get('captain_wallet_address') or '').strip()
+    if not team_name:
+        raise ValueError('Missing required field: team_name')
+    if not is_valid_wallet_address(wallet):
+        raise ValueError(f'Invalid Solana wallet address: {wallet!r}')
+
+    players = record.get('player_names') or []
+    if isinstance(players, str):
+        # CSV cells list players separated by semicolons
+        players = [p.strip() for p in players.split(';') if p.strip()]
+    return team_name, wallet, clean_player_names(players)
+
+@admin_bp.route('/tournament/<int:tournament_id>/import-teams', methods=['POST'])
+def import_teams(tournament_id):
+    """
+    Bulk register teams for a tournament
+    
+    Accepts a JSON array (or {"teams": [...]}), NDJSON, or CSV with a header
+    row: team_name,captain_wallet_address,player_names (players separated
+    by ";"). Invalid rows and duplicate team names or wallets (within the
+    upload or already registered) are reported per row; the rest are
+    inserted in one transaction.
+    """
+    try:
+        tournament = Tournament.query.get(tournament_id)
+        if not tournament:
+            return jsonify({'error': 'Tournament not found'}), 404
+        
+        errors = RowErrors()
+        rows = []
+        names, wallets = set(), set()
+        for row, record in iter_request_records('teams'):
+            if isinstance(record, Exception):
+                errors.add(row, record)
+                continue
+            try:
+                team_name, wallet, players = _parse_team(record)
+            except ValueError as e:
+                errors.add(row, e)
+                continue
+            if team_name in names:
+                errors.add(row, f'Duplicate team name in upload: {team_name}')
+                continue
+            if wallet in wallets:
+                errors.add(row, f'Duplicate wallet in upload: {wallet}')
+                continue
+            names.add(team_name)
+            wallets.add(wallet)
+            rows.append((row, team_name, wallet, players))
+        
+        # One query each for names and wallets already registered
+        taken_names = {name for (name,) in db.session.query(Team.team_name).filter(
+            Team.tournament_id == tournament_id, Team.team_name.in_(names))} if names else set()
+        taken_wallets = {wallet for (wallet,) in db.session.query(Team.captain_wallet_address).filter(
+            Team.tournament_id == tournament_id, Team.captain_wallet_address.in_(wallets))} if wallets else set()
+        
+        registered_at = datetime.utcnow()
+        values = []
+        rosters = {}
+        for row, team_name, wallet, players in rows:
+            if team_name in taken_names:
+                errors.add(row, f'Team name already registered: {team_name}')
+            elif wallet in taken_wallets:
+                errors.add(row, f'Wallet already registered: {wallet}')
+            else:
+                values.append({
+                    'tournament_id': tournament_id,
+                    'team_name': team_name,
+                    'captain_wallet_address': wallet,
+                    'registered_at': registered_at
+                })
+                rosters[team_name] = players
+        
+        if not values and errors:
+            return jsonify({'error': 'No valid teams submitted', 'inserted': 0, **errors.to_dict()}), 400
+        
+        players = []
+        for chunk in chunked(values):
+            for team_id, team_name in db.session.execute(insert(Team).returning(Team.id, Team.team_name), chunk):
+                players.extend({'team_id': team_id, 'position': position, 'name': name, 'name_key': player_key(name)}
+                               for position, name in enumerate(rosters[team_name]))
+        for chunk in chunked(players):
+            db.session.execute(insert(TeamPlayer), chunk)
+        invalidate_tags(tournament_tag(tournament_id), *{player_tag(player['name_key']) for player in players})
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'inserted': len(values),
+            **errors.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/slow-queries', methods=['GET'])
+@require_admin_token
+def list_slow_queries():
+    """
+    Statements captured by the slow query profiler, newest first
+
+    Query params:
+        limit: Maximum entries returned (default: all)
+    """
+    profiler = get_profiler()
+    if profiler is None:
+        return jsonify({'enabled': False, 'queries': []}), 200
+    limit = request.args.get('limit', type=int)
+    return jsonify({
+        'enabled': True,
+        'threshold_ms': profiler.threshold_ms,
+        'sample_rate': profiler.sample_rate,
+        'seen': profiler.seen,
+        'captured': profiler.captured,
+        'queries': profiler.entries(limit)
+    }), 200
+
+@admin_bp.route('/slow-queries', methods=['DELETE'])
+@require_admin_token
+def clear_slow_queries():
+    """Empty the slow query buffer"""
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.clear()
+    return jsonify({'success': True}), 200
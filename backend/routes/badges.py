@@ -0,0 +1,27 @@
+from flask import Blueprint, jsonify, send_from_directory
+from backend.badge_render import BADGE_FILE, get_badge_renderer
+from werkzeug.exceptions import NotFound
+
+badges_bp = Blueprint('badges', __name__)
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600  # seconds
+
+@badges_bp.route('/<file_name>', methods=['GET'])
+def get_badge(file_name):
+    """
+    Rendered winner badge from the disk cache
+
+    File names are content-addressed (<key>.png, <key>.webp, <key>-<size>.webp),
+    so a file never changes and is cached for a year as immutable.
+    """
+    renderer = get_badge_renderer()
+    if renderer is None or not BADGE_FILE.match(file_name):
+        return jsonify({'error': 'Badge not found'}), 404
+    try:
+        response = send_from_directory(renderer.directory, file_name, max_age=IMMUTABLE_MAX_AGE)
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        return response
+    except NotFound:
+        return jsonify({'error': 'Badge not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
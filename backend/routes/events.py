@@ -0,0 +1,38 @@
+from flask import Blueprint, Response, current_app, jsonify, request
+from backend.events import get_event_broker, stream
+
+events_bp = Blueprint('events', __name__)
+
+@events_bp.route('', methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events stream of live updates
+    
+    Query params (repeatable, optional):
+        tournament_id: Only events for these tournaments
+        wallet: Only events for these wallet addresses
+    
+    Events: match_submitted, winner_declared, mint_started,
+    mint_succeeded, mint_failed. Reconnecting clients send Last-Event-ID
+    and receive the events they missed.
+    """
+    try:
+        tournament_ids = [int(t) for t in request.args.getlist('tournament_id')]
+    except ValueError:
+        return jsonify({'error': 'tournament_id must be an integer'}), 400
+    
+    broker = get_event_broker()
+    subscription = broker.subscribe(
+        tournament_ids,
+        request.args.getlist('wallet'),
+        last_event_id=request.headers.get('Last-Event-ID')
+    )
+    if subscription is None:
+        return jsonify({'error': 'Too many open event streams, retry later'}), 503
+    
+    # The stream holds no app context or database connection while idle
+    return Response(
+        stream(broker, subscription, current_app.config['EVENTS_HEARTBEAT_SECONDS']),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
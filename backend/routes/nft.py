@@ -1,90 +1,375 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from backend.app import db
+from backend.badge_cache import resolve_badge_uris
+from backend.badge_render import badge_fields, resolve_rendered_badges
+from backend.cache import WINNERS_TAG, cached_response, invalidate_tags, wallet_tag, winner_tag
+from backend.events import publish_event
 from backend.models import Winner
+from backend.mint_queue import get_mint_queue
+from backend.leases import acquire_lease, lease_holder, release_lease
+from backend.mint_reconciler import MintReconciler, reconcile_mints
 from backend.solana_service import get_solana_service
+from sqlalchemy.orm import joinedload
 from datetime import datetime
+import logging
 import time
 
+logger = logging.getLogger(__name__)
+
 nft_bp = Blueprint('nft', __name__)
 
-def mint_champion_nft_async(winner_id):
+MINT_IDEMPOTENCY_PREFIX = 'winner-'
+
+def mint_idempotency_key(winner_id, mint_seed=None):
+    """Daemon idempotency key: retries for the same winner and mint seed join or reuse one mint"""
+    if mint_seed:
+        return f'{MINT_IDEMPOTENCY_PREFIX}{winner_id}-{mint_seed[:12]}'
+    return f'{MINT_IDEMPOTENCY_PREFIX}{winner_id}'
+
+def _mint_kwargs(winner, badge_image_uri=None):
+    """Build SolanaNFTService.mint_nft arguments for a winner (with its leased mint job)"""
+    mint_seed = winner.mint_job.mint_seed if winner.mint_job else None
+    return {
+        'recipient_wallet_address': winner.wallet_address,
+        # Tournament, month, year, team and serial, as drawn on the rendered badge
+        **badge_fields(winner),
+        'badge_image_url': winner.tournament.badge_image_url or '',
+        'badge_image_uri': badge_image_uri,
+        'idempotency_key': mint_idempotency_key(winner.id, mint_seed),
+        'mint_seed': mint_seed
+    }
+
+def _badge_uris(winners):
     """
-    Asynchronously mint NFT for a winner
-    This would ideally be done in a background task queue
+    Arweave URI of the badge image to mint for each winner: their rendered
+    badge, else the tournament's cached badge upload
+    """
+    uris = resolve_rendered_badges(winners)
+    fallback = [w for w in winners if w.id not in uris]
+    tournament_uris = resolve_badge_uris([w.tournament for w in fallback])
+    for winner in fallback:
+        if winner.tournament_id in tournament_uris:
+            uris[winner.id] = tournament_uris[winner.tournament_id]
+    return uris
+
+def _apply_mint_result(winner, result):
+    """Store a successful mint result on the winner (caller commits)"""
+    winner.nft_token_id = result['token_id']
+    winner.nft_metadata_uri = result['metadata_uri']
+    winner.nft_signature = result.get('transaction_signature') or None
+    winner.nft_confirmed_at = None
+    winner.minted_at = datetime.utcnow()
+    invalidate_tags(WINNERS_TAG, wallet_tag(winner.wallet_address), winner_tag(winner.id))
+
+def record_late_mint(idempotency_key, result):
+    """
+    Store a mint that succeeded after its caller timed out
+
+    Called from the minter's late-result thread. The winner gets the token
+    unless a retry already stored one, and a job that is not being retried
+    right now is marked succeeded.
+
+    Args:
+        idempotency_key: Key the mint was sent with (see mint_idempotency_key)
+        result: mint_nft-style success result
+    """
+    if not idempotency_key.startswith(MINT_IDEMPOTENCY_PREFIX):
+        return
+    winner_id = int(idempotency_key[len(MINT_IDEMPOTENCY_PREFIX):].split('-')[0])
+    mint_queue = get_mint_queue()
+    if mint_queue is None:
+        logger.error('Late mint for winner %s not recorded (no app): %s', winner_id, result['token_id'])
+        return
+    with mint_queue.app.app_context():
+        try:
+            winner = db.session.get(Winner, winner_id)
+            if winner is None:
+                logger.error('Late mint for unknown winner %s: %s', winner_id, result['token_id'])
+                return
+            if winner.nft_token_id:
+                if winner.nft_token_id != result['token_id']:
+                    logger.error('Late mint for winner %s (%s) differs from the stored NFT %s',
+                                 winner_id, result['token_id'], winner.nft_token_id)
+                return
+            mint_event = _mint_event(winner)
+            _apply_mint_result(winner, result)
+            job = winner.mint_job
+            if job is not None and job.status != 'running':
+                mint_queue.record_result(job, result)
+            db.session.commit()
+            logger.info('Recorded late mint for winner %s: %s', winner_id, result['token_id'])
+            _publish_mint_event('mint_succeeded', mint_event, nft_token_id=result['token_id'],
+                                nft_metadata_uri=result['metadata_uri'])
+        except Exception:
+            db.session.rollback()
+            logger.exception('Error recording late mint for winner %s', winner_id)
+
+def _mint_event(winner):
+    """Identify a winner in mint events (captured before commits expire the row)"""
+    return {'winner_id': winner.id, 'tournament_id': winner.tournament_id, 'wallet_address': winner.wallet_address}
+
+def _publish_mint_event(event_type, mint_event, **data):
+    publish_event(event_type, {**mint_event, **data}, tournament_id=mint_event['tournament_id'],
+                  wallet_address=mint_event['wallet_address'])
+
+def mint_champion_nft(winner_id):
+    """
+    Mint NFT for a winner
+
+    Called by the mint queue workers and by the manual mint endpoint.
+
+    Returns:
+        dict: {'success': bool, 'error': str or None}
     """
     from backend.app import db
+    mint_event = None
     try:
         winner = Winner.query.get(winner_id)
         if not winner:
-            print(f"Winner not found: {winner_id}")
-            return False
+            logger.warning('Winner not found: %s', winner_id)
+            return {'success': False, 'error': 'Winner not found'}
         
         if winner.nft_token_id:
-            print(f"Winner already has NFT: {winner_id}")
-            return True
-        
-        # Get tournament and team info
-        tournament = winner.tournament
-        team = winner.team
+            logger.info('Winner already has NFT: %s', winner_id)
+            return {'success': True, 'error': None}
         
-        # Generate badge serial ID
-        badge_serial_id = time.time()
+        # Render and upload the winner's badge (or reuse the tournament's cached upload)
+        badge_uris = _badge_uris([winner])
+        mint_event = _mint_event(winner)
+        _publish_mint_event('mint_started', mint_event)
         
         # Mint NFT
         solana_service = get_solana_service()
-        result = solana_service.mint_nft(
-            recipient_wallet_address=winner.wallet_address,
-            tournament_name=tournament.tournament_name,
-            month=tournament.month,
-            year=tournament.year,
-            team_name=team.team_name,
-            badge_image_url=tournament.badge_image_url or '',
-            badge_serial_id=badge_serial_id
-        )
+        result = solana_service.mint_nft(**_mint_kwargs(winner, badge_uris.get(winner.id)))
         
         if result['success']:
             # Update winner record
-            winner.nft_token_id = result['token_id']
-            winner.nft_metadata_uri = result['metadata_uri']
-            winner.minted_at = datetime.utcnow()
+            _apply_mint_result(winner, result)
             db.session.commit()
+            _publish_mint_event('mint_succeeded', mint_event, nft_token_id=result['token_id'],
+                                nft_metadata_uri=result['metadata_uri'])
             
-            print(f"Successfully minted NFT for winner {winner_id}: {result['token_id']}")
-            return True
+            logger.info('Minted NFT for winner %s: %s', winner_id, result['token_id'])
+            return {'success': True, 'error': None}
         else:
-            print(f"Failed to mint NFT for winner {winner_id}: {result.get('error')}")
-            return False
+            logger.warning('Failed to mint NFT for winner %s: %s', winner_id, result.get('error'))
+            _publish_mint_event('mint_failed', mint_event, error=result.get('error', 'Unknown error'))
+            return {'success': False, 'error': result.get('error', 'Unknown error')}
             
     except Exception as e:
-        print(f"Error in async NFT minting: {e}")
-        return False
+        db.session.rollback()
+        logger.exception('Error minting NFT for winner %s', winner_id)
+        if mint_event:
+            _publish_mint_event('mint_failed', mint_event, error=str(e))
+        return {'success': False, 'error': str(e)}
 
 @nft_bp.route('/mint/<int:winner_id>', methods=['POST'])
 def mint_nft_for_winner(winner_id):
     """
     Manually trigger NFT minting for a winner
+    
+    Leases the winner's mint job like mint-batch, so a queue worker never
+    mints the same winner at the same time.
     """
     try:
-        result = mint_champion_nft_async(winner_id)
-        
-        if result:
-            winner = Winner.query.get(winner_id)
-            return jsonify({
-                'success': True,
-                'winner': winner.to_dict()
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to mint NFT'}), 500
+        winner = db.session.get(Winner, winner_id)
+        if winner is None:
+            return jsonify({'error': 'Winner not found'}), 404
+        if winner.nft_token_id:
+            return jsonify({'success': True, 'winner': winner.to_dict()}), 200
+        
+        mint_queue = get_mint_queue()
+        leased = mint_queue.lease_for_winners([winner])
+        if winner_id not in leased:
+            return jsonify({'error': 'Mint already in progress'}), 409
+        
+        result = mint_champion_nft(winner_id)
+        mint_queue.record_result(leased[winner_id], result)
+        db.session.commit()
+        
+        if not result['success']:
+            return jsonify({'error': result['error']}), 500
+        return jsonify({
+            'success': True,
+            'winner': db.session.get(Winner, winner_id).to_dict()
+        }), 200
             
     except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@nft_bp.route('/mint-batch', methods=['POST'])
+def mint_batch():
+    """
+    Mint NFTs for many winners in one call
+    
+    Expected JSON (either winner_ids or filter):
+    {
+        "winner_ids": [1, 2, 3],
+        "filter": "unminted",
+        "limit": 100
+    }
+    
+    limit (at most MINT_BATCH_MAX) caps the winners taken by the filter;
+    more winner_ids than that are rejected. Mints still running after
+    MINT_BATCH_TIMEOUT seconds are reported as failed and retried by the
+    queue workers once their lease runs out.
+    """
+    try:
+        data = request.get_json() or {}
+        batch_max = current_app.config['MINT_BATCH_MAX']
+        try:
+            limit = int(data.get('limit', batch_max))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'limit must be an integer'}), 400
+        if limit < 1:
+            return jsonify({'error': 'limit must be at least 1'}), 400
+        limit = min(limit, batch_max)
+        
+        query = Winner.query.options(joinedload(Winner.team), joinedload(Winner.tournament))
+        if 'winner_ids' in data:
+            winner_ids = data['winner_ids']
+            if not isinstance(winner_ids, list) or not all(isinstance(i, int) for i in winner_ids):
+                return jsonify({'error': 'winner_ids must be a list of integers'}), 400
+            if len(winner_ids) > limit:
+                return jsonify({'error': f'At most {limit} winner_ids per batch (limit, MINT_BATCH_MAX)'}), 400
+            query = query.filter(Winner.id.in_(winner_ids))
+        elif data.get('filter') == 'unminted':
+            query = query.filter(Winner.nft_token_id.is_(None))
+        else:
+            return jsonify({'error': 'Provide winner_ids or filter: "unminted"'}), 400
+        
+        winners = query.order_by(Winner.id).limit(limit).all()
+        results = {}
+        if 'winner_ids' in data:
+            found = {w.id for w in winners}
+            for winner_id in data['winner_ids']:
+                if winner_id not in found:
+                    results[winner_id] = {'winner_id': winner_id, 'success': False, 'error': 'Winner not found'}
+        
+        to_mint = []
+        for winner in winners:
+            if winner.nft_token_id:
+                results[winner.id] = {'winner_id': winner.id, 'success': True, 'skipped': 'already minted',
+                                      'nft_token_id': winner.nft_token_id}
+            else:
+                to_mint.append(winner)
+        
+        # Keep queue workers off these winners while the batch runs, plus one request
+        # timeout for the daemon to finish a mint the batch stopped waiting for
+        batch_timeout = current_app.config['MINT_BATCH_TIMEOUT']
+        deadline = time.monotonic() + batch_timeout
+        solana_service = get_solana_service()
+        mint_queue = get_mint_queue()
+        leased = mint_queue.lease_for_winners(
+            to_mint, lease_seconds=batch_timeout + solana_service.minter.request_timeout)
+        
+        # A worker may have minted some of them since the first query: the lease commit
+        # expired the loaded rows, so reload the leased winners still unminted in one query
+        to_mint_ids = [w.id for w in to_mint]
+        to_mint = Winner.query \
+            .options(joinedload(Winner.team), joinedload(Winner.tournament), joinedload(Winner.mint_job)) \
+            .filter(Winner.id.in_(list(leased)), Winner.nft_token_id.is_(None)).order_by(Winner.id).all() \
+            if leased else []
+        minted = dict(db.session.query(Winner.id, Winner.nft_token_id).filter(
+            Winner.id.in_(to_mint_ids), Winner.nft_token_id.isnot(None)))
+        settled = []  # leased jobs of winners minted meanwhile, handed back as the worker left them
+        for winner_id in to_mint_ids:
+            if winner_id in minted:
+                results[winner_id] = {'winner_id': winner_id, 'success': True, 'skipped': 'already minted',
+                                      'nft_token_id': minted[winner_id]}
+                if winner_id in leased:
+                    settled.append(leased.pop(winner_id))
+            elif winner_id not in leased:
+                results[winner_id] = {'winner_id': winner_id, 'success': False, 'error': 'Mint already in progress'}
+        
+        # Only winners this call mints get their badges rendered and uploaded
+        badge_uris = _badge_uris(to_mint)
+        mint_kwargs = {w.id: _mint_kwargs(w, badge_uris.get(w.id)) for w in to_mint}
+        mint_events = {w.id: _mint_event(w) for w in to_mint}
+        for mint_event in mint_events.values():
+            _publish_mint_event('mint_started', mint_event)
+        
+        # All mints go to the daemon at once and run concurrently
+        mint_results = solana_service.mint_many([mint_kwargs[w.id] for w in to_mint],
+                                                timeout=max(deadline - time.monotonic(), 0))
+        
+        for winner, result in zip(to_mint, mint_results):
+            if result['success']:
+                _apply_mint_result(winner, result)
+                results[winner.id] = {'winner_id': winner.id, 'success': True,
+                                      'nft_token_id': result['token_id'],
+                                      'nft_metadata_uri': result['metadata_uri']}
+            else:
+                results[winner.id] = {'winner_id': winner.id, 'success': False, 'error': result.get('error')}
+            mint_queue.record_result(leased[winner.id], result)
+        for job in settled:
+            mint_queue.record_result(job, {'success': True})
+        # One commit for the badge hashes and URLs, mint results and job outcomes
+        db.session.commit()
+        
+        for winner_id, mint_event in mint_events.items():
+            outcome = results[winner_id]
+            if outcome['success']:
+                _publish_mint_event('mint_succeeded', mint_event, nft_token_id=outcome['nft_token_id'],
+                                    nft_metadata_uri=outcome['nft_metadata_uri'])
+            else:
+                _publish_mint_event('mint_failed', mint_event, error=outcome['error'])
+        
+        results = list(results.values())
+        return jsonify({
+            'success': True,
+            'minted': sum(1 for r in results if r['success'] and 'skipped' not in r),
+            'failed': sum(1 for r in results if not r['success']),
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@nft_bp.route('/reconcile', methods=['POST'])
+def reconcile():
+    """
+    Confirm minted NFTs on-chain and re-queue missing or dropped mints
+    
+    Optional JSON:
+    {
+        "retry_failed": true
+    }
+    
+    Takes the background sweep's lease for the pass, so it never runs
+    alongside another one (409 while one is running).
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        # Distinct from this process's sweep thread, which must not renew the lease meanwhile
+        holder = f'{lease_holder()}:request'
+        lease_seconds = current_app.config['MINT_RECONCILE_INTERVAL'] * 2 or 600
+        if not acquire_lease(MintReconciler.LEASE_NAME, holder, lease_seconds):
+            return jsonify({'error': 'Reconciliation already running'}), 409
+        try:
+            summary = reconcile_mints(retry_failed=bool(data.get('retry_failed')))
+        finally:
+            db.session.rollback()
+            release_lease(MintReconciler.LEASE_NAME, holder)
+        return jsonify({'success': True, **summary}), 200
+    except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @nft_bp.route('/winner/<int:winner_id>', methods=['GET'])
+@cached_response(tags=lambda winner_id: [winner_tag(winner_id)])
 def get_nft_details(winner_id):
     """Get NFT details for a winner"""
     try:
-        winner = Winner.query.get_or_404(winner_id)
-        return jsonify({'winner': winner.to_dict()}), 200
+        winner = db.session.get(Winner, winner_id)
+        if winner is None:
+            return jsonify({'error': 'Winner not found'}), 404
+        return jsonify({
+            'winner': winner.to_dict(),
+            'mint_job': winner.mint_job.to_dict() if winner.mint_job else None
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
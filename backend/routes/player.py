@@ -0,0 +1,38 @@
+from flask import Blueprint, jsonify
+from backend.cache import cached_response, player_tag
+from backend.models import Team, player_key
+from backend.pagination import Page, PaginationError
+from backend.projections import player_summary, player_team_dicts, player_team_query
+
+player_bp = Blueprint('player', __name__)
+
+@player_bp.route('/<name>', methods=['GET'])
+@cached_response(tags=lambda name: [player_tag(player_key(name))])
+def get_player(name):
+    """
+    Teams and tournaments a player appeared in, newest first
+
+    Names match case-insensitively, ignoring repeated whitespace.
+
+    Query params: limit, cursor
+    """
+    try:
+        key = player_key(name)
+        if not key:
+            return jsonify({'error': 'Player name is required'}), 400
+        summary = player_summary(key)
+        if not summary['teams']:
+            return jsonify({'error': 'Player not found'}), 404
+        page = Page(Team.id, field='team_id')
+        teams, next_cursor = page.finish(player_team_dicts(page.apply(player_team_query(key))))
+        return jsonify({
+            'name': teams[0]['player_name'] if teams else name,
+            'teams': teams,
+            'next_cursor': next_cursor,
+            'tournaments_played': summary['tournaments_played'],
+            'championships': summary['championships']
+        }), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,41 @@
+from flask import Blueprint, current_app, jsonify, request
+from backend.cache import TOURNAMENTS_TAG, cached_response, list_refresh
+from backend.search import KINDS, search
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('', methods=['GET'])
+@cached_response(tags=lambda: [TOURNAMENTS_TAG], refresh=list_refresh)
+def search_names():
+    """
+    Tournaments, teams and players matching a query, best first
+
+    Query words match by prefix and tolerate typos; each result has a score
+    between 0 and 1.
+
+    Query params:
+        q: Search text
+        type: Comma-separated kinds to search: tournaments, teams, players (default all)
+        limit: Results per kind (SEARCH_RESULTS_DEFAULT, at most SEARCH_RESULTS_MAX)
+    """
+    try:
+        query = ' '.join(request.args.get('q', '').split())
+        if not query:
+            return jsonify({'error': 'q is required'}), 400
+
+        kinds = [kind for kind in request.args.get('type', '').split(',') if kind] or list(KINDS)
+        unknown = [kind for kind in kinds if kind not in KINDS]
+        if unknown:
+            return jsonify({'error': f"Unknown type: {', '.join(unknown)}"}), 400
+
+        max_results = current_app.config['SEARCH_RESULTS_MAX']
+        try:
+            limit = int(request.args.get('limit', current_app.config['SEARCH_RESULTS_DEFAULT']))
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        if not 1 <= limit <= max_results:
+            return jsonify({'error': f'limit must be between 1 and {max_results}'}), 400
+
+        return jsonify({'query': query, **search(query, kinds, limit)}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,7 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from backend.app import db
+from backend.cache import TOURNAMENTS_TAG, cached_response, invalidate_tags, list_refresh, player_tag, tournament_tag
 from backend.models import Tournament, Team
-import json
+from backend.pagination import Page, PaginationError, tournament_filters
+from backend.projections import team_dicts, team_query, tournament_dicts, tournament_query
+from backend.registration_auth import authorize_registration, issue_ticket, verify_password
+from backend.standings import get_standings, suggest_champion
 
 tournament_bp = Blueprint('tournament', __name__)
 
@@ -18,6 +22,9 @@ def register_team():
         "captain_wallet_address": "your_solana_wallet_address",
         "tournament_password": "plaintext password provided by admin"
     }
+    
+    A "registration_ticket" from POST /api/tournament/<id>/ticket can be
+    sent instead of tournament_password.
     """
     try:
         data = request.get_json()
@@ -36,20 +43,23 @@ def register_team():
         if tournament.status != 'open':
             return jsonify({'error': 'Tournament registration is closed'}), 400
 
-        # Validate tournament password if set on tournament
-        provided_password = data.get('tournament_password')
-        if not tournament.check_password(provided_password):
+        # Validate registration ticket or tournament password if set on tournament
+        if not authorize_registration(tournament, data):
             return jsonify({'error': 'Invalid tournament password'}), 403
         
         # Create team
         team = Team(
             tournament_id=data['tournament_id'],
             team_name=data['team_name'],
-            player_names=json.dumps(data.get('player_names', [])),
             captain_wallet_address=data['captain_wallet_address']
         )
+        try:
+            team.player_names = data.get('player_names') or []
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         db.session.add(team)
+        invalidate_tags(tournament_tag(team.tournament_id), *(player_tag(player.name_key) for player in team.players))
         db.session.commit()
         
         return jsonify({
@@ -61,25 +71,89 @@ def register_team():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@tournament_bp.route('/<int:tournament_id>/ticket', methods=['POST'])
+def create_registration_ticket(tournament_id):
+    """
+    Exchange the tournament password for a short-lived registration ticket
+    
+    Expected JSON:
+    {
+        "tournament_password": "plaintext password provided by admin"
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        tournament = Tournament.query.get(tournament_id)
+        if not tournament:
+            return jsonify({'error': 'Tournament not found'}), 404
+        
+        if not verify_password(tournament, data.get('tournament_password')):
+            return jsonify({'error': 'Invalid tournament password'}), 403
+        
+        return jsonify({
+            'registration_ticket': issue_ticket(tournament),
+            'expires_in': current_app.config['REGISTRATION_TICKET_TTL']
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @tournament_bp.route('/<int:tournament_id>/teams', methods=['GET'])
+@cached_response(tags=lambda tournament_id: [tournament_tag(tournament_id)])
 def get_teams(tournament_id):
-    """Get all teams registered for a tournament"""
+    """
+    Get the teams registered for a tournament, in registration order
+
+    Query params: limit, cursor
+    """
     try:
-        teams = Team.query.filter_by(tournament_id=tournament_id).all()
+        page = Page(Team.id, descending=False)
+        teams, next_cursor = page.finish(team_dicts(page.apply(team_query().where(Team.tournament_id == tournament_id))))
         return jsonify({
-            'teams': [t.to_dict() for t in teams]
+            'teams': teams,
+            'next_cursor': next_cursor
         }), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @tournament_bp.route('/available', methods=['GET'])
+@cached_response(tags=lambda: [TOURNAMENTS_TAG], refresh=list_refresh)
 def list_available_tournaments():
-    """List all tournaments open for registration"""
+    """
+    List tournaments open for registration, newest first
+
+    Query params: limit, cursor, year, month, format_type, name_prefix
+    """
     try:
-        tournaments = Tournament.query.filter_by(status='open').all()
+        page = Page(Tournament.id)
+        query = tournament_query().where(Tournament.status == 'open', *tournament_filters(status=False))
+        tournaments, next_cursor = page.finish(tournament_dicts(page.apply(query)))
         return jsonify({
-            'tournaments': [t.to_dict() for t in tournaments]
+            'tournaments': tournaments,
+            'next_cursor': next_cursor
         }), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+
+@tournament_bp.route('/<int:tournament_id>/standings', methods=['GET'])
+@cached_response(tags=lambda tournament_id: [tournament_tag(tournament_id)])
+def get_tournament_standings(tournament_id):
+    """Get standings (round-robin table or knockout bracket state) and the suggested champion"""
+    try:
+        tournament = db.session.get(Tournament, tournament_id)
+        if tournament is None:
+            return jsonify({'error': 'Tournament not found'}), 404
+        standings = get_standings(tournament)
+        champion = suggest_champion(tournament, standings)
+        return jsonify({
+            'tournament_id': tournament.id,
+            'format_type': tournament.format_type,
+            'standings': standings,
+            'suggested_champion': champion
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,11 +1,71 @@
 from flask import Blueprint, request, jsonify
 from backend.app import db
+from backend.badge_render import prerender_badges
+from backend.bulk import RowErrors, chunked, is_ndjson_request, iter_request_records
+from backend.cache import (TOURNAMENTS_TAG, WINNERS_TAG, cached_response, invalidate_tags, player_tag,
+                           tournament_tag, wallet_tag)
+from backend.events import publish_event
 from backend.models import Tournament, Team, Match, Winner
+from backend.pagination import Page, PaginationError, tournament_filters
+from backend.mint_queue import enqueue_mint, notify_mint_queue
+from backend.projections import held_winner_query, winner_dicts, winner_query
+from backend.standings import StandingsDelta, get_standings, suggest_champion
+from sqlalchemy import insert
 from datetime import datetime
 import json
 
 winner_bp = Blueprint('winner', __name__)
 
+def _validate_match(record, team_ids):
+    """
+    Validate one match record against the tournament's teams
+
+    Returns:
+        dict: Column values for the matches table
+
+    Raises:
+        ValueError: If the record is invalid
+    """
+    try:
+        team1_id = int(record['team1_id'])
+        team2_id = int(record['team2_id'])
+        round_number = int(record['round'])
+    except KeyError as e:
+        raise ValueError(f'Missing required field: {e.args[0]}')
+    except (TypeError, ValueError):
+        raise ValueError('team1_id, team2_id and round must be integers')
+
+    for team_id in (team1_id, team2_id):
+        if team_id not in team_ids:
+            raise ValueError(f'Team {team_id} is not registered in this tournament')
+    if team1_id == team2_id:
+        raise ValueError('A team cannot play itself')
+
+    winner_id = record.get('winner_id')
+    if winner_id is not None:
+        try:
+            winner_id = int(winner_id)
+        except (TypeError, ValueError):
+            raise ValueError('winner_id must be an integer')
+        if winner_id not in (team1_id, team2_id):
+            raise ValueError('winner_id must be team1_id or team2_id')
+
+    scores = []
+    for field in ('team1_score', 'team2_score'):
+        score = record.get(field)
+        if score is not None and not isinstance(score, int):
+            raise ValueError(f'{field} must be an integer')
+        scores.append(score)
+
+    return {
+        'team1_id': team1_id,
+        'team2_id': team2_id,
+        'round': round_number,
+        'team1_score': scores[0],
+        'team2_score': scores[1],
+        'winner_id': winner_id
+    }
+
 @winner_bp.route('/submit-results', methods=['POST'])
 def submit_results():
     """
@@ -24,11 +84,17 @@ def submit_results():
             }
         ]
     }
+    
+    Large uploads can be streamed as NDJSON (Content-Type:
+    application/x-ndjson), one match object per line, with
+    ?tournament_id=1 in the query string. Invalid rows are reported
+    individually and the rest are inserted.
     """
     try:
-        data = request.get_json()
-        
-        tournament_id = data.get('tournament_id')
+        if is_ndjson_request():
+            tournament_id = request.args.get('tournament_id', type=int)
+        else:
+            tournament_id = (request.get_json() or {}).get('tournament_id')
         if not tournament_id:
             return jsonify({'error': 'tournament_id is required'}), 400
         
@@ -36,26 +102,51 @@ def submit_results():
         if not tournament:
             return jsonify({'error': 'Tournament not found'}), 404
         
-        matches = data.get('matches', [])
-        
-        for match_data in matches:
-            match = Match(
-                tournament_id=tournament_id,
-                team1_id=match_data['team1_id'],
-                team2_id=match_data['team2_id'],
-                round=match_data['round'],
-                team1_score=match_data.get('team1_score'),
-                team2_score=match_data.get('team2_score'),
-                winner_id=match_data.get('winner_id'),
-                played_at=datetime.utcnow()
-            )
-            db.session.add(match)
+        # One set-based lookup validates every team ID in the upload
+        team_ids = {row.id for row in db.session.query(Team.id).filter_by(tournament_id=tournament_id)}
+        
+        played_at = datetime.utcnow()
+        errors = RowErrors()
+        standings = StandingsDelta(tournament_id)
+        inserted = 0
+        
+        def valid_rows():
+            for row, record in iter_request_records('matches'):
+                if isinstance(record, Exception):
+                    errors.add(row, record)
+                    continue
+                try:
+                    values = _validate_match(record, team_ids)
+                except ValueError as e:
+                    errors.add(row, e)
+                    continue
+                values['tournament_id'] = tournament_id
+                values['played_at'] = played_at
+                yield values
         
+        # executemany in chunks keeps memory flat for streamed uploads
+        for chunk in chunked(valid_rows()):
+            db.session.execute(insert(Match), chunk)
+            inserted += len(chunk)
+            for row in chunk:
+                standings.add(row)
+        
+        if inserted == 0 and errors:
+            db.session.rollback()
+            return jsonify({'error': 'No valid matches submitted', 'inserted': 0, **errors.to_dict()}), 400
+        
+        # Fold the batch into the standings in the same transaction
+        standings.apply()
+        invalidate_tags(tournament_tag(tournament_id))
         db.session.commit()
+        publish_event('match_submitted', {'tournament_id': tournament_id, 'inserted': inserted},
+                      tournament_id=tournament_id)
         
         return jsonify({
             'success': True,
-            'message': 'Results submitted successfully'
+            'message': 'Results submitted successfully',
+            'inserted': inserted,
+            **errors.to_dict()
         }), 200
         
     except Exception as e:
@@ -72,6 +163,9 @@ def declare_winner():
         "tournament_id": 1,
         "team_id": 3
     }
+    
+    Send "from_standings": true instead of team_id to declare the
+    champion suggested by GET /api/tournament/<id>/standings.
     """
     try:
         data = request.get_json()
@@ -79,15 +173,21 @@ def declare_winner():
         tournament_id = data.get('tournament_id')
         team_id = data.get('team_id')
         
-        if not tournament_id or not team_id:
+        if not tournament_id or not (team_id or data.get('from_standings')):
             return jsonify({'error': 'tournament_id and team_id are required'}), 400
         
         # Get tournament and team
         tournament = Tournament.query.get(tournament_id)
-        team = Team.query.get(team_id)
-        
         if not tournament:
             return jsonify({'error': 'Tournament not found'}), 404
+        
+        if not team_id:
+            champion = suggest_champion(tournament, get_standings(tournament))
+            if not champion:
+                return jsonify({'error': 'Standings do not point to a single champion'}), 400
+            team_id = champion['team_id']
+        
+        team = Team.query.get(team_id)
         if not team:
             return jsonify({'error': 'Team not found'}), 404
         
@@ -107,15 +207,17 @@ def declare_winner():
         )
         
         db.session.add(winner)
-        db.session.commit()
         
-        # Trigger NFT minting
-        # In production, this would be done via a background task queue (Celery)
-        import threading
-        from backend.routes.nft import mint_champion_nft_async
-        thread = threading.Thread(target=mint_champion_nft_async, args=(winner.id,))
-        thread.daemon = True
-        thread.start()
+        # Queue NFT minting in the same transaction so it survives restarts
+        enqueue_mint(winner)
+        invalidate_tags(TOURNAMENTS_TAG, tournament_tag(tournament_id), WINNERS_TAG, wallet_tag(winner.wallet_address),
+                        *(player_tag(player.name_key) for player in team.players))
+        db.session.commit()
+        # Start rendering the badge in the background; the mint job joins it
+        prerender_badges([winner])
+        notify_mint_queue()
+        publish_event('winner_declared', winner.to_dict(), tournament_id=tournament_id,
+                      wallet_address=winner.wallet_address)
         
         return jsonify({
             'success': True,
@@ -128,24 +230,48 @@ def declare_winner():
         return jsonify({'error': str(e)}), 500
 
 @winner_bp.route('/hall-of-champions', methods=['GET'])
+@cached_response(tags=lambda: [WINNERS_TAG])
 def hall_of_champions():
-    """Get all past winners"""
+    """
+    Get past winners, newest first
+
+    Query params: limit, cursor, year, month, status, format_type, name_prefix
+    (tournament filters)
+    """
     try:
-        winners = Winner.query.join(Tournament).order_by(Winner.created_at.desc()).all()
+        page = Page(Winner.id)
+        winners, next_cursor = page.finish(winner_dicts(page.apply(winner_query().where(*tournament_filters()))))
         return jsonify({
-            'winners': [w.to_dict() for w in winners]
+            'winners': winners,
+            'next_cursor': next_cursor
         }), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @winner_bp.route('/by-wallet/<wallet_address>', methods=['GET'])
+@cached_response(tags=lambda wallet_address: [wallet_tag(wallet_address)])
 def get_wins_by_wallet(wallet_address):
-    """Get all wins for a specific wallet address"""
+    """
+    Get the wins whose champion NFT a wallet holds
+
+    Transferred NFTs follow their current holder once the holder indexer
+    has seen them (holder_wallet_address); until then a win is listed for
+    the wallet it was awarded to.
+
+    Query params: limit, cursor, year, month, status, format_type, name_prefix
+    """
     try:
-        winners = Winner.query.filter_by(wallet_address=wallet_address).all()
+        page = Page(Winner.id)
+        query = held_winner_query(wallet_address).where(*tournament_filters())
+        winners, next_cursor = page.finish(winner_dicts(page.apply(query)))
         return jsonify({
-            'wins': [w.to_dict() for w in winners]
+            'wins': winners,
+            'next_cursor': next_cursor
         }), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
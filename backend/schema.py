@@ -0,0 +1,94 @@
+"""
+Schema Startup Check
+How create_app treats the database schema (DB_SCHEMA_MODE):
+- create: db.create_all() on every boot (development default)
+- check: compare the database's Alembic revision with the newest
+  migration, one single-row query, and log a mismatch
+- skip: trust the deploy to have run `flask db upgrade`
+
+The head revision is read from the migration files as text, so checking
+does not import Alembic.
+"""
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'migrations')
+SCHEMA_MODES = ('create', 'check', 'skip')
+
+_REVISION = re.compile(r"^revision\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r'^down_revision\s*=\s*(.+)$', re.MULTILINE)
+_QUOTED = re.compile(r"['\"]([^'\"]+)['\"]")
+
+def migration_heads(directory=MIGRATIONS_DIRECTORY):
+    """
+    Revisions no other migration builds on
+
+    Returns:
+        set: Head revision IDs (one for a linear history)
+    """
+    versions = os.path.join(directory, 'versions')
+    revisions, parents = set(), set()
+    for name in os.listdir(versions):
+        if not name.endswith('.py'):
+            continue
+        with open(os.path.join(versions, name)) as f:
+            source = f.read()
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION.search(source)
+        if down_revision:
+            parents.update(_QUOTED.findall(down_revision.group(1)))
+    return revisions - parents
+
+def database_revisions(session):
+    """
+    Returns:
+        set: Revisions stamped in alembic_version, or None if the table is missing
+    """
+    try:
+        return {row[0] for row in session.execute(text('SELECT version_num FROM alembic_version'))}
+    except DBAPIError:
+        session.rollback()
+        return None
+
+def check_schema(db):
+    """
+    Log whether the database is at the newest migration
+
+    Only logs: `flask db upgrade` itself boots through create_app.
+
+    Returns:
+        bool: True if the database is at the head revision
+    """
+    heads = migration_heads()
+    current = database_revisions(db.session)
+    db.session.remove()
+    if current is None:
+        logger.error('Database has no alembic_version table; run `flask db upgrade` '
+                     '(or `flask db stamp head` if create_all built it)')
+        return False
+    if current != heads:
+        logger.error('Database schema is at %s but the code expects %s; run `flask db upgrade`',
+                     ', '.join(sorted(current)) or 'no revision', ', '.join(sorted(heads)))
+        return False
+    logger.info('Database schema is at %s', ', '.join(sorted(current)))
+    return True
+
+def init_schema(app, db):
+    mode = app.config['DB_SCHEMA_MODE']
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f'DB_SCHEMA_MODE must be one of {", ".join(SCHEMA_MODES)}, got {mode!r}')
+    if mode == 'skip':
+        return
+    with app.app_context():
+        if mode == 'create':
+            db.create_all()
+        else:
+            check_schema(db)
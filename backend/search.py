@@ -0,0 +1,393 @@
+"""
+Search
+Finds tournaments (tournament_name and name), teams and players by name
+for GET /api/search. Query words match by prefix and despite typos, and
+results are ranked by the share of the query's trigrams they contain
+(score between 0 and 1).
+
+- PostgreSQL: pg_trgm GiST indexes (migration 0010), which return the
+  nearest matches by word similarity in index order, maintained by the
+  database
+- Other databases (SQLite): an in-process index of the words in every
+  name and the trigrams of those words, built on first use (or in the
+  background at boot, SEARCH_PREWARM). Each search first reads rows
+  inserted since the last one by id, a single query when nothing
+  changed, so bulk imports and other processes' writes are picked up;
+  ORM updates and deletes are applied when their transaction commits.
+  Writers are serialized on SQLite, so ids become visible in order.
+"""
+from backend.app import db
+from backend.models import Team, TeamPlayer, Tournament, player_key, tournament_search_text
+from flask import current_app
+from sqlalchemy import Float, event, func, select
+from sqlalchemy.orm import Session
+import gc
+import heapq
+import itertools
+import logging
+import math
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('tournaments', 'teams', 'players')
+MAX_QUERY_WORDS = 8
+MAX_QUERY_LENGTH = 100
+PLAYER_ROWS_PER_RESULT = 50  # roster rows read per player result on PostgreSQL
+
+_WORD = re.compile(r'[^\W_]+')  # runs of letters and digits, as pg_trgm splits words
+_NO_WORDS = frozenset()
+
+def words(text):
+    return _WORD.findall(text.casefold())
+
+def trigrams(word):
+    """Trigrams of a word padded like pg_trgm: two spaces before, one after"""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NgramIndex:
+    """
+    Words of one kind of document and the trigrams of those words
+
+    A query word matches the indexed words containing at least
+    min_similarity of its trigrams, which covers whole words, prefixes and
+    typos; a document matches when every query word matches one of its
+    words, and scores the mean of those similarities.
+    """
+
+    def __init__(self, min_similarity=0.4, max_word_matches=50, max_scan=50000, max_candidates=500):
+        """
+        Args:
+            min_similarity: Share of a query word's trigrams an indexed word must contain
+            max_word_matches: Indexed words kept per query word, most similar first
+            max_scan: Documents of a query word beyond which it is not intersected
+                      but checked on each candidate
+            max_candidates: Documents scored per query, newest first
+        """
+        self.min_similarity = min_similarity
+        self.max_word_matches = max_word_matches
+        self.max_scan = max_scan
+        self.max_candidates = max_candidates
+        self.docs = {}  # doc id -> tuple of its distinct words
+        self.postings = {}  # word -> {doc id: None}, an ordered set in the order docs were added
+        self.grams = {}  # trigram -> words containing it
+
+    def add(self, doc_id, text):
+        """Index a document, replacing its previous text"""
+        doc_words = tuple(dict.fromkeys(words(text)))
+        previous = self.docs.get(doc_id)
+        if previous == doc_words:
+            return
+        if previous is not None:
+            self.remove(doc_id)
+        self.docs[doc_id] = doc_words
+        for word in doc_words:
+            posting = self.postings.get(word)
+            if posting is None:
+                posting = self.postings[word] = {}
+                for gram in trigrams(word):
+                    self.grams.setdefault(gram, set()).add(word)
+            posting[doc_id] = None
+
+    def remove(self, doc_id):
+        for word in self.docs.pop(doc_id, ()):
+            posting = self.postings[word]
+            del posting[doc_id]
+            if posting:
+                continue
+            del self.postings[word]
+            for gram in trigrams(word):
+                holders = self.grams[gram]
+                holders.discard(word)
+                if not holders:
+                    del self.grams[gram]
+
+    def match_word(self, query_word):
+        """
+        Returns:
+            dict: Indexed word -> share of the query word's trigrams it contains
+        """
+        query_grams = sorted(trigrams(query_word), key=lambda gram: len(self.grams.get(gram, _NO_WORDS)))
+        needed = max(1, math.ceil(self.min_similarity * len(query_grams) - 1e-9))
+        gram_words = [self.grams.get(gram, _NO_WORDS) for gram in query_grams]
+        # A word sharing `needed` trigrams contains one of the rarest len - needed + 1
+        candidates = set().union(*gram_words[:len(query_grams) - needed + 1])
+        matches = {}
+        for word in candidates:
+            shared = sum(word in holders for holders in gram_words)
+            if shared >= needed:
+                matches[word] = shared / len(query_grams)
+        if len(matches) > self.max_word_matches:
+            matches = dict(heapq.nsmallest(self.max_word_matches, matches.items(),
+                                           key=lambda match: (-match[1], len(match[0]), match[0])))
+        return matches
+
+    def _newest(self, matches, limit):
+        """Up to limit documents containing the matched words, best words and newest documents first"""
+        docs = {}
+        for word in sorted(matches, key=lambda word: (-matches[word], word)):
+            docs.update(dict.fromkeys(itertools.islice(reversed(self.postings[word]), limit - len(docs))))
+            if len(docs) >= limit:
+                break
+        return docs.keys()
+
+    def search(self, query, limit):
+        """
+        Returns:
+            list: (doc_id, score) of the best matches, best first
+        """
+        query_words = list(dict.fromkeys(words(query)))[:MAX_QUERY_WORDS]
+        matched = [self.match_word(word) for word in query_words]
+        if not matched or not all(matched):
+            return []
+
+        # Intersect the documents of the rarest query words; words matching
+        # more than max_scan documents, or many more than the candidates
+        # left, are only checked on the candidates
+        sizes = [sum(len(self.postings[word]) for word in matches) for matches in matched]
+        candidates = None
+        for size, matches in sorted(zip(sizes, matched), key=lambda item: item[0]):
+            if candidates is None and (size > self.max_scan or len(matched) == 1 and size > self.max_candidates):
+                candidates = self._newest(matches, self.max_candidates)
+            if size > self.max_scan or (candidates is not None and size > 8 * len(candidates)):
+                break
+            docs = set().union(*(self.postings[word] for word in matches))
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return []
+        if len(candidates) > self.max_candidates:
+            candidates = heapq.nsmallest(self.max_candidates, candidates, key=_newest_first)
+
+        results = []
+        for doc_id in candidates:
+            doc_words = self.docs[doc_id]
+            score = _assign(matched, doc_words)
+            if score:
+                results.append((score, len(doc_words), doc_id))
+        # Ties go to the document with fewer other words, then the newest
+        best = heapq.nsmallest(limit, results, key=lambda result: (-result[0], result[1], _newest_first(result[2])))
+        return [(doc_id, round(score, 3)) for score, _, doc_id in best]
+
+def _assign(matched, doc_words):
+    """
+    Mean similarity of the query words to the document's words, each doc
+    word standing for one query word (best pairs first), or 0 if a query
+    word is left without a match
+    """
+    if len(matched) == 1:
+        return max([matched[0].get(word, 0.0) for word in doc_words], default=0.0)
+    pairs = sorted(((matches[word], i, word) for i, matches in enumerate(matched)
+                    for word in doc_words if word in matches), reverse=True)
+    query_used, words_used, total = set(), set(), 0.0
+    for similarity, i, word in pairs:
+        if i not in query_used and word not in words_used:
+            query_used.add(i)
+            words_used.add(word)
+            total += similarity
+    return total / len(matched) if len(query_used) == len(matched) else 0.0
+
+def _newest_first(doc_id):
+    # Row ids grow with time; player documents are keyed by name instead
+    return -doc_id if isinstance(doc_id, int) else doc_id
+
+# kind -> (row id column, document id column, text columns)
+SOURCES = {
+    'tournaments': (Tournament.id, Tournament.id, (Tournament.tournament_name, Tournament.name)),
+    'teams': (Team.id, Team.id, (Team.team_name,)),
+    'players': (TeamPlayer.id, TeamPlayer.name_key, (TeamPlayer.name_key,)),
+}
+
+class SearchIndex:
+    """An NgramIndex per kind, kept in step with the database"""
+
+    def __init__(self, min_similarity=0.4):
+        self.indexes = {kind: NgramIndex(min_similarity) for kind in KINDS}
+        self.last_ids = None  # kind -> highest row id indexed, None until built
+        self._lock = threading.RLock()
+
+    def sync(self):
+        """Index the rows inserted since the last sync, every row on first use"""
+        with self._lock:
+            building = self.last_ids is None
+            if building:
+                self.last_ids = dict.fromkeys(KINDS, 0)
+            newest = db.session.execute(select(*(
+                select(func.max(row_id)).scalar_subquery() for row_id, _, _ in SOURCES.values()
+            ))).one()
+            for kind, newest_id in zip(KINDS, newest):
+                if newest_id is None or newest_id <= self.last_ids[kind]:
+                    continue
+                row_id, doc_id, columns = SOURCES[kind]
+                index = self.indexes[kind]
+                rows = select(doc_id, *columns) \
+                    .where(row_id > self.last_ids[kind], row_id <= newest_id) \
+                    .order_by(row_id).execution_options(yield_per=10000)
+                for row in db.session.execute(rows):
+                    index.add(row[0], ' '.join(row[1:]))
+                self.last_ids[kind] = newest_id
+            if building:
+                # Keep the collector from re-scanning millions of index objects on every full collection
+                gc.freeze()
+                logger.info('Search index built: %s', {kind: len(self.indexes[kind].docs) for kind in KINDS})
+
+    def apply(self, changes):
+        """Apply committed ORM changes: (kind, doc id, text or None for deleted)"""
+        with self._lock:
+            if self.last_ids is None:
+                return
+            for kind, doc_id, text in changes:
+                if text is None:
+                    self.indexes[kind].remove(doc_id)
+                elif doc_id <= self.last_ids[kind]:
+                    self.indexes[kind].add(doc_id, text)
+
+    def search(self, query, kinds, limit):
+        """
+        Returns:
+            dict: kind -> (doc_id, score) of the best matches, best first
+        """
+        with self._lock:
+            self.sync()
+            return {kind: self.indexes[kind].search(query, limit) for kind in kinds}
+
+# Singleton instance, None on PostgreSQL
+_search_index = None
+
+def init_search(app):
+    """
+    Create the in-process index unless the database is PostgreSQL, and
+    build it in the background when SEARCH_PREWARM is set
+    """
+    global _search_index
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgres'):
+        _search_index = None
+        return None
+    _search_index = SearchIndex(app.config['SEARCH_MIN_SIMILARITY'])
+    if app.config['SEARCH_PREWARM']:
+        index = _search_index
+
+        def prewarm():
+            try:
+                with app.app_context():
+                    index.sync()
+            except Exception as e:
+                logger.warning('Search index pre-warm failed: %s', e)
+
+        thread = threading.Thread(target=prewarm, name='search-prewarm')
+        thread.daemon = True
+        thread.start()
+    return _search_index
+
+def get_search_index():
+    return _search_index
+
+def _result_query(kind):
+    """Columns returned for each kind of result"""
+    if kind == 'tournaments':
+        return select(Tournament.id, Tournament.name, Tournament.tournament_name, Tournament.format_type,
+                      Tournament.month, Tournament.year, Tournament.status)
+    if kind == 'teams':
+        return select(Team.id, Team.team_name, Team.tournament_id, Tournament.tournament_name, Tournament.month,
+                      Tournament.year).join(Tournament, Tournament.id == Team.tournament_id)
+    return select(func.min(TeamPlayer.name).label('name'), func.count(TeamPlayer.id).label('teams')) \
+        .group_by(TeamPlayer.name_key)
+
+def _search_postgres(kind, query, limit):
+    """
+    Nearest matches by word similarity distance (text <->> query), read in
+    order from the GiST trigram index; `%>` keeps those over the threshold
+    """
+    if kind == 'tournaments':
+        text, key = tournament_search_text(), Tournament.id.desc()
+    elif kind == 'teams':
+        text, key = Team.team_name, Team.id.desc()
+    else:
+        return _search_postgres_players(player_key(query), limit)
+    distance = text.op('<->>', return_type=Float)(query)
+    rows = _result_query(kind).add_columns((1 - distance).label('score')) \
+        .where(text.op('%>', is_comparison=True)(query)) \
+        .order_by(distance, key).limit(limit)
+    return [{**row._asdict(), 'score': round(row.score, 3)} for row in db.session.execute(rows)]
+
+def _search_postgres_players(query, limit):
+    # team_players has a row per roster entry: take the nearest rows, then
+    # group them by name
+    distance = TeamPlayer.name_key.op('<->>', return_type=Float)(query)
+    nearest = select(TeamPlayer.name_key, distance.label('distance')) \
+        .where(TeamPlayer.name_key.op('%>', is_comparison=True)(query)) \
+        .order_by(distance).limit(limit * PLAYER_ROWS_PER_RESULT).subquery()
+    names = select(nearest.c.name_key, func.min(nearest.c.distance).label('distance')) \
+        .group_by(nearest.c.name_key).order_by('distance', nearest.c.name_key).limit(limit).subquery()
+    rows = _result_query('players').add_columns((1 - names.c.distance).label('score')) \
+        .join(names, names.c.name_key == TeamPlayer.name_key) \
+        .group_by(names.c.distance).order_by(names.c.distance, TeamPlayer.name_key)
+    return [{**row._asdict(), 'score': round(row.score, 3)} for row in db.session.execute(rows)]
+
+def _load_results(kind, ranked):
+    """Result dicts for ranked (doc_id, score) pairs of the in-process index"""
+    if not ranked:
+        return []
+    key = {'tournaments': Tournament.id, 'teams': Team.id, 'players': TeamPlayer.name_key}[kind]
+    rows = _result_query(kind).add_columns(key.label('key')).where(key.in_([doc_id for doc_id, _ in ranked]))
+    found = {}
+    for row in db.session.execute(rows):
+        result = row._asdict()
+        found[result.pop('key')] = result
+    # Rows deleted by another process since they were indexed drop out here
+    return [{**found[doc_id], 'score': score} for doc_id, score in ranked if doc_id in found]
+
+def search(query, kinds=KINDS, limit=10):
+    """
+    Best matches of each kind for a query
+
+    Args:
+        query: Search text
+        kinds: Subset of KINDS to search
+        limit: Results per kind
+
+    Returns:
+        dict: kind -> result dicts with a score, best first
+    """
+    query = query[:MAX_QUERY_LENGTH]
+    if _search_index is None:
+        threshold = str(current_app.config['SEARCH_MIN_SIMILARITY'])
+        db.session.execute(select(func.set_config('pg_trgm.word_similarity_threshold', threshold, True)))
+        return {kind: _search_postgres(kind, query, limit) for kind in kinds}
+    ranked = _search_index.search(query, kinds, limit)
+    return {kind: _load_results(kind, ranked[kind]) for kind in kinds}
+
+def _kind_of(obj):
+    if isinstance(obj, Tournament):
+        return 'tournaments', f'{obj.tournament_name} {obj.name}'
+    if isinstance(obj, Team):
+        return 'teams', obj.team_name
+    return None, None
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    # New rows are read by id at the next search; collect renames and deletes
+    if _search_index is None:
+        return
+    changes = []
+    for obj in session.dirty:
+        kind, text = _kind_of(obj)
+        if kind and session.is_modified(obj, include_collections=False):
+            changes.append((kind, obj.id, text))
+    for obj in session.deleted:
+        kind, _ = _kind_of(obj)
+        if kind:
+            changes.append((kind, obj.id, None))
+    if changes:
+        session.info.setdefault('search_changes', []).extend(changes)
+
+@event.listens_for(Session, 'after_commit')
+def _apply_after_commit(session):
+    changes = session.info.pop('search_changes', None)
+    if changes and _search_index is not None:
+        _search_index.apply(changes)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('search_changes', None)
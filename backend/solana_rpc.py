@@ -0,0 +1,174 @@
+"""
+Solana JSON-RPC Client
+Minimal HTTP client for the read-only calls the backend needs in bulk.
+getSignatureStatuses takes up to 256 signatures per call,
+getMultipleAccounts up to 100 accounts and getTokenLargestAccounts one
+mint, and several calls are sent together as one JSON-RPC batch request.
+"""
+from backend.bulk import chunked
+
+CLUSTER_ENDPOINTS = {
+    'devnet': 'https://api.devnet.solana.com',
+    'testnet': 'https://api.testnet.solana.com',
+    'mainnet': 'https://api.mainnet-beta.solana.com'
+}
+MAX_SIGNATURES_PER_CALL = 256
+MAX_ACCOUNTS_PER_CALL = 100
+MAX_CALLS_PER_REQUEST = 10
+COMMITMENT_LEVELS = ('processed', 'confirmed', 'finalized')
+
+class SolanaRPCError(Exception):
+    """Raised when the RPC node returns an error or an unusable response"""
+
+def cluster_endpoint(network):
+    """RPC URL for a network name, defaulting to mainnet like SolanaNFTService"""
+    return CLUSTER_ENDPOINTS.get(network, CLUSTER_ENDPOINTS['mainnet'])
+
+class SolanaRPCClient:
+    def __init__(self, endpoint, timeout=30):
+        """
+        Args:
+            endpoint: JSON-RPC URL (a cluster, a local validator or a stand-in server)
+            timeout: Seconds per HTTP request
+        """
+        self.endpoint = endpoint
+        self.timeout = timeout
+        # requests is imported here so importing the app does not pay for it
+        import requests
+        self.session = requests.Session()
+
+    def batch(self, calls, skip_errors=False):
+        """
+        Send several JSON-RPC calls in one HTTP request
+
+        Args:
+            calls: List of (method, params) tuples
+            skip_errors: Return None for calls the node rejected instead of raising
+
+        Returns:
+            list: The result of each call, in order
+        """
+        payload = [
+            {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        response = self.session.post(self.endpoint, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        replies = response.json()
+        if not isinstance(replies, list):
+            # Some nodes answer a rejected batch with a single error object
+            raise SolanaRPCError(replies.get('error', replies) if isinstance(replies, dict) else replies)
+
+        by_id = {reply.get('id'): reply for reply in replies}
+        results = []
+        for i in range(len(calls)):
+            reply = by_id.get(i)
+            if reply is None:
+                raise SolanaRPCError(f'No reply for call {i}')
+            if 'error' in reply:
+                if not skip_errors:
+                    raise SolanaRPCError(reply['error'])
+                results.append(None)
+                continue
+            results.append(reply['result'])
+        return results
+
+    def get_signature_statuses(self, signatures, search_history=True):
+        """
+        Look up the status of many transaction signatures
+
+        Args:
+            signatures: Base58 transaction signatures
+            search_history: Also search beyond the node's recent status cache
+
+        Returns:
+            list: One status dict per signature (slot, confirmations, err,
+            confirmationStatus), or None for signatures the node does not know
+        """
+        signatures = list(signatures)
+        options = {'searchTransactionHistory': search_history}
+        calls = [('getSignatureStatuses', [chunk, options])
+                 for chunk in chunked(signatures, MAX_SIGNATURES_PER_CALL)]
+
+        statuses = []
+        for request_calls in chunked(calls, MAX_CALLS_PER_REQUEST):
+            for result in self.batch(request_calls):
+                statuses.extend(result['value'])
+        if len(statuses) != len(signatures):
+            raise SolanaRPCError(f'Expected {len(signatures)} statuses, got {len(statuses)}')
+        return statuses
+
+    def get_multiple_accounts(self, addresses, commitment='confirmed', min_context_slot=None):
+        """
+        Fetch many accounts, parsed by the node (jsonParsed encoding)
+
+        Args:
+            addresses: Base58 account addresses
+            commitment: Commitment level the node reads at
+            min_context_slot: Fail instead of answering from an older slot
+
+        Returns:
+            tuple: (accounts, slot) - one account dict or None per address,
+            and the oldest context slot among the calls
+        """
+        addresses = list(addresses)
+        options = {'encoding': 'jsonParsed', 'commitment': commitment}
+        if min_context_slot:
+            options['minContextSlot'] = min_context_slot
+        calls = [('getMultipleAccounts', [chunk, options])
+                 for chunk in chunked(addresses, MAX_ACCOUNTS_PER_CALL)]
+
+        accounts, slots = [], []
+        for request_calls in chunked(calls, MAX_CALLS_PER_REQUEST):
+            for result in self.batch(request_calls):
+                accounts.extend(result['value'])
+                slots.append(result['context']['slot'])
+        if len(accounts) != len(addresses):
+            raise SolanaRPCError(f'Expected {len(addresses)} accounts, got {len(accounts)}')
+        return accounts, min(slots) if slots else None
+
+    def get_token_largest_accounts(self, mints, commitment='confirmed'):
+        """
+        Largest token accounts of many mints, one call per mint
+
+        Returns:
+            tuple: (holdings, slot) - per mint a list of {address, amount, ...}
+            sorted by amount descending (None if the node rejected the mint,
+            e.g. one it has not seen yet), and the oldest context slot
+        """
+        mints = list(mints)
+        calls = [('getTokenLargestAccounts', [mint, {'commitment': commitment}]) for mint in mints]
+
+        holdings, slots = [], []
+        for request_calls in chunked(calls, MAX_CALLS_PER_REQUEST):
+            for result in self.batch(request_calls, skip_errors=True):
+                holdings.append(result['value'] if result else None)
+                if result:
+                    slots.append(result['context']['slot'])
+        return holdings, min(slots) if slots else None
+
+def token_account_owner(account, mint):
+    """
+    Wallet holding an NFT through a jsonParsed token account
+
+    Returns:
+        str: The owner, or None if the account is closed, belongs to another
+        mint or no longer holds the token
+    """
+    try:
+        info = account['data']['parsed']['info']
+        if info['mint'] != mint or int(info['tokenAmount']['amount']) < 1:
+            return None
+        return info['owner']
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def is_confirmed(status, commitment='finalized'):
+    """True when a getSignatureStatuses entry succeeded and reached `commitment`"""
+    if not status or status.get('err') is not None:
+        return False
+    reached = status.get('confirmationStatus')
+    if reached is None:
+        # Older nodes: confirmations is null once the block is rooted
+        reached = 'finalized' if status.get('confirmations') is None else 'confirmed'
+    return COMMITMENT_LEVELS.index(reached) >= COMMITMENT_LEVELS.index(commitment)
@@ -1,21 +1,35 @@
 """
 Solana NFT Minting Service
 Uses Solana Python SDK to mint NFTs with Metaplex metadata
-"""
-try:
-    from solana.rpc.api import Client
-    from solana.publickey import PublicKey
-except ImportError:
-    # Fallback if solana-py not available
-    Client = None
-    PublicKey = None
 
-from solders.keypair import Keypair
-import base58
+The Solana SDK (solana-py, solders, base58) is imported when the service
+is first built, on the first mint or by the background pre-warm, so
+importing the app stays cheap.
+"""
+from backend.bulk import is_valid_wallet_address
+from backend.fake_minter import FakeMinter
+from backend.metrics import count_mint_result
+from backend.mint_daemon import MintDaemonClient, MintDaemonError
+from backend.solana_rpc import SolanaRPCClient, cluster_endpoint, is_confirmed
+import base64
 import json
+import logging
 import os
+import threading
+import time
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+def _solana_py():
+    """(Client, PublicKey) from solana-py, or (None, None) when it is not installed"""
+    try:
+        from solana.rpc.api import Client
+        from solana.publickey import PublicKey
+    except ImportError:
+        return None, None
+    return Client, PublicKey
+
 class SolanaNFTService:
     def __init__(self, network='devnet', private_key=None):
         """
@@ -25,21 +39,46 @@ class SolanaNFTService:
             network: 'devnet' or 'mainnet'
             private_key: Base58 encoded private key for mint authority
         """
-        if network == 'devnet':
-            self.endpoint = 'https://api.devnet.solana.com'
-        else:
-            self.endpoint = 'https://api.mainnet-beta.solana.com'
+        # SOLANA_RPC_URL points at a local validator or a private RPC node
+        self.endpoint = os.getenv('SOLANA_RPC_URL') or cluster_endpoint(network)
         
-        self.client = Client(self.endpoint)
+        Client, self.PublicKey = _solana_py()
+        self.client = Client(self.endpoint) if Client is not None else None
+        self.rpc = SolanaRPCClient(self.endpoint)
         self.network = network
         
+        self.daemon_concurrency = int(os.getenv('MINT_DAEMON_CONCURRENCY', '4'))
+        # Seconds a finished mint is returned again for the same winner instead of minting twice
+        idempotency_ttl = os.getenv('MINT_IDEMPOTENCY_TTL', '300')
+        if os.getenv('MINT_BACKEND', 'daemon') == 'fake':
+            # Simulated mints for benchmarks and offline development
+            self.minter = FakeMinter(
+                latency=float(os.getenv('MINT_FAKE_LATENCY', '0.5')),
+                failure_rate=float(os.getenv('MINT_FAKE_FAILURE_RATE', '0')),
+                concurrency=self.daemon_concurrency,
+                request_timeout=int(os.getenv('MINT_TIMEOUT', '120')),
+                seed=os.getenv('MINT_FAKE_SEED'),
+                idempotency_ttl=float(idempotency_ttl),
+                on_late_result=self._late_result
+            )
+        else:
+            # Long-lived Node.js Metaplex process, spawned on first mint
+            self.minter = MintDaemonClient(
+                self.endpoint,
+                request_timeout=int(os.getenv('MINT_TIMEOUT', '120')),
+                env={'MINT_DAEMON_CONCURRENCY': str(self.daemon_concurrency), 'MINT_IDEMPOTENCY_TTL': idempotency_ttl},
+                on_late_result=self._late_result
+            )
+        
         # Load or generate keypair for mint authority
         if private_key:
             try:
+                from solders.keypair import Keypair
+                import base58
                 private_key_bytes = base58.b58decode(private_key)
                 self.mint_authority = Keypair.from_secret_key(private_key_bytes)
             except Exception as e:
-                print(f"Error loading private key: {e}")
+                logger.error('Error loading private key: %s', e)
                 self.mint_authority = None
         else:
             self.mint_authority = None
@@ -111,9 +150,66 @@ class SolanaNFTService:
         # Return placeholder - actual URI comes from mint_nft.js
         return "uploaded-via-metaplex"
     
-    def mint_nft(self, recipient_wallet_address, tournament_name, month, year, team_name, badge_image_url, badge_serial_id):
+    def build_mint_params(self, recipient_wallet_address, tournament_name, month, year, team_name, badge_image_url, badge_serial_id,
+                          badge_image_uri=None, idempotency_key=None, mint_seed=None):
+        """
+        Validate the recipient and build the daemon 'mint' request parameters
+        
+        badge_image_uri is an already uploaded (Arweave) copy of the badge
+        image; when set the daemon skips downloading and re-uploading it.
+        Requests sharing an idempotency_key are minted once by the daemon.
+        mint_seed (hex) fixes the mint address: the daemon returns the NFT
+        already minted there instead of minting again.
+        
+        Returns:
+            dict: Parameters for the Metaplex daemon
+        """
+        # Validate wallet address
+        if self.PublicKey is not None:
+            self.PublicKey(recipient_wallet_address)
+        elif not is_valid_wallet_address(recipient_wallet_address):
+            raise ValueError(f'Invalid wallet address: {recipient_wallet_address}')
+        
+        # Create metadata
+        metadata = self.create_metadata_json(
+            tournament_name, month, year, team_name, badge_image_uri or badge_image_url, badge_serial_id
+        )
+        
+        params = {
+            'recipientWallet': recipient_wallet_address,
+            'name': metadata['name'],
+            'description': metadata['description'],
+            'imageUrl': badge_image_url,
+            'attributes': metadata['attributes']
+        }
+        if badge_image_uri:
+            params['imageUri'] = badge_image_uri
+        if idempotency_key:
+            params['idempotencyKey'] = idempotency_key
+        if mint_seed:
+            params['mintSeed'] = mint_seed
+        return params
+    
+    def _mint_result(self, result):
+        return {
+            'success': True,
+            'token_id': result['tokenId'],
+            'transaction_signature': result.get('signature', ''),
+            'metadata_uri': result['metadataUri'],
+            'network': self.network
+        }
+    
+    def _late_result(self, op, params, result):
+        """Record a mint that finished after its caller timed out"""
+        if op != 'mint' or not params.get('idempotencyKey'):
+            return
+        from backend.routes.nft import record_late_mint
+        record_late_mint(params['idempotencyKey'], self._mint_result(result))
+    
+    def mint_nft(self, recipient_wallet_address, tournament_name, month, year, team_name, badge_image_url, badge_serial_id,
+                 badge_image_uri=None, idempotency_key=None, mint_seed=None):
         """
-        Mint an NFT to the recipient wallet using Metaplex via Node.js
+        Mint an NFT to the recipient wallet using the Metaplex daemon
         
         Args:
             recipient_wallet_address: Solana wallet address to receive the NFT
@@ -123,109 +219,154 @@ class SolanaNFTService:
             team_name: Team name
             badge_image_url: Badge image URL
             badge_serial_id: Badge serial ID
+            badge_image_uri: Cached Arweave URI of the badge image, if known
+            idempotency_key: Key the daemon dedupes repeated mints on
+            mint_seed: Hex seed of the mint keypair, kept across retries
             
         Returns:
             dict: Mint result with token_id, transaction signature, and metadata_uri
         """
         try:
-            # Validate wallet address
-            recipient_pubkey = PublicKey(recipient_wallet_address)
-            
-            # Create metadata
-            metadata = self.create_metadata_json(
-                tournament_name, month, year, team_name, badge_image_url, badge_serial_id
+            params = self.build_mint_params(
+                recipient_wallet_address, tournament_name, month, year, team_name, badge_image_url, badge_serial_id,
+                badge_image_uri, idempotency_key, mint_seed
             )
             
-            # Call Node.js script for actual Metaplex minting
-            import subprocess
-            import os
-            
-            # Prepare arguments
-            name = metadata['name']
-            description = metadata['description']
-            attributes_json = json.dumps(metadata['attributes'])
+            # Mint through the long-lived Metaplex daemon
+            result = self._mint_result(self.minter.call('mint', params))
             
-            # Path to the Node.js minting script
-            script_path = os.path.join(os.path.dirname(__file__), '..', 'metaplex', 'mint_nft.js')
-            
-            # Run Node.js script
-            result = subprocess.run(
-                ['node', script_path, 
-                 recipient_wallet_address,
-                 name,
-                 description,
-                 badge_image_url,
-                 attributes_json,
-                 self.endpoint],
-                capture_output=True,
-                text=True,
-                timeout=120  # 2 minute timeout
-            )
-            
-            # Parse JSON output from Node.js
-            try:
-                output_lines = result.stdout.strip().split('\n')
-                # Get the last line which should be the JSON output
-                json_output = output_lines[-1]
-                mint_result = json.loads(json_output)
-                
-                if mint_result.get('success'):
-                    return {
-                        'success': True,
-                        'token_id': mint_result['tokenId'],
-                        'transaction_signature': mint_result.get('signature', ''),
-                        'metadata_uri': mint_result['metadataUri'],
-                        'network': self.network
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'error': mint_result.get('error', 'Unknown error')
-                    }
-            except json.JSONDecodeError:
-                # Fallback: If JSON parsing fails, check stderr
-                return {
-                    'success': False,
-                    'error': f"Failed to parse output: {result.stderr}"
-                }
-            
-        except subprocess.TimeoutExpired:
-            return {
+        except MintDaemonError as e:
+            result = {
                 'success': False,
-                'error': 'NFT minting timed out'
+                'error': str(e)
             }
         except Exception as e:
-            print(f"Error minting NFT: {e}")
-            return {
+            logger.exception('Error minting NFT')
+            result = {
                 'success': False,
                 'error': str(e)
             }
+        count_mint_result(result)
+        return result
+    
+    def mint_many(self, mint_requests, timeout=None):
+        """
+        Mint several NFTs at once through the shared Metaplex daemon
+        
+        All requests are written to the daemon up front, so they run
+        concurrently over one connection and identity instead of one by one.
+        
+        Args:
+            mint_requests: List of dicts with the keyword arguments of mint_nft
+            timeout: Seconds to wait for the whole batch, at most one
+                request_timeout per wave by default
+            
+        Returns:
+            list: One mint_nft-style result per request, in the same order
+        """
+        pending = []
+        for kwargs in mint_requests:
+            try:
+                pending.append(self.minter.submit('mint', self.build_mint_params(**kwargs)))
+            except Exception as e:
+                pending.append({'success': False, 'error': str(e)})
+        
+        # The daemon works through the batch in waves of daemon_concurrency
+        waves = -(-len(mint_requests) // max(self.daemon_concurrency, 1))
+        wait = self.minter.request_timeout * max(waves, 1)
+        if timeout is not None:
+            wait = min(wait, timeout)
+        deadline = time.monotonic() + wait
+        
+        results = []
+        for call in pending:
+            if isinstance(call, dict):
+                results.append(call)
+                continue
+            try:
+                remaining = max(deadline - time.monotonic(), 0.001)
+                results.append(self._mint_result(call.result_or_raise(remaining)))
+            except MintDaemonError as e:
+                results.append({'success': False, 'error': str(e)})
+        for result in results:
+            count_mint_result(result)
+        return results
     
-    def verify_transaction(self, signature):
+    def upload_file(self, data, content_type=None, file_name='image.png'):
+        """
+        Upload raw bytes to Arweave through the Metaplex daemon
+        
+        Args:
+            data: File contents
+            content_type: MIME type, if known
+            file_name: File name recorded with the upload
+            
+        Returns:
+            str: Arweave URI
+        """
+        result = self.minter.call('upload', {
+            'data': base64.b64encode(data).decode('ascii'),
+            'fileName': file_name,
+            'contentType': content_type
+        })
+        return result['uri']
+    
+    def verify_transaction(self, signature, commitment='confirmed'):
         """
         Verify a transaction on Solana
         
+        Uses the same getSignatureStatuses lookup as the mint reconciler,
+        which checks many signatures per call.
+        
         Args:
             signature: Transaction signature to verify
+            commitment: processed, confirmed or finalized
             
         Returns:
             bool: True if transaction is confirmed
         """
         try:
-            response = self.client.confirm_transaction(signature)
-            return response
+            return is_confirmed(self.rpc.get_signature_statuses([signature])[0], commitment)
         except Exception as e:
-            print(f"Error verifying transaction: {e}")
+            logger.warning('Error verifying transaction %s: %s', signature, e)
             return False
 
 # Singleton instance
 _solana_service = None
+_solana_service_lock = threading.Lock()
 
 def get_solana_service():
     global _solana_service
     if _solana_service is None:
-        network = os.getenv('SOLANA_NETWORK', 'devnet')
-        private_key = os.getenv('SOLANA_PRIVATE_KEY', '')
-        _solana_service = SolanaNFTService(network, private_key)
+        # The pre-warm thread and a first mint may race to build it
+        with _solana_service_lock:
+            if _solana_service is None:
+                network = os.getenv('SOLANA_NETWORK', 'devnet')
+                private_key = os.getenv('SOLANA_PRIVATE_KEY', '')
+                _solana_service = SolanaNFTService(network, private_key)
     return _solana_service
 
+def prewarm_solana_service(app):
+    """
+    Build the minting service in a background thread after boot
+
+    Imports the Solana SDK and, when this process runs mint workers, starts
+    the mint daemon, so the first mint does not pay for either.
+    """
+    if not app.config['MINT_PREWARM']:
+        return None
+    spawn_daemon = app.config['MINT_WORKER_CONCURRENCY'] > 0
+
+    def prewarm():
+        try:
+            service = get_solana_service()
+            if spawn_daemon:
+                service.minter.call('ping')
+        except Exception as e:
+            logger.warning('Mint pre-warm failed: %s', e)
+
+    thread = threading.Thread(target=prewarm, name='solana-prewarm')
+    thread.daemon = True
+    thread.start()
+    return thread
+
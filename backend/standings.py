@@ -0,0 +1,222 @@
+"""
+Tournament Standings
+Standings are updated incrementally from each batch of submitted match
+results, so reading them costs O(teams) instead of aggregating every match
+"""
+from backend.app import db
+from backend.cache import invalidate_tags, tournament_tag
+from backend.models import Match, Standing, Team, Tournament
+from flask import current_app
+from sqlalchemy import Integer, and_, bindparam, case, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import click
+
+def match_outcome(row):
+    """
+    Decide a match from its winner_id or scores
+
+    Returns:
+        tuple: (winner_team_id, loser_team_id), (None, None) for a draw,
+        or None when the match has no result yet
+    """
+    if row.get('winner_id') is not None:
+        winner = row['winner_id']
+        loser = row['team2_id'] if winner == row['team1_id'] else row['team1_id']
+        return winner, loser
+    score1, score2 = row.get('team1_score'), row.get('team2_score')
+    if score1 is None or score2 is None:
+        return None
+    if score1 > score2:
+        return row['team1_id'], row['team2_id']
+    if score2 > score1:
+        return row['team2_id'], row['team1_id']
+    return None, None
+
+class StandingsDelta:
+    """Accumulates standings changes for one tournament from new match rows"""
+
+    def __init__(self, tournament_id):
+        self.tournament_id = tournament_id
+        self.points_win = current_app.config['STANDINGS_POINTS_WIN']
+        self.points_draw = current_app.config['STANDINGS_POINTS_DRAW']
+        self.points_loss = current_app.config['STANDINGS_POINTS_LOSS']
+        self.teams = {}
+
+    def _team(self, team_id):
+        if team_id not in self.teams:
+            self.teams[team_id] = {
+                'played': 0, 'won': 0, 'drawn': 0, 'lost': 0, 'points': 0,
+                'score_for': 0, 'score_against': 0, 'round_won': 0, 'eliminated_round': None
+            }
+        return self.teams[team_id]
+
+    def add(self, row):
+        """Fold one match (dict of matches columns) into the delta"""
+        outcome = match_outcome(row)
+        if outcome is None:
+            return
+
+        sides = ((row['team1_id'], row.get('team1_score'), row.get('team2_score')),
+                 (row['team2_id'], row.get('team2_score'), row.get('team1_score')))
+        for team_id, own, other in sides:
+            team = self._team(team_id)
+            team['played'] += 1
+            team['score_for'] += own or 0
+            team['score_against'] += other or 0
+
+        winner_id, loser_id = outcome
+        if winner_id is None:
+            for team_id, _, _ in sides:
+                self.teams[team_id]['drawn'] += 1
+                self.teams[team_id]['points'] += self.points_draw
+            return
+
+        winner = self.teams[winner_id]
+        winner['won'] += 1
+        winner['points'] += self.points_win
+        winner['round_won'] = max(winner['round_won'], row['round'])
+
+        loser = self.teams[loser_id]
+        loser['lost'] += 1
+        loser['points'] += self.points_loss
+        if loser['eliminated_round'] is None or row['round'] < loser['eliminated_round']:
+            loser['eliminated_round'] = row['round']
+
+    def apply(self):
+        """Write the delta with one INSERT for new teams and one executemany UPDATE (caller commits)"""
+        if not self.teams:
+            return
+
+        table = Standing.__table__
+        rows = [
+            {'tournament_id': self.tournament_id, 'team_id': team_id, 'played': 0, 'won': 0, 'drawn': 0,
+             'lost': 0, 'points': 0, 'score_for': 0, 'score_against': 0, 'last_round_won': 0}
+            for team_id in self.teams
+        ]
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            # Concurrent submissions for the same teams may both create rows; let the unique key decide
+            upsert = postgresql_insert if dialect == 'postgresql' else sqlite_insert
+            db.session.execute(upsert(table).values(rows).on_conflict_do_nothing(
+                index_elements=[table.c.tournament_id, table.c.team_id]
+            ))
+        else:
+            existing = {
+                team_id for (team_id,) in db.session.query(Standing.team_id).filter(
+                    Standing.tournament_id == self.tournament_id,
+                    Standing.team_id.in_(self.teams)
+                )
+            }
+            missing = [row for row in rows if row['team_id'] not in existing]
+            if missing:
+                db.session.execute(insert(table), missing)
+
+        round_won = bindparam('d_round_won', type_=Integer)
+        db.session.execute(
+            update(table)
+            .where(table.c.tournament_id == bindparam('t_tournament_id'), table.c.team_id == bindparam('t_team_id'))
+            .values(
+                played=table.c.played + bindparam('d_played'),
+                won=table.c.won + bindparam('d_won'),
+                drawn=table.c.drawn + bindparam('d_drawn'),
+                lost=table.c.lost + bindparam('d_lost'),
+                points=table.c.points + bindparam('d_points'),
+                score_for=table.c.score_for + bindparam('d_score_for'),
+                score_against=table.c.score_against + bindparam('d_score_against'),
+                last_round_won=case((table.c.last_round_won < round_won, round_won), else_=table.c.last_round_won),
+                eliminated_round=func.coalesce(table.c.eliminated_round, bindparam('d_eliminated_round', type_=Integer))
+            ),
+            [
+                {'t_tournament_id': self.tournament_id, 't_team_id': team_id,
+                 **{f'd_{key}': value for key, value in delta.items()}}
+                for team_id, delta in self.teams.items()
+            ]
+        )
+
+def _sort_key(format_type):
+    if format_type == 'knockout':
+        # Furthest round reached first; teams still in the bracket ahead of eliminated ones
+        return lambda s: (-s['last_round_won'], s['eliminated_round'] is not None,
+                          -(s['eliminated_round'] or 0), s['team_name'])
+    return lambda s: (-s['points'], -s['score_diff'], -s['score_for'], s['team_name'])
+
+def get_standings(tournament):
+    """
+    Current standings for every registered team, best first
+
+    Returns:
+        list: Standing dicts with team_name and rank
+    """
+    rows = db.session.query(Team.id, Team.team_name, Standing) \
+        .outerjoin(Standing, and_(Standing.team_id == Team.id, Standing.tournament_id == Team.tournament_id)) \
+        .filter(Team.tournament_id == tournament.id).all()
+
+    standings = []
+    for team_id, team_name, standing in rows:
+        if standing is None:
+            standing = Standing(tournament_id=tournament.id, team_id=team_id, played=0, won=0, drawn=0, lost=0,
+                                points=0, score_for=0, score_against=0, last_round_won=0)
+        entry = standing.to_dict()
+        entry['team_name'] = team_name
+        standings.append(entry)
+
+    standings.sort(key=_sort_key(tournament.format_type))
+    for rank, entry in enumerate(standings, start=1):
+        entry['rank'] = rank
+    return standings
+
+def suggest_champion(tournament, standings):
+    """
+    Pick the champion the standings point to, if there is a clear one
+
+    Knockout: the only team still in the bracket after winning a match.
+    Other formats: the table leader, unless tied on points and score diff,
+    once every team has played each of the others (or the tournament is
+    completed).
+
+    Returns:
+        dict: The leading standing entry, or None
+    """
+    if not standings or standings[0]['played'] == 0:
+        return None
+
+    if tournament.format_type == 'knockout':
+        alive = [s for s in standings if s['eliminated_round'] is None and s['played'] > 0]
+        if len(alive) == 1 and alive[0]['won'] > 0:
+            return alive[0]
+        return None
+
+    schedule_done = all(s['played'] >= len(standings) - 1 for s in standings)
+    if not schedule_done and tournament.status != 'completed':
+        return None
+
+    leader = standings[0]
+    if len(standings) > 1:
+        runner_up = standings[1]
+        if (leader['points'], leader['score_diff']) == (runner_up['points'], runner_up['score_diff']):
+            return None
+    return leader
+
+def rebuild_standings(tournament_id):
+    """Recompute a tournament's standings from all of its matches (caller commits)"""
+    Standing.query.filter_by(tournament_id=tournament_id).delete()
+    delta = StandingsDelta(tournament_id)
+    columns = (Match.team1_id, Match.team2_id, Match.round, Match.team1_score, Match.team2_score, Match.winner_id)
+    for row in db.session.query(*columns).filter(Match.tournament_id == tournament_id).yield_per(1000):
+        delta.add(row._asdict())
+    delta.apply()
+
+@click.command('rebuild-standings')
+@click.option('--tournament-id', type=int, help='Only rebuild this tournament')
+def rebuild_standings_command(tournament_id):
+    """Backfill or repair the standings table from stored matches"""
+    if tournament_id:
+        tournament_ids = [tournament_id]
+    else:
+        tournament_ids = [t_id for (t_id,) in db.session.query(Tournament.id)]
+    for t_id in tournament_ids:
+        rebuild_standings(t_id)
+        invalidate_tags(tournament_tag(t_id))
+        db.session.commit()
+    click.echo(f'Rebuilt standings for {len(tournament_ids)} tournament(s)')
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+API latency benchmark
+Seeds a database (or reuses one), then drives every route through the
+Flask test client and reports p50/p99 latency and SQL queries per request.
+The response cache is off by default so the database path is measured.
+
+Usage: python benchmarks/bench_api.py [--scale 0.05] [--requests 100] [--cache] [--output results.jsonl]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import harness
+import seed as seeder
+
+def read_routes(data, rng):
+    """(label, path factory) for every GET route"""
+    from backend.pagination import encode_cursor
+
+    # Cursor of the last pages (lists are newest first), to show paging deep costs the same
+    deep_cursor = encode_cursor(data['tournament_ids'][min(50, len(data['tournament_ids']) - 1)])
+    return [
+        ('GET admin/tournaments', lambda: '/api/admin/tournaments'),
+        ('GET admin/tournaments (last page)', lambda: f'/api/admin/tournaments?cursor={deep_cursor}'),
+        ('GET admin/tournaments?year=', lambda: f"/api/admin/tournaments?year={rng.randint(2020, 2025)}"),
+        ('GET admin/tournament/<id>', lambda: f"/api/admin/tournament/{rng.choice(data['tournament_ids'])}"),
+        ('GET tournament/available', lambda: '/api/tournament/available'),
+        ('GET tournament/<id>/teams', lambda: f"/api/tournament/{rng.choice(data['tournament_ids'])}/teams"),
+        ('GET tournament/<id>/standings', lambda: f"/api/tournament/{rng.choice(data['tournament_ids'])}/standings"),
+        ('GET winner/hall-of-champions', lambda: '/api/winner/hall-of-champions'),
+        ('GET winner/by-wallet/<address>', lambda: f"/api/winner/by-wallet/{rng.choice(data['wallets'])}"),
+        ('GET nft/winner/<id>', lambda: f"/api/nft/winner/{rng.choice(data['winner_ids'])}"),
+        ('GET player/<name>', lambda: f"/api/player/{rng.choice(data['players'])}"),
+        ('GET search?q=', lambda: f"/api/search?q={rng.choice(seeder.TEAM_NAMES)}")
+    ]
+
+def write_routes(data, rng):
+    """(label, request factory returning (path, json)) for the write routes"""
+    open_ids = list(data['open_tournament_ids'])
+    rng.shuffle(open_ids)
+    counter = iter(range(10 ** 9))
+
+    def register():
+        return '/api/tournament/register', {
+            'tournament_id': rng.choice(data['open_tournament_ids']),
+            'team_name': f'Bench Team {next(counter)}',
+            'player_names': ['A', 'B', 'C'],
+            'captain_wallet_address': rng.choice(data['wallets'])
+        }
+
+    def submit_results():
+        t_id = rng.choice(data['open_tournament_ids'])
+        team_ids = [team_id for team_id, _ in data['teams'][t_id]]
+        matches = []
+        for _ in range(10):
+            team1, team2 = rng.sample(team_ids, 2)
+            matches.append({'team1_id': team1, 'team2_id': team2, 'round': 1,
+                            'team1_score': rng.randint(0, 100), 'team2_score': rng.randint(0, 100)})
+        return '/api/winner/submit-results', {'tournament_id': t_id, 'matches': matches}
+
+    def declare_winner():
+        # Each declaration completes one open tournament
+        t_id = open_ids.pop()
+        return '/api/winner/declare-winner', {'tournament_id': t_id, 'team_id': data['teams'][t_id][0][0]}
+
+    return [
+        ('POST tournament/register', register),
+        ('POST winner/submit-results (10 matches)', submit_results),
+        ('POST winner/declare-winner', declare_winner)
+    ], len(open_ids)
+
+def measure(client, counter, label, send, requests, warmup):
+    for _ in range(warmup):
+        send()
+    latencies, queries = [], []
+    for _ in range(requests):
+        counter.reset()
+        start = time.perf_counter()
+        response = send()
+        latencies.append(time.perf_counter() - start)
+        queries.append(counter.count)
+        assert response.status_code < 400, (label, response.status_code, response.get_data(as_text=True)[:200])
+    return harness.summarize(latencies, queries)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    harness.add_common_arguments(parser)
+    parser.add_argument('--scale', type=float, default=0.05, help='Seed volume multiplier (1.0 = full volumes)')
+    parser.add_argument('--no-seed', action='store_true', help='Reuse an already seeded --database-url')
+    parser.add_argument('--requests', type=int, default=100, help='Measured requests per route')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--cache', action='store_true', help='Keep the in-process response cache on')
+    parser.add_argument('--no-writes', action='store_true', help='Only benchmark GET routes')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    database_url = harness.configure_environment(
+        args.database_url, CACHE_BACKEND='memory' if args.cache else 'none'
+    )
+    from backend.app import create_app, db
+    from backend.models import Team, TeamPlayer, Tournament, Winner
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    with app.app_context():
+        if args.no_seed:
+            teams = {}
+            for team_id, t_id, wallet in db.session.query(Team.id, Team.tournament_id, Team.captain_wallet_address):
+                teams.setdefault(t_id, []).append((team_id, wallet))
+            data = {
+                'tournament_ids': list(teams),
+                'open_tournament_ids': [t_id for (t_id,) in db.session.query(Tournament.id)
+                                        .filter(Tournament.status == 'open') if t_id in teams],
+                'winner_ids': [w_id for (w_id,) in db.session.query(Winner.id)],
+                'wallets': sorted({w for (w,) in db.session.query(Winner.wallet_address)}),
+                'teams': teams,
+                'players': [name for (name,) in db.session.query(TeamPlayer.name).distinct().limit(10000)]
+            }
+        else:
+            volumes = seeder.scaled_volumes(args.scale)
+            print(f'Seeding {volumes}')
+            data = seeder.seed(volumes, args.seed)
+        counter = harness.QueryCounter(db)
+
+    client = app.test_client()
+    results = {}
+    print(f"\n{'route':<42}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'queries':>9}")
+
+    def report(label, summary):
+        results[label] = summary
+        print(f"{label:<42}{summary['p50_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+              f"{summary['mean_ms']:>10.2f}{summary['queries']:>9.1f}")
+
+    for label, path in read_routes(data, rng):
+        report(label, measure(client, counter, label, lambda: client.get(path()), args.requests, args.warmup))
+
+    if not args.no_writes:
+        routes, open_count = write_routes(data, rng)
+        for label, build in routes:
+            requests = args.requests
+            warmup = args.warmup
+            if 'declare-winner' in label:
+                requests = min(requests, max(open_count - warmup, 0))
+                if requests == 0:
+                    continue
+
+            def send():
+                path, body = build()
+                return client.post(path, json=body)
+            report(label, measure(client, counter, label, send, requests, warmup))
+
+    harness.record_results(args.output, 'api', database_url,
+                           {'scale': args.scale, 'requests': args.requests, 'cache': args.cache}, results)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Badge rendering benchmark
+Declares winners through POST /api/winner/declare-winner, which starts
+each badge render in the process pool, then waits for every badge. Reports
+declare latency while renders run, badges rendered per second, cache-hit
+renders and GET /badges/<file>. Exits 1 if a badge fails to render, the
+files are not served as immutable, or declare p99 is over budget.
+
+Usage: python benchmarks/bench_badges.py [--winners 200] [--workers 2] [--size 1024] [--budget-ms 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import harness
+
+def seed_tournaments(count):
+    """One open tournament with one team per winner"""
+    from backend.app import db
+    from backend.bulk import chunked
+    from backend.models import Team, Tournament
+    from sqlalchemy import insert
+    import seed as seeder
+    import random
+
+    rng = random.Random(7)
+    for chunk in chunked(range(count)):
+        db.session.execute(insert(Tournament), [{
+            'name': f'Intramural {rng.choice(seeder.SPORTS)} League',
+            'tournament_name': f'{rng.choice(seeder.SEASONS)} {rng.choice(seeder.TROPHIES)}',
+            'format_type': 'knockout', 'month': 'June', 'year': 2024, 'badge_image_url': '',
+            'badge_metadata_url': '', 'status': 'open'
+        } for _ in chunk])
+    tournament_ids = [t_id for (t_id,) in db.session.query(Tournament.id).order_by(Tournament.id)]
+    db.session.execute(insert(Team), [{
+        'tournament_id': t_id, 'team_name': rng.choice(seeder.TEAM_NAMES),
+        'captain_wallet_address': seeder._wallet(rng)
+    } for t_id in tournament_ids])
+    db.session.commit()
+    return db.session.query(Team.tournament_id, Team.id).order_by(Team.tournament_id).all()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    harness.add_common_arguments(parser)
+    parser.add_argument('--winners', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=2, help='Render processes (BADGE_RENDER_WORKERS)')
+    parser.add_argument('--size', type=int, default=1024, help='Badge size in pixels (BADGE_RENDER_SIZE)')
+    parser.add_argument('--budget-ms', type=float, default=100, help='p99 budget for declare-winner while rendering')
+    args = parser.parse_args()
+
+    database_url = harness.configure_environment(
+        args.database_url,
+        BADGE_RENDER_ENABLED='true',
+        BADGE_RENDER_WORKERS=args.workers,
+        BADGE_RENDER_SIZE=args.size,
+        CACHE_BACKEND='none'
+    )
+    from backend.app import create_app
+    from backend.badge_render import badge_fields, badge_url, get_badge_renderer
+    from backend.models import Winner
+
+    app = create_app()
+    renderer = get_badge_renderer()
+    if renderer is None:
+        sys.exit('Badge rendering is unavailable (is Pillow installed?)')
+    with app.app_context():
+        teams = seed_tournaments(args.winners)
+    client = app.test_client()
+
+    # Declares return while the pool renders
+    start = time.perf_counter()
+    latencies = []
+    for tournament_id, team_id in teams:
+        call_start = time.perf_counter()
+        response = client.post('/api/winner/declare-winner', json={'tournament_id': tournament_id, 'team_id': team_id})
+        latencies.append(time.perf_counter() - call_start)
+        assert response.status_code == 200, response.get_json()
+    declared_s = time.perf_counter() - start
+
+    failures = []
+    with app.app_context():
+        jobs = [(w.tournament.badge_image_url, badge_fields(w)) for w in Winner.query.order_by(Winner.id)]
+    keys = []
+    for template_url, fields in jobs:
+        try:
+            keys.append(renderer.render(template_url, fields))
+        except Exception as e:
+            failures.append(f"badge #{fields['badge_serial_id']}: {e}")
+    rendered_s = time.perf_counter() - start
+
+    # Same inputs again: found in the disk cache
+    cached = []
+    for template_url, fields in jobs[:100]:
+        call_start = time.perf_counter()
+        renderer.render(template_url, fields)
+        cached.append(time.perf_counter() - call_start)
+
+    served = []
+    for key in keys[:100]:
+        call_start = time.perf_counter()
+        response = client.get(badge_url(key, renderer.thumbnail_sizes[-1], 'webp') if renderer.thumbnail_sizes
+                              else badge_url(key))
+        served.append(time.perf_counter() - call_start)
+        if response.status_code != 200 or 'immutable' not in response.headers.get('Cache-Control', ''):
+            failures.append(f'{key}: HTTP {response.status_code}, Cache-Control {response.headers.get("Cache-Control")}')
+
+    results = {
+        'declare': harness.summarize(latencies),
+        'declared_s': round(declared_s, 3),
+        'rendered_s': round(rendered_s, 3),
+        'badges_per_s': round(len(keys) / rendered_s, 2) if rendered_s else 0.0,
+        'cached_render': harness.summarize(cached),
+        'serve': harness.summarize(served)
+    }
+    print(f'{len(keys)} badges at {args.size}px with {args.workers} render processes')
+    for key, value in results.items():
+        print(f'  {key:<14} {value}')
+    harness.record_results(args.output, 'badges', database_url, vars(args), results)
+    renderer.close()
+
+    if results['declare']['p99_ms'] > args.budget_ms:
+        failures.append(f"declare-winner p99 {results['declare']['p99_ms']:.2f} ms over the {args.budget_ms:.0f} ms budget")
+    if failures:
+        for failure in failures[:20]:
+            print(f'FAIL: {failure}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+NFT holder index benchmark (offline, stand-in RPC)
+Mints winners into a stand-in JSON-RPC ledger (fake_rpc.py), runs a full
+holder indexing pass, transfers a share of the NFTs and runs an
+incremental pass. Reports pass time, RPC round trips and by-wallet
+latency, and fails (exit 1) if a wallet lookup disagrees with the ledger.
+
+Usage: python benchmarks/bench_holders.py [--winners 2000] [--transfer-share 0.1] [--requests 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import harness
+import fake_rpc
+import seed as seeder
+
+def mint_winners(ledger, winner_ids):
+    """Give every winner a minted NFT, held by its recipient in the ledger"""
+    from backend.app import db
+    from backend.models import Winner
+    from datetime import datetime
+    from sqlalchemy import update
+
+    now = datetime.utcnow()
+    db.session.execute(update(Winner), [{
+        'id': w_id, 'nft_token_id': fake_rpc._address(f'mint:{w_id}'),
+        'nft_signature': fake_rpc._address(f'signature:{w_id}'), 'minted_at': now
+    } for w_id in winner_ids])
+    db.session.commit()
+    for mint, owner, signature in db.session.query(Winner.nft_token_id, Winner.wallet_address, Winner.nft_signature):
+        ledger.mint(mint, owner, signature)
+
+def timed_pass(rpc):
+    from backend.holder_index import index_holders
+
+    requests, calls = rpc.requests, rpc.calls
+    start = time.perf_counter()
+    summary = index_holders()
+    elapsed = time.perf_counter() - start
+    return {**summary, 'seconds': round(elapsed, 3),
+            'rpc_requests': rpc.requests - requests, 'rpc_calls': rpc.calls - calls}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    harness.add_common_arguments(parser)
+    parser.add_argument('--winners', type=int, default=2000, help='Minted NFTs to index')
+    parser.add_argument('--transfer-share', type=float, default=0.1, help='Share of NFTs transferred between passes')
+    parser.add_argument('--requests', type=int, default=200, help='by-wallet lookups measured')
+    args = parser.parse_args()
+
+    ledger = fake_rpc.FakeLedger()
+    rpc = fake_rpc.FakeSolanaRPC(ledger)
+    server, endpoint = fake_rpc.serve(rpc)
+    database_url = harness.configure_environment(args.database_url, MINT_BACKEND='fake', CACHE_BACKEND='none',
+                                                 SOLANA_RPC_URL=endpoint, HOLDER_INDEX_BATCH=args.winners)
+    from backend.app import create_app, db
+    from bench_mint import seed_winners
+
+    app = create_app()
+    client = app.test_client()
+    rng = random.Random(11)
+    failures = []
+    with app.app_context():
+        counter = harness.QueryCounter(db)
+        winner_ids = seed_winners(args.winners)
+        mint_winners(ledger, winner_ids)
+
+        full = timed_pass(rpc)
+        mints = sorted(ledger.holders)
+        moved = {mint: seeder._wallet(rng) for mint in rng.sample(mints, int(len(mints) * args.transfer_share))}
+        for mint, wallet in moved.items():
+            ledger.transfer(mint, wallet)
+        incremental = timed_pass(rpc)
+        if incremental['transferred'] != len(moved):
+            failures.append(f"incremental pass found {incremental['transferred']} transfers, expected {len(moved)}")
+
+        from backend.models import Winner
+        winners = dict(db.session.query(Winner.nft_token_id, Winner.wallet_address))
+
+    latencies, queries = [], []
+    sample = rng.sample(sorted(moved), min(args.requests, len(moved)))
+    for mint in sample:
+        counter.reset()
+        start = time.perf_counter()
+        held = client.get(f'/api/winner/by-wallet/{moved[mint]}').get_json()['wins']
+        latencies.append(time.perf_counter() - start)
+        queries.append(counter.count)
+        if mint not in {win['nft_token_id'] for win in held}:
+            failures.append(f'{moved[mint]} does not list {mint}')
+        previous = client.get(f'/api/winner/by-wallet/{winners[mint]}').get_json()['wins']
+        if mint in {win['nft_token_id'] for win in previous}:
+            failures.append(f'{winners[mint]} still lists transferred {mint}')
+    server.shutdown()
+
+    lookup = harness.summarize(latencies, queries)
+    print(f"{'pass':<14}{'checked':>9}{'transfers':>11}{'seconds':>10}{'requests':>10}{'calls':>8}")
+    for label, summary in (('full', full), ('incremental', incremental)):
+        print(f"{label:<14}{summary['checked']:>9}{summary['transferred']:>11}{summary['seconds']:>10.3f}"
+              f"{summary['rpc_requests']:>10}{summary['rpc_calls']:>8}")
+    print(f"by-wallet: p50 {lookup['p50_ms']:.2f} ms, p99 {lookup['p99_ms']:.2f} ms, "
+          f"{lookup['queries']} queries per request")
+
+    harness.record_results(args.output, 'holders', database_url,
+                           {'winners': args.winners, 'transfer_share': args.transfer_share},
+                           {'full': full, 'incremental': incremental, 'by_wallet': lookup})
+    if failures:
+        for failure in failures[:20]:
+            print(f'FAIL: {failure}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Mint throughput benchmark (offline, fake mint backend)
+Runs mints through the simulated backend (MINT_BACKEND=fake) with a
+configurable latency and failure rate, and reports throughput, retries
+and per-job latency for either path:
+  - queue: jobs drained by the background worker pool, with retries
+  - batch: POST /api/nft/mint-batch over all unminted winners
+
+Usage: python benchmarks/bench_mint.py [--mode queue|batch] [--winners 500] [--latency 0.2] [--failure-rate 0.1]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import harness
+
+def seed_winners(count):
+    """One completed tournament, team and unminted winner per mint"""
+    from backend.app import db
+    from backend.bulk import chunked
+    from backend.models import Team, Tournament, Winner
+    from sqlalchemy import insert
+    import seed as seeder
+    import random
+
+    rng = random.Random(7)
+    for chunk in chunked(range(count)):
+        db.session.execute(insert(Tournament), [{
+            'name': f'Mint Bench {i}', 'tournament_name': f'Mint Bench {i}', 'format_type': 'knockout',
+            'month': 'June', 'year': 2024, 'badge_image_url': '', 'badge_metadata_url': '', 'status': 'completed'
+        } for i in chunk])
+    tournament_ids = [t_id for (t_id,) in db.session.query(Tournament.id).order_by(Tournament.id)]
+    db.session.execute(insert(Team), [{
+        'tournament_id': t_id, 'team_name': f'Champions {t_id}',
+        'captain_wallet_address': seeder._wallet(rng)
+    } for t_id in tournament_ids])
+    db.session.execute(insert(Winner), [{
+        'tournament_id': t_id, 'team_id': team_id, 'wallet_address': wallet
+    } for team_id, t_id, wallet in db.session.query(Team.id, Team.tournament_id, Team.captain_wallet_address)])
+    db.session.commit()
+    return [w_id for (w_id,) in db.session.query(Winner.id)]
+
+def run_queue(app, winner_ids, timeout):
+    from backend.app import db
+    from backend.mint_queue import enqueue_mint, notify_mint_queue
+    from backend.models import MintJob, Winner
+    from sqlalchemy import func
+
+    with app.app_context():
+        for winner in Winner.query.filter(Winner.id.in_(winner_ids)):
+            enqueue_mint(winner)
+        db.session.commit()
+    start = time.perf_counter()
+    notify_mint_queue()
+
+    while True:
+        with app.app_context():
+            open_jobs = MintJob.query.filter(MintJob.status.in_(('pending', 'running'))).count()
+        if open_jobs == 0 or time.perf_counter() - start > timeout:
+            break
+        time.sleep(0.2)
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        jobs = MintJob.query.all()
+        statuses = dict(db.session.query(MintJob.status, func.count(MintJob.id)).group_by(MintJob.status).all())
+        attempts = {}
+        for job in jobs:
+            attempts[job.attempts] = attempts.get(job.attempts, 0) + 1
+        latencies = [(job.updated_at - job.created_at).total_seconds() for job in jobs
+                     if job.status == 'succeeded' and job.updated_at and job.created_at]
+
+    succeeded = statuses.get('succeeded', 0)
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'mints_per_s': round(succeeded / elapsed, 2) if elapsed else 0.0,
+        'statuses': statuses,
+        'attempts': {str(k): v for k, v in sorted(attempts.items())},
+        'timed_out': open_jobs > 0,
+        'job_latency': harness.summarize(latencies)
+    }
+
+def run_batch(app, batch_max):
+    client = app.test_client()
+    latencies, minted, failed, calls = [], 0, 0, 0
+    start = time.perf_counter()
+    while True:
+        call_start = time.perf_counter()
+        response = client.post('/api/nft/mint-batch', json={'filter': 'unminted', 'limit': batch_max})
+        latencies.append(time.perf_counter() - call_start)
+        body = response.get_json()
+        assert response.status_code == 200, body
+        calls += 1
+        minted += body['minted']
+        failed += body['failed']
+        # Stop once a call mints nothing new (done, or only failing winners left)
+        if body['minted'] == 0:
+            break
+    elapsed = time.perf_counter() - start
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'mints_per_s': round(minted / elapsed, 2) if elapsed else 0.0,
+        'calls': calls,
+        'minted': minted,
+        'failed_attempts': failed,
+        'call_latency': harness.summarize(latencies)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    harness.add_common_arguments(parser)
+    parser.add_argument('--mode', choices=('queue', 'batch'), default='queue')
+    parser.add_argument('--winners', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.2, help='Mean simulated seconds per mint')
+    parser.add_argument('--failure-rate', type=float, default=0.1)
+    parser.add_argument('--workers', type=int, default=4, help='Queue worker threads (queue mode)')
+    parser.add_argument('--daemon-concurrency', type=int, default=4, help='Mints in flight in the fake daemon')
+    parser.add_argument('--batch-max', type=int, default=200, help='Winners per mint-batch call (batch mode)')
+    parser.add_argument('--max-attempts', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=600, help='Give up waiting for the queue after this many seconds')
+    parser.add_argument('--no-badges', action='store_true', help='Mint with the tournament badge instead of rendering one per winner')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    database_url = harness.configure_environment(
+        args.database_url,
+        MINT_BACKEND='fake',
+        MINT_FAKE_LATENCY=args.latency,
+        MINT_FAKE_FAILURE_RATE=args.failure_rate,
+        MINT_FAKE_SEED=args.seed,
+        MINT_DAEMON_CONCURRENCY=args.daemon_concurrency,
+        MINT_WORKER_CONCURRENCY=args.workers if args.mode == 'queue' else 0,
+        MINT_MAX_ATTEMPTS=args.max_attempts,
+        MINT_BATCH_MAX=args.batch_max,
+        # Retry quickly so the run measures the backend, not the backoff schedule
+        MINT_RETRY_BACKOFF=0,
+        MINT_POLL_INTERVAL=0.1,
+        BADGE_RENDER_ENABLED=not args.no_badges,
+        CACHE_BACKEND='none'
+    )
+    from backend.app import create_app
+    app = create_app()
+    with app.app_context():
+        winner_ids = seed_winners(args.winners)
+
+    print(f'{args.mode}: {len(winner_ids)} winners, latency {args.latency}s, failure rate {args.failure_rate:.0%}, '
+          f"badges {'off' if args.no_badges else 'rendered'}")
+    if args.mode == 'queue':
+        results = run_queue(app, winner_ids, args.timeout)
+    else:
+        results = run_batch(app, args.batch_max)
+    for key, value in results.items():
+        print(f'  {key:<16} {value}')
+
+    harness.record_results(args.output, f'mint-{args.mode}', database_url, vars(args), results)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Registration throughput benchmark
+Compares team registrations per second on one core for a password
+protected tournament:
+  - password, uncached (every request runs the KDF, the old behaviour)
+  - password, cached (repeat of a verified password skips the KDF)
+  - registration ticket (signed token, no KDF)
+
+Usage: python benchmarks/bench_registration.py [--requests 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--method', default=None, help='Werkzeug hash method for the tournament password')
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ['MINT_WORKER_CONCURRENCY'] = '0'
+
+    from backend.app import create_app
+    from backend import registration_auth
+
+    app = create_app()
+    client = app.test_client()
+    response = client.post('/api/admin/create-tournament', json={
+        'name': 'Benchmark Cup', 'tournament_name': 'Benchmark Cup', 'format_type': 'knockout',
+        'month': 'June', 'year': 2024, 'tournament_password': 'hunter2',
+        'password_hash_method': args.method
+    })
+    tournament_id = response.get_json()['tournament']['id']
+    ticket = client.post(f'/api/tournament/{tournament_id}/ticket',
+                         json={'tournament_password': 'hunter2'}).get_json()['registration_ticket']
+
+    def run(label, credentials, before_each=None):
+        start = time.perf_counter()
+        for i in range(args.requests):
+            if before_each:
+                before_each()
+            response = client.post('/api/tournament/register', json={
+                'tournament_id': tournament_id,
+                'team_name': f'{label} {i}',
+                'captain_wallet_address': '11111111111111111111111111111111',
+                **credentials
+            })
+            assert response.status_code == 201, response.get_json()
+        elapsed = time.perf_counter() - start
+        print(f'{label:<20} {args.requests / elapsed:10.1f} registrations/s  ({elapsed * 1000 / args.requests:.2f} ms each)')
+
+    run('password uncached', {'tournament_password': 'hunter2'}, registration_auth._verified.clear)
+    run('password cached', {'tournament_password': 'hunter2'})
+    run('ticket', {'registration_ticket': ticket})
+
+if __name__ == '__main__':
+    main()
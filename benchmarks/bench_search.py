@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Search benchmark
+Seeds tournaments, teams and rosters (or reuses a database), then measures
+GET /api/search for exact names, prefixes, typos and misses, plus the
+first search after a registration. Reports index build time and p50/p99
+per query kind, and fails (exit 1) if a team searched by its name (exact
+or with a typo) is not the top result, a new team is not found, or p99
+is over budget.
+
+Usage: python benchmarks/bench_search.py [--teams 100000] [--requests 200] [--budget-ms 10]
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import harness
+import seed as seeder
+
+def typo(name, rng):
+    """Transpose two letters inside the longest word of a name"""
+    words = name.split()
+    i = max(range(len(words)), key=lambda i: len(words[i]))
+    word = words[i]
+    if len(word) >= 6:
+        j = rng.randrange(2, len(word) - 3)
+        words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+    return ' '.join(words)
+
+def queries(team_names, players, rng):
+    """(label, query factory returning (query, expected top team name or None))"""
+    teams = sorted(team_names.values())
+
+    def exact_team():
+        name = rng.choice(teams)
+        return name, name
+
+    def typo_team():
+        name = rng.choice(teams)
+        return typo(name, rng), name
+
+    def tournament_prefix():
+        return f'{rng.choice(seeder.SEASONS)} {rng.choice(seeder.TROPHIES)[:-2]}', None
+
+    return [
+        ('exact team', exact_team),
+        ('typo team', typo_team),
+        ('tournament prefix', tournament_prefix),
+        ('player prefix', lambda: (rng.choice(players)[:-1], None)),
+        ('single common word', lambda: (rng.choice(seeder.MASCOTS).lower(), None)),
+        ('miss', lambda: (f'zzqx {rng.randrange(10 ** 6)}', None)),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    harness.add_common_arguments(parser)
+    parser.add_argument('--teams', type=int, default=100000, help='Teams seeded (20 per tournament, 5 players each)')
+    parser.add_argument('--no-seed', action='store_true', help='Reuse an already seeded --database-url')
+    parser.add_argument('--requests', type=int, default=200, help='Measured searches per query kind')
+    parser.add_argument('--budget-ms', type=float, default=10, help='p99 budget per query kind')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    database_url = harness.configure_environment(args.database_url, CACHE_BACKEND='none')
+    from backend.app import create_app, db
+    from backend.models import Team, TeamPlayer, Tournament
+    from sqlalchemy import func
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    with app.app_context():
+        if args.no_seed:
+            data = {
+                'open_tournament_ids': [t_id for (t_id,) in db.session.query(Tournament.id)
+                                        .filter(Tournament.status == 'open')],
+                'players': [name for (name,) in db.session.query(TeamPlayer.name).distinct().limit(10000)]
+            }
+        else:
+            n_tournaments = max(1, args.teams // 20)
+            volumes = {'tournaments': n_tournaments, 'teams': args.teams, 'matches': n_tournaments,
+                       'winners': n_tournaments // 2}
+            print(f'Seeding {volumes}')
+            data = seeder.seed(volumes, args.seed)
+        max_id = db.session.query(func.max(Team.id)).scalar()
+        sample = rng.sample(range(1, max_id + 1), min(1000, max_id))
+        team_names = dict(db.session.query(Team.id, Team.team_name).filter(Team.id.in_(sample)))
+        counter = harness.QueryCounter(db)
+
+    client = app.test_client()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    client.get('/api/search?q=warmup')
+    build_seconds = time.perf_counter() - start
+    rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    print(f'First search (index build on SQLite): {build_seconds:.2f}s, +{rss_mb:.0f} MB peak RSS')
+
+    results, failures = {}, []
+    print(f"\n{'query':<22}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'queries':>9}")
+    for label, build in queries(team_names, data['players'], rng):
+        latencies, counts = [], []
+        for _ in range(args.requests):
+            query, expected = build()
+            counter.reset()
+            start = time.perf_counter()
+            response = client.get('/api/search', query_string={'q': query})
+            latencies.append(time.perf_counter() - start)
+            counts.append(counter.count)
+            if response.status_code != 200:
+                failures.append(f'{label} {query!r}: HTTP {response.status_code}')
+            elif expected is not None:
+                found = [team['team_name'] for team in response.get_json()['teams']]
+                if found[:1] != [expected]:
+                    failures.append(f'{label} {query!r}: expected {expected!r} first (got {found[:3]})')
+        summary = results[label] = harness.summarize(latencies, counts)
+        print(f"{label:<22}{summary['p50_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+              f"{summary['mean_ms']:>10.2f}{summary['queries']:>9.1f}")
+        if summary['p99_ms'] > args.budget_ms:
+            failures.append(f"{label}: p99 {summary['p99_ms']:.2f} ms over the {args.budget_ms:.0f} ms budget")
+
+    # A registration is searchable on the next request
+    name = f'Bench Search Team {rng.randrange(10 ** 6)}'
+    client.post('/api/tournament/register', json={
+        'tournament_id': rng.choice(data['open_tournament_ids']), 'team_name': name,
+        'player_names': ['Bench Player'], 'captain_wallet_address': seeder._wallet(rng)
+    })
+    start = time.perf_counter()
+    found = client.get('/api/search', query_string={'q': name, 'type': 'teams'}).get_json()['teams']
+    results['after write'] = {'ms': round((time.perf_counter() - start) * 1000, 3)}
+    print(f"{'after write':<22}{results['after write']['ms']:>10.2f}")
+    if not found or found[0]['team_name'] != name:
+        failures.append(f'new team {name!r} not found after registering it')
+
+    harness.record_results(args.output, 'search', database_url,
+                           {'teams': args.teams, 'requests': args.requests},
+                           {'build_seconds': round(build_seconds, 3), 'queries': results})
+    if failures:
+        for failure in failures[:20]:
+            print(f'FAIL: {failure}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
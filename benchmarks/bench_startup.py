@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Cold start benchmark
+Starts fresh interpreters and times importing the app, create_app() in
+each DB_SCHEMA_MODE, the first request and building the minting service.
+Fails (exit 1) when import + create_app in check mode exceeds the
+budget, or when booting imports modules that belong to the mint path.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 800]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import harness
+
+# Only the mint path (or the flask CLI) may import these
+LAZY_MODULES = ('solana', 'solders', 'base58', 'requests', 'alembic', 'flask_migrate')
+
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+import backend.app
+imported = time.perf_counter()
+app = backend.app.create_app()
+created = time.perf_counter()
+loaded = sorted(m for m in {lazy!r} if m in sys.modules)
+response = app.test_client().get('/api/tournament/available')
+first_request = time.perf_counter()
+from backend.solana_service import get_solana_service
+get_solana_service()
+service = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (first_request - created) * 1000,
+    'solana_service_ms': (service - first_request) * 1000,
+    'status': response.status_code,
+    'loaded': loaded
+}}))
+'''
+
+def run_child(env):
+    output = subprocess.check_output([sys.executable, '-c', CHILD.format(lazy=LAZY_MODULES)],
+                                     cwd=harness.ROOT, env=env)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+def prepare_database():
+    """Build and stamp the schema once, so check mode sees the head revision"""
+    from backend.app import create_app, db
+    from backend.schema import MIGRATIONS_DIRECTORY
+    from flask_migrate import Migrate, stamp
+
+    app = create_app()
+    Migrate(app, db, directory=MIGRATIONS_DIRECTORY)
+    with app.app_context():
+        stamp()
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    harness.add_common_arguments(parser)
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per schema mode')
+    parser.add_argument('--budget-ms', type=float, default=800,
+                        help='Median import + create_app budget in check mode')
+    args = parser.parse_args()
+
+    database_url = harness.configure_environment(args.database_url, MINT_BACKEND='fake', CACHE_BACKEND='none')
+    prepare_database()
+
+    results = {}
+    print(f"{'mode':<8}{'import':>10}{'create_app':>12}{'first req':>11}{'service':>10}   loaded at boot")
+    for mode in ('create', 'check', 'skip'):
+        env = dict(os.environ, DB_SCHEMA_MODE=mode, MINT_PREWARM='false', PYTHONPATH=harness.ROOT)
+        runs = [run_child(env) for _ in range(args.runs)]
+        summary = {key: round(median([run[key] for run in runs]), 2)
+                   for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'solana_service_ms')}
+        summary['boot_ms'] = round(median([run['import_ms'] + run['create_app_ms'] for run in runs]), 2)
+        summary['loaded'] = sorted({module for run in runs for module in run['loaded']})
+        results[mode] = summary
+        print(f"{mode:<8}{summary['import_ms']:>10.1f}{summary['create_app_ms']:>12.1f}"
+              f"{summary['first_request_ms']:>11.1f}{summary['solana_service_ms']:>10.1f}   "
+              f"{', '.join(summary['loaded']) or '-'}")
+
+    boot_ms = results['check']['boot_ms']
+    failures = []
+    if boot_ms > args.budget_ms:
+        failures.append(f'boot took {boot_ms:.0f} ms in check mode, budget is {args.budget_ms:.0f} ms')
+    for mode, summary in results.items():
+        if summary['loaded']:
+            failures.append(f"{mode} mode imported {', '.join(summary['loaded'])} at boot")
+
+    harness.record_results(args.output, 'startup', database_url,
+                           {'runs': args.runs, 'budget_ms': args.budget_ms}, results)
+    if failures:
+        for failure in failures:
+            print(f'FAIL: {failure}')
+        sys.exit(1)
+    print(f'OK: boot {boot_ms:.0f} ms in check mode (budget {args.budget_ms:.0f} ms)')
+
+if __name__ == '__main__':
+    main()
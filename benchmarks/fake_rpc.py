@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+"""
+Stand-in Solana JSON-RPC server
+Serves the read calls the backend makes (getMultipleAccounts,
+getTokenLargestAccounts, getSignatureStatuses, getSlot) from an in-memory
+ledger of NFT mints, so the holder indexer and mint reconciliation can run
+without a validator. Batch requests, minContextSlot and unknown mints
+behave like a real node.
+
+Run standalone to serve the minted winners of a database:
+    python benchmarks/fake_rpc.py --database-url sqlite:///app.db --port 8899
+    SOLANA_RPC_URL=http://127.0.0.1:8899 flask --app run.py index-holders
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import harness
+
+TOKEN_PROGRAM = 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA'
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+def _address(seed):
+    digest = hashlib.sha256(seed.encode()).digest() * 2
+    return ''.join(BASE58_ALPHABET[b % 58] for b in digest[:44])
+
+class FakeLedger:
+    """Token accounts of NFT mints, one holder each, and a slot that advances on every change"""
+
+    def __init__(self, slot=1000):
+        self.slot = slot
+        self.accounts = {}  # token account -> {'mint', 'owner', 'amount'}
+        self.holders = {}  # mint -> token account holding it
+        self.mint_accounts = {}  # mint -> every token account of the mint
+        self.signatures = set()
+        self._lock = threading.Lock()
+
+    def mint(self, mint, owner, signature=None):
+        with self._lock:
+            self.slot += 1
+            account = _address(f'{mint}:{owner}')
+            self.accounts[account] = {'mint': mint, 'owner': owner, 'amount': 1}
+            self.holders[mint] = account
+            self.mint_accounts[mint] = [account]
+            if signature:
+                self.signatures.add(signature)
+            return account
+
+    def transfer(self, mint, new_owner):
+        """Move the NFT to the new owner's token account, leaving the old one empty"""
+        with self._lock:
+            self.slot += 1
+            self.accounts[self.holders[mint]]['amount'] = 0
+            account = _address(f'{mint}:{new_owner}')
+            self.accounts[account] = {'mint': mint, 'owner': new_owner, 'amount': 1}
+            self.holders[mint] = account
+            if account not in self.mint_accounts[mint]:
+                self.mint_accounts[mint].append(account)
+            return account
+
+    def burn(self, mint):
+        """Burn the NFT and close its token account"""
+        with self._lock:
+            self.slot += 1
+            account = self.holders.pop(mint)
+            self.accounts.pop(account, None)
+            self.mint_accounts[mint].remove(account)
+
+    def owner_of(self, mint):
+        with self._lock:
+            account = self.holders.get(mint)
+            return self.accounts[account]['owner'] if account else None
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class FakeSolanaRPC:
+    """JSON-RPC handlers over a FakeLedger, with request and call counters"""
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.requests = 0
+        self.calls = 0
+
+    def handle(self, payload):
+        self.requests += 1
+        if isinstance(payload, list):
+            return [self._reply(call) for call in payload]
+        return self._reply(payload)
+
+    def _reply(self, call):
+        self.calls += 1
+        try:
+            handler = getattr(self, f"rpc_{call.get('method')}", None)
+            if handler is None:
+                raise RPCError(-32601, 'Method not found')
+            return {'jsonrpc': '2.0', 'id': call.get('id'), 'result': handler(*call.get('params', []))}
+        except RPCError as e:
+            return {'jsonrpc': '2.0', 'id': call.get('id'), 'error': {'code': e.code, 'message': e.message}}
+
+    def _context(self, options):
+        slot = self.ledger.slot
+        min_slot = (options or {}).get('minContextSlot')
+        if min_slot and min_slot > slot:
+            raise RPCError(-32016, 'Minimum context slot has not been reached')
+        return {'slot': slot}
+
+    def _parsed_account(self, address):
+        if address in self.ledger.mint_accounts:
+            return self._parsed_mint(address)
+        account = self.ledger.accounts.get(address)
+        if account is None:
+            return None
+        amount = str(account['amount'])
+        return {
+            'data': {
+                'parsed': {
+                    'info': {
+                        'isNative': False, 'mint': account['mint'], 'owner': account['owner'],
+                        'state': 'initialized',
+                        'tokenAmount': {'amount': amount, 'decimals': 0, 'uiAmount': float(amount),
+                                        'uiAmountString': amount}
+                    },
+                    'type': 'account'
+                },
+                'program': 'spl-token',
+                'space': 165
+            },
+            'executable': False, 'lamports': 2039280, 'owner': TOKEN_PROGRAM, 'rentEpoch': 0, 'space': 165
+        }
+
+    def _parsed_mint(self, mint):
+        supply = '1' if mint in self.ledger.holders else '0'
+        return {
+            'data': {
+                'parsed': {
+                    'info': {'decimals': 0, 'freezeAuthority': None, 'isInitialized': True,
+                             'mintAuthority': None, 'supply': supply},
+                    'type': 'mint'
+                },
+                'program': 'spl-token',
+                'space': 82
+            },
+            'executable': False, 'lamports': 1461600, 'owner': TOKEN_PROGRAM, 'rentEpoch': 0, 'space': 82
+        }
+
+    def rpc_getSlot(self, options=None):
+        return self._context(options)['slot']
+
+    def rpc_getMultipleAccounts(self, addresses, options=None):
+        if len(addresses) > 100:
+            raise RPCError(-32602, 'Too many inputs provided; max 100')
+        return {'context': self._context(options), 'value': [self._parsed_account(a) for a in addresses]}
+
+    def rpc_getTokenLargestAccounts(self, mint, options=None):
+        context = self._context(options)
+        if mint not in self.ledger.mint_accounts:
+            raise RPCError(-32602, 'Invalid param: could not find mint')
+        holdings = []
+        for address in self.ledger.mint_accounts[mint]:
+            amount = self.ledger.accounts[address]['amount']
+            holdings.append({'address': address, 'amount': str(amount), 'decimals': 0,
+                             'uiAmount': float(amount), 'uiAmountString': str(amount)})
+        return {'context': context, 'value': sorted(holdings, key=lambda h: -int(h['amount']))}
+
+    def rpc_getSignatureStatuses(self, signatures, options=None):
+        if len(signatures) > 256:
+            raise RPCError(-32602, 'Too many inputs provided; max 256')
+        slot = self.ledger.slot
+        return {'context': {'slot': slot}, 'value': [
+            {'slot': slot, 'confirmations': None, 'err': None, 'confirmationStatus': 'finalized'}
+            if signature in self.ledger.signatures else None
+            for signature in signatures
+        ]}
+
+def serve(rpc, host='127.0.0.1', port=0):
+    """
+    Serve a FakeSolanaRPC over HTTP in a daemon thread
+
+    Returns:
+        tuple: (server, endpoint URL); call server.shutdown() to stop it
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            body = json.dumps(rpc.handle(payload)).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, name='fake-rpc', daemon=True)
+    thread.start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+def ledger_from_database():
+    """A ledger holding every minted winner's NFT in its recipient's wallet"""
+    from backend.app import create_app, db
+    from backend.models import Winner
+
+    ledger = FakeLedger()
+    with create_app().app_context():
+        for mint, owner, signature in db.session.query(Winner.nft_token_id, Winner.wallet_address,
+                                                       Winner.nft_signature).filter(Winner.nft_token_id.isnot(None)):
+            ledger.mint(mint, owner, signature)
+    return ledger
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url', help='Serve the minted winners of this database (default: empty ledger)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8899)
+    args = parser.parse_args()
+
+    if args.database_url:
+        harness.configure_environment(args.database_url, DB_SCHEMA_MODE='skip')
+        ledger = ledger_from_database()
+    else:
+        ledger = FakeLedger()
+    server, endpoint = serve(FakeSolanaRPC(ledger), args.host, args.port)
+    print(f'Serving {len(ledger.holders)} mint(s) at {endpoint}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
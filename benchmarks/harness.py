@@ -0,0 +1,104 @@
+"""
+Benchmark harness
+Shared setup for the benchmark scripts: a throwaway database, query
+counting, latency percentiles and a JSON-lines results log so runs can
+be compared over time.
+"""
+from datetime import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def configure_environment(database_url=None, **overrides):
+    """
+    Point the app at a benchmark database before create_app() runs
+
+    Background work (mint workers, reconciliation, holder indexing, pre-warm
+    and the search index build) is off unless overridden, tables are created
+    on boot, and rendered badges go to a temporary directory.
+
+    Returns:
+        str: The database URL in use
+    """
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('MINT_WORKER_CONCURRENCY', '0')
+    os.environ.setdefault('MINT_RECONCILE_INTERVAL', '0')
+    os.environ.setdefault('HOLDER_INDEX_INTERVAL', '0')
+    os.environ.setdefault('MINT_PREWARM', 'false')
+    os.environ.setdefault('SEARCH_PREWARM', 'false')
+    os.environ.setdefault('DB_SCHEMA_MODE', 'create')
+    os.environ.setdefault('BADGE_RENDER_DIR', tempfile.mkdtemp(prefix='badges-'))
+    for key, value in overrides.items():
+        os.environ[key] = str(value)
+    return database_url
+
+def add_common_arguments(parser):
+    parser.add_argument('--database-url', help='Benchmark database (default: a temporary SQLite file)')
+    parser.add_argument('--output', help='Append results as one JSON line to this file')
+
+class QueryCounter:
+    """Counts SQL statements executed on every engine of the app"""
+
+    def __init__(self, db):
+        from sqlalchemy import event
+        self.count = 0
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(latencies, queries=None):
+    """
+    Returns:
+        dict: count, p50/p99/mean in milliseconds and mean queries per request
+    """
+    summary = {
+        'count': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0
+    }
+    if queries is not None:
+        summary['queries'] = round(sum(queries) / len(queries), 2) if queries else 0.0
+    return summary
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def record_results(path, benchmark, database_url, parameters, results):
+    """Append one run to a JSON-lines file for tracking over time"""
+    if not path:
+        return
+    record = {
+        'benchmark': benchmark,
+        'timestamp': datetime.utcnow().isoformat(),
+        'commit': git_commit(),
+        'database': database_url.split(':', 1)[0],
+        'parameters': parameters,
+        'results': results
+    }
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+"""
+Seed a database with realistic volumes
+Tournaments, teams with rosters, matches (with standings), winners and mint jobs,
+generated from a fixed random seed so runs are comparable.
+
+Winners are capped at one per tournament (winners.tournament_id is
+unique), and a share of tournaments is left open for registration.
+
+Usage: python benchmarks/seed.py --database-url postgresql://localhost/tokenchamp_bench [--scale 0.1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import harness
+
+DEFAULT_VOLUMES = {'tournaments': 10000, 'teams': 200000, 'matches': 1000000, 'winners': 50000}
+PLAYERS_PER_TEAM = 5
+OPEN_SHARE = 0.2  # tournaments left open (no winner yet)
+MINTED_SHARE = 0.9  # winners that already have an NFT
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+# Names are drawn from word lists so search sees a realistic vocabulary
+SPORTS = ['Basketball', 'Soccer', 'Volleyball', 'Softball', 'Ultimate', 'Badminton', 'Hockey', 'Esports']
+SEASONS = ['Spring', 'Summer', 'Autumn', 'Winter', 'Midseason', 'Homecoming', 'Founders', 'Alumni']
+TROPHIES = ['Cup', 'Classic', 'Invitational', 'Open', 'Championship', 'Showdown', 'Series', 'Shield']
+ADJECTIVES = ['Crimson', 'Golden', 'Silver', 'Midnight', 'Thunder', 'Iron', 'Electric', 'Wild', 'Rapid', 'Mighty',
+              'Blazing', 'Frozen', 'Shadow', 'Royal', 'Savage', 'Lucky', 'Atomic', 'Cosmic', 'Emerald', 'Scarlet',
+              'Stormy', 'Rogue', 'Fearless', 'Velvet', 'Sonic', 'Rocky', 'Coastal', 'Northern', 'Southern',
+              'Eastern', 'Western', 'Hidden']
+MASCOTS = ['Falcons', 'Hawks', 'Wolves', 'Tigers', 'Dragons', 'Sharks', 'Bears', 'Panthers', 'Vipers', 'Ravens',
+           'Comets', 'Rockets', 'Titans', 'Knights', 'Pirates', 'Spartans', 'Owls', 'Foxes', 'Bulls', 'Stallions',
+           'Hornets', 'Cobras', 'Lynx', 'Mustangs', 'Phoenix', 'Raptors', 'Jaguars', 'Giants', 'Rangers',
+           'Warriors', 'Badgers', 'Otters']
+TEAM_NAMES = [f'{adjective} {mascot}' for adjective in ADJECTIVES for mascot in MASCOTS]
+FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn', 'Rowan',
+               'Priya', 'Mateo', 'Aisha', 'Kenji', 'Sofia', 'Liam', 'Noor', 'Diego', 'Mei', 'Omar',
+               'Elena', 'Kwame', 'Hana', 'Lucas', 'Zara', 'Ivan', 'Amara', 'Felix', 'Leila', 'Tomas']
+LAST_NAMES = ['Kim', 'Garcia', 'Nguyen', 'Smith', 'Patel', 'Okafor', 'Rossi', 'Novak', 'Silva', 'Cohen',
+              'Tanaka', 'Haddad', 'Murphy', 'Larsen', 'Mendez', 'Chen', 'Kowalski', 'Adeyemi', 'Dubois', 'Singh',
+              'Moreau', 'Schmidt', 'Alvarez', 'Yamamoto', 'Osei', 'Petrov', 'Lindqvist', 'Reyes', 'Byrne', 'Sato']
+
+def scaled_volumes(scale):
+    return {name: max(1, int(count * scale)) for name, count in DEFAULT_VOLUMES.items()}
+
+def _wallet(rng):
+    return ''.join(rng.choice(BASE58_ALPHABET) for _ in range(44))
+
+def seed(volumes, random_seed=42, log=print):
+    """
+    Insert the given volumes into the app's (empty) database
+
+    Must run inside an app context.
+
+    Returns:
+        dict: IDs and wallets the benchmarks sample from
+    """
+    from backend.app import db
+    from backend.bulk import chunked
+    from backend.models import MintJob, Match, Standing, Team, TeamPlayer, Tournament, Winner, player_key
+    from backend.standings import StandingsDelta
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+
+    if db.session.query(Tournament.id).first() is not None:
+        raise SystemExit('Database already has tournaments; seed an empty database')
+
+    rng = random.Random(random_seed)
+    now = datetime.utcnow()
+    n_tournaments = volumes['tournaments']
+    teams_per_tournament = max(2, volumes['teams'] // n_tournaments)
+    matches_per_tournament = max(1, volumes['matches'] // n_tournaments)
+    n_winners = min(volumes['winners'], int(n_tournaments * (1 - OPEN_SHARE)))
+    wallets = [_wallet(rng) for _ in range(max(1, n_winners // 3))]
+    # Each player appears on about PLAYERS_PER_TEAM teams; names repeat with a number once the lists run out
+    full_names = [f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES]
+    players = [full_names[i % len(full_names)] + (f' {i // len(full_names) + 1}' if i >= len(full_names) else '')
+               for i in range(max(1, volumes['teams']))]
+
+    start = time.perf_counter()
+    tournament_rows = [{
+        'name': f'Intramural {SPORTS[i % len(SPORTS)]} League',
+        'tournament_name': f'{SEASONS[i // len(SPORTS) % len(SEASONS)]} {TROPHIES[i // 64 % len(TROPHIES)]}',
+        'format_type': 'round-robin' if i % 3 else 'knockout',
+        'month': MONTHS[i % 12],
+        'year': 2020 + i % 6,
+        'badge_image_url': '',
+        'badge_metadata_url': '',
+        'status': 'completed' if i < n_winners else 'open',
+        'created_at': now - timedelta(minutes=n_tournaments - i)
+    } for i in range(n_tournaments)]
+    for chunk in chunked(tournament_rows):
+        db.session.execute(insert(Tournament), chunk)
+    tournament_ids = [t_id for (t_id,) in db.session.query(Tournament.id).order_by(Tournament.id)]
+    log(f'  tournaments: {len(tournament_ids)}')
+
+    def team_rows():
+        for t_id in tournament_ids:
+            # Unique within the tournament
+            names = rng.sample(TEAM_NAMES, min(teams_per_tournament, len(TEAM_NAMES)))
+            for j in range(teams_per_tournament):
+                yield {
+                    'tournament_id': t_id,
+                    'team_name': names[j % len(names)] + (f' {j // len(names) + 1}' if j >= len(names) else ''),
+                    'captain_wallet_address': rng.choice(wallets),
+                    'registered_at': now
+                }
+    for chunk in chunked(team_rows()):
+        db.session.execute(insert(Team), chunk)
+    teams = {}
+    for team_id, t_id, wallet in db.session.query(Team.id, Team.tournament_id, Team.captain_wallet_address) \
+            .order_by(Team.id):
+        teams.setdefault(t_id, []).append((team_id, wallet))
+    log(f'  teams: {sum(len(t) for t in teams.values())}')
+
+    rostered = set()  # names actually on a roster; the pool may hold more
+    def player_rows():
+        for team_id, _ in (team for t in teams.values() for team in t):
+            for position, name in enumerate(rng.sample(players, min(PLAYERS_PER_TEAM, len(players)))):
+                rostered.add(name)
+                yield {'team_id': team_id, 'position': position, 'name': name, 'name_key': player_key(name)}
+    for chunk in chunked(player_rows()):
+        db.session.execute(insert(TeamPlayer), chunk)
+    log(f'  team players: {sum(len(t) for t in teams.values()) * min(PLAYERS_PER_TEAM, len(players))}')
+
+    # Matches and standings, one tournament at a time to keep memory flat
+    champions = {}
+    match_buffer, standing_buffer, n_matches = [], [], 0
+    for t_index, t_id in enumerate(tournament_ids):
+        team_ids = [team_id for team_id, _ in teams[t_id]]
+        delta = StandingsDelta(t_id)
+        for m in range(matches_per_tournament):
+            team1, team2 = rng.sample(team_ids, 2)
+            score1, score2 = rng.randint(0, 100), rng.randint(0, 100)
+            row = {
+                'tournament_id': t_id, 'team1_id': team1, 'team2_id': team2,
+                'round': 1 + m * 5 // matches_per_tournament,
+                'team1_score': score1, 'team2_score': score2,
+                'winner_id': team1 if score1 > score2 else team2 if score2 > score1 else None,
+                'played_at': now
+            }
+            delta.add(row)
+            match_buffer.append(row)
+        for team_id, stats in delta.teams.items():
+            standing_buffer.append({
+                'tournament_id': t_id, 'team_id': team_id, 'played': stats['played'], 'won': stats['won'],
+                'drawn': stats['drawn'], 'lost': stats['lost'], 'points': stats['points'],
+                'score_for': stats['score_for'], 'score_against': stats['score_against'],
+                'last_round_won': stats['round_won'], 'eliminated_round': stats['eliminated_round']
+            })
+        if t_index < n_winners:
+            champions[t_id] = max(delta.teams.items(), key=lambda item: item[1]['points'])[0]
+        if len(match_buffer) >= 10000:
+            db.session.execute(insert(Match), match_buffer)
+            db.session.execute(insert(Standing.__table__), standing_buffer)
+            n_matches += len(match_buffer)
+            match_buffer, standing_buffer = [], []
+    if match_buffer:
+        db.session.execute(insert(Match), match_buffer)
+        n_matches += len(match_buffer)
+    if standing_buffer:
+        db.session.execute(insert(Standing.__table__), standing_buffer)
+    log(f'  matches: {n_matches}')
+
+    wallet_by_team = {team_id: wallet for t in teams.values() for team_id, wallet in t}
+    winner_rows = []
+    for i, (t_id, team_id) in enumerate(champions.items()):
+        minted = rng.random() < MINTED_SHARE
+        winner_rows.append({
+            'tournament_id': t_id, 'team_id': team_id, 'wallet_address': wallet_by_team[team_id],
+            'nft_token_id': _wallet(rng) if minted else None,
+            'nft_metadata_uri': f'https://arweave.net/seed-{i}' if minted else None,
+            'minted_at': now if minted else None,
+            'created_at': now - timedelta(minutes=len(champions) - i)
+        })
+    for chunk in chunked(winner_rows):
+        db.session.execute(insert(Winner), chunk)
+    job_rows = [{
+        'winner_id': w_id, 'status': 'succeeded' if token else 'failed', 'attempts': 1, 'max_attempts': 5,
+        'available_at': now, 'last_error': None if token else 'Seeded failure', 'created_at': now, 'updated_at': now
+    } for w_id, token in db.session.query(Winner.id, Winner.nft_token_id)]
+    for chunk in chunked(job_rows):
+        db.session.execute(insert(MintJob), chunk)
+    db.session.commit()
+    log(f'  winners: {len(winner_rows)}')
+    log(f'Seeded in {time.perf_counter() - start:.1f}s')
+
+    return {
+        'tournament_ids': tournament_ids,
+        'open_tournament_ids': tournament_ids[n_winners:],
+        'winner_ids': [w_id for (w_id,) in db.session.query(Winner.id)],
+        'wallets': wallets,
+        'teams': teams,
+        'players': sorted(rostered)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    harness.add_common_arguments(parser)
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for the default volumes')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    database_url = harness.configure_environment(args.database_url)
+    from backend.app import create_app
+    app = create_app()
+    volumes = scaled_volumes(args.scale)
+    print(f'Seeding {database_url} with {volumes}')
+    with app.app_context():
+        seed(volumes, args.seed)
+
+if __name__ == '__main__':
+    main()
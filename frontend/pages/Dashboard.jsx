@@ -1,12 +1,14 @@
-import React, { useState } from 'react'
+import React, { useEffect, useState } from 'react'
 import ClickSparkShim from '../shared/ClickSparkShim'
-import { winnerAPI } from '../services/api'
+import { badgeImageUrl, eventsAPI, winnerAPI } from '../services/api'
 
 function Dashboard() {
   const [walletAddress, setWalletAddress] = useState('')
   const [wins, setWins] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(false)
   const [walletConnected, setWalletConnected] = useState(false)
+  const [watchedWallet, setWatchedWallet] = useState('')
 
   const maskWalletAddress = (addr) => {
     if (!addr) return ''
@@ -25,19 +27,43 @@ function Dashboard() {
   // Check if Phantom is installed
   const isPhantomInstalled = typeof window !== 'undefined' && window.solana && window.solana.isPhantom
 
-  const fetchWins = async (address) => {
-    setLoading(true)
+  const fetchWins = async (address, { quiet = false } = {}) => {
+    if (!quiet) setLoading(true)
     try {
       const response = await winnerAPI.getWinsByWallet(address)
       setWins(response.data.wins)
+      setNextCursor(response.data.next_cursor)
+      setWatchedWallet(address)
     } catch (error) {
       console.error('Error fetching wins:', error)
       setWins([])
+      setNextCursor(null)
     } finally {
-      setLoading(false)
+      if (!quiet) setLoading(false)
     }
   }
 
+  const loadMoreWins = async () => {
+    try {
+      const response = await winnerAPI.getWinsByWallet(watchedWallet, { cursor: nextCursor })
+      setWins(current => [...current, ...response.data.wins])
+      setNextCursor(response.data.next_cursor)
+    } catch (error) {
+      console.error('Error fetching wins:', error)
+    }
+  }
+
+  // Refresh when a new win or a finished mint is pushed for this wallet
+  useEffect(() => {
+    if (!watchedWallet) return undefined
+    const source = eventsAPI.subscribe({ wallet: watchedWallet }, (type) => {
+      if (type === 'winner_declared' || type === 'mint_succeeded') {
+        fetchWins(watchedWallet, { quiet: true })
+      }
+    })
+    return () => source.close()
+  }, [watchedWallet])
+
   const connectPhantom = async () => {
     try {
       const response = await window.solana.connect()
@@ -131,8 +157,8 @@ function Dashboard() {
               t.style.setProperty('--mx', (e.clientX - r.left) + 'px');
               t.style.setProperty('--my', (e.clientY - r.top) + 'px');
             }}>
-              {win.badge_image_url && (
-                <img src={win.badge_image_url} alt="Badge" className="champion-badge" />
+              {badgeImageUrl(win) && (
+                <img src={badgeImageUrl(win, 256)} alt="Badge" className="champion-badge" />
               )}
               <h3>{win.team_name}</h3>
               <p><strong>Tournament:</strong> {win.tournament_name}</p>
@@ -158,6 +184,11 @@ function Dashboard() {
           ))}
         </div>
       )}
+      {!loading && nextCursor && (
+        <button type="button" className="btn btn-secondary" onClick={loadMoreWins} style={{ marginTop: '1rem' }}>
+          Load more
+        </button>
+      )}
       </div>
     </div>
   )
@@ -2,10 +2,11 @@ import React, { useEffect, useState } from 'react'
 import ClickSparkShim from '../shared/ClickSparkShim'
 import { CardBody, CardContainer, CardItem } from '../shared/ui/3d-card'
 import InfiniteMenu from '../shared/InfiniteMenu'
-import { winnerAPI } from '../services/api'
+import { badgeImageUrl, winnerAPI } from '../services/api'
 
 function HallOfChampions() {
   const [winners, setWinners] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
 
   // Load gallery images to use for all champion visuals
@@ -28,6 +29,7 @@ function HallOfChampions() {
       setLoading(true)
       const response = await winnerAPI.getHallOfChampions()
       setWinners(response.data.winners)
+      setNextCursor(response.data.next_cursor)
     } catch (error) {
       console.error('Error fetching winners:', error)
     } finally {
@@ -35,6 +37,16 @@ function HallOfChampions() {
     }
   }
 
+  const loadMoreWinners = async () => {
+    try {
+      const response = await winnerAPI.getHallOfChampions({ cursor: nextCursor })
+      setWinners(current => [...current, ...response.data.winners])
+      setNextCursor(response.data.next_cursor)
+    } catch (error) {
+      console.error('Error fetching winners:', error)
+    }
+  }
+
   return (
     <div>
       <section className="hero-mini">
@@ -83,7 +95,7 @@ function HallOfChampions() {
             <CardContainer key={winner.id} className="inter-var">
               <CardBody className="big-card group-card dark:bg-black dark:border-white/[0.2] border-black/[0.1]">
                 <CardItem translateZ={100} className="w-full mt-2">
-                  <img src={(galleryImages[i % galleryImages.length]) || (winner.badge_image_url) || fallbackImg} alt="Champion Badge" className="hoc-nft" />
+                  <img src={(winner.rendered_badge_url && badgeImageUrl(winner)) || (galleryImages[i % galleryImages.length]) || (winner.badge_image_url) || fallbackImg} alt="Champion Badge" className="hoc-nft" />
                 </CardItem>
                 <CardItem translateZ={60}>
                   <h3>{winner.team_name}</h3>
@@ -106,6 +118,11 @@ function HallOfChampions() {
           ))}
         </div>
       )}
+      {!loading && nextCursor && (
+        <button type="button" className="btn btn-secondary" onClick={loadMoreWinners} style={{ marginTop: '1rem' }}>
+          Load more
+        </button>
+      )}
       </div>
 
       {/* Infinite menu directly under 3D row using gallery images */}
@@ -5,6 +5,7 @@ import { tournamentAPI } from '../services/api'
 
 function Home() {
   const [tournaments, setTournaments] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
@@ -16,6 +17,7 @@ function Home() {
       setLoading(true)
       const response = await tournamentAPI.getAvailable()
       setTournaments(response.data.tournaments)
+      setNextCursor(response.data.next_cursor)
     } catch (error) {
       console.error('Error fetching tournaments:', error)
     } finally {
@@ -23,6 +25,16 @@ function Home() {
     }
   }
 
+  const loadMoreTournaments = async () => {
+    try {
+      const response = await tournamentAPI.getAvailable({ cursor: nextCursor })
+      setTournaments(current => [...current, ...response.data.tournaments])
+      setNextCursor(response.data.next_cursor)
+    } catch (error) {
+      console.error('Error fetching tournaments:', error)
+    }
+  }
+
   return (
     <div>
       <section className="hero">
@@ -164,6 +176,11 @@ function Home() {
           ))}
         </div>
       )}
+      {!loading && nextCursor && (
+        <button type="button" className="btn btn-secondary" onClick={loadMoreTournaments} style={{ marginTop: '1rem' }}>
+          Load more
+        </button>
+      )}
       </div>
     </div>
   )
@@ -83,8 +83,14 @@ function Register() {
   const fetchTournaments = async () => {
     try {
       setLoading(true)
-      const response = await tournamentAPI.getAvailable()
-      setTournaments(response.data.tournaments)
+      // The dropdown lists every open tournament, so follow next_cursor to the last page
+      let response = await tournamentAPI.getAvailable()
+      let all = response.data.tournaments
+      while (response.data.next_cursor) {
+        response = await tournamentAPI.getAvailable({ cursor: response.data.next_cursor })
+        all = [...all, ...response.data.tournaments]
+      }
+      setTournaments(all)
     } catch (error) {
       console.error('Error fetching tournaments:', error)
     } finally {
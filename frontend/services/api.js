@@ -33,15 +33,17 @@ api.interceptors.response.use(
   }
 )
 
+// List endpoints return one page plus next_cursor; pass it back as { cursor } for the next page.
+// Filters: year, month, status, format_type, name_prefix; page size: limit
 export const tournamentAPI = {
   // Get available tournaments
-  getAvailable: () => api.get('/tournament/available'),
+  getAvailable: (params = {}) => api.get('/tournament/available', { params }),
   
   // Register a team
   registerTeam: (data) => api.post('/tournament/register', data),
   
   // Get teams for a tournament
-  getTeams: (tournamentId) => api.get(`/tournament/${tournamentId}/teams`),
+  getTeams: (tournamentId, params = {}) => api.get(`/tournament/${tournamentId}/teams`, { params }),
 }
 
 export const adminAPI = {
@@ -49,7 +51,7 @@ export const adminAPI = {
   createTournament: (data) => api.post('/admin/create-tournament', data),
   
   // List all tournaments
-  listTournaments: () => api.get('/admin/tournaments'),
+  listTournaments: (params = {}) => api.get('/admin/tournaments', { params }),
   
   // Get tournament details
   getTournament: (id) => api.get(`/admin/tournament/${id}`),
@@ -63,10 +65,15 @@ export const winnerAPI = {
   declareWinner: (data) => api.post('/winner/declare-winner', data),
   
   // Get hall of champions
-  getHallOfChampions: () => api.get('/winner/hall-of-champions'),
+  getHallOfChampions: (params = {}) => api.get('/winner/hall-of-champions', { params }),
   
   // Get wins by wallet
-  getWinsByWallet: (walletAddress) => api.get(`/winner/by-wallet/${walletAddress}`),
+  getWinsByWallet: (walletAddress, params = {}) => api.get(`/winner/by-wallet/${walletAddress}`, { params }),
+}
+
+export const searchAPI = {
+  // Ranked tournaments, teams and players by name; params: { type: 'teams,players', limit }
+  search: (q, params = {}) => api.get('/search', { params: { q, ...params } }),
 }
 
 export const nftAPI = {
@@ -77,5 +84,23 @@ export const nftAPI = {
   getNFTDetails: (winnerId) => api.get(`/nft/winner/${winnerId}`),
 }
 
+export const eventsAPI = {
+  // Open a live event stream (EventSource); filters: { tournamentId, wallet }
+  subscribe: ({ tournamentId, wallet } = {}, onEvent) => {
+    const params = new URLSearchParams()
+    if (tournamentId) params.append('tournament_id', tournamentId)
+    if (wallet) params.append('wallet', wallet)
+    const source = new EventSource(`${API_BASE_URL}/events?${params}`)
+    const types = ['match_submitted', 'winner_declared', 'mint_started', 'mint_succeeded', 'mint_failed']
+    types.forEach(type => source.addEventListener(type, (e) => onEvent(type, JSON.parse(e.data))))
+    return source
+  },
+}
+
+// A winner's rendered badge as a WebP thumbnail (sizes: BADGE_THUMBNAIL_SIZES),
+// else the tournament's badge image
+export const badgeImageUrl = (winner, size = 512) =>
+  winner.rendered_badge_url ? winner.rendered_badge_url.replace(/\.png$/, `-${size}.webp`) : winner.badge_image_url
+
 export default api
 
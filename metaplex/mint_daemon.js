@@ -0,0 +1,167 @@
+/**
+ * Metaplex Minting Daemon
+ * Long-lived sidecar for the Flask backend (see backend/mint_daemon.py)
+ *
+ * Protocol: line-delimited JSON over stdin/stdout
+ *   request:  {"id": 1, "op": "mint", "params": {...}}
+ *             {"id": 2, "op": "cancel", "params": {"id": 1}}
+ *   response: {"id": 1, "ok": true, "result": {...}}
+ *             {"id": 1, "ok": false, "error": "..."}
+ *   events:   {"event": "ready", "pid": 1234}
+ *             {"event": "stage", "id": 1, "op": "mint", "stage": "metadata_upload", "seconds": 0.42}
+ *
+ * Requests with the same params.idempotencyKey share one run: a repeat
+ * joins the run in flight, or gets its result for MINT_IDEMPOTENCY_TTL
+ * seconds after it succeeded, instead of minting again. That only covers
+ * this process; across restarts and processes a mint is deduplicated by
+ * params.mintSeed (see minter.js). `cancel` drops a request that is still
+ * waiting for a slot; a started request runs to the end.
+ *
+ * Logs go to stderr so stdout only carries protocol messages.
+ */
+
+const readline = require('readline');
+const { createMinter } = require('./minter');
+
+const rpcUrl = process.argv[2] || 'https://api.devnet.solana.com';
+const keypairPath = process.env.METAPLEX_KEYPAIR_PATH || './metaplex/keypair.json';
+const concurrency = parseInt(process.env.MINT_DAEMON_CONCURRENCY || '4', 10);
+const idempotencyTtl = parseFloat(process.env.MINT_IDEMPOTENCY_TTL || '300') * 1000;
+
+function send(message) {
+    process.stdout.write(JSON.stringify(message) + '\n');
+}
+
+function log(...parts) {
+    console.error(...parts);
+}
+
+let minter;
+try {
+    minter = createMinter({ rpcUrl, keypairPath, log });
+} catch (error) {
+    send({ event: 'fatal', error: error.message });
+    process.exit(1);
+}
+
+const ops = {
+    ping: async () => ({ pong: true }),
+    mint: (params, hooks) => minter.mint(params, hooks),
+    upload: (params, hooks) => minter.uploadFile(params, hooks),
+};
+
+// Run at most `concurrency` operations at once; the rest wait in FIFO order
+let active = 0;
+let closing = false;
+const waiting = [];
+
+function schedule(id, work) {
+    return new Promise((resolve, reject) => {
+        waiting.push({ id, reject, start: () => work().then(resolve, reject) });
+        drain();
+    });
+}
+
+function drain() {
+    while (active < concurrency && waiting.length > 0) {
+        const task = waiting.shift();
+        active += 1;
+        task.start().finally(() => {
+            active -= 1;
+            drain();
+        });
+    }
+    if (closing && active === 0 && waiting.length === 0) {
+        process.exit(0);
+    }
+}
+
+function cancel(id) {
+    const index = waiting.findIndex((task) => task.id === id);
+    if (index === -1) {
+        return { cancelled: false };
+    }
+    const [task] = waiting.splice(index, 1);
+    task.reject(new Error('Cancelled before it started'));
+    return { cancelled: true };
+}
+
+// idempotencyKey -> { promise, expires }; expires is set once the run succeeds
+const runs = new Map();
+
+function runOnce(key, work) {
+    const now = Date.now();
+    for (const [runKey, run] of runs) {
+        if (run.expires !== null && run.expires <= now) {
+            runs.delete(runKey);
+        }
+    }
+    const existing = runs.get(key);
+    if (existing) {
+        return existing.promise;
+    }
+    const run = { expires: null };
+    run.promise = work().then(
+        (result) => {
+            run.expires = Date.now() + idempotencyTtl;
+            return result;
+        },
+        (error) => {
+            runs.delete(key);
+            throw error;
+        }
+    );
+    runs.set(key, run);
+    return run.promise;
+}
+
+async function handle(request) {
+    if (request.op === 'cancel') {
+        send({ id: request.id, ok: true, result: cancel((request.params || {}).id) });
+        return;
+    }
+    const op = ops[request.op];
+    if (!op) {
+        send({ id: request.id, ok: false, error: `Unknown op: ${request.op}` });
+        return;
+    }
+    // Stage timings go out as events as they finish, ahead of the response
+    const onStage = (stage, seconds) => send({ event: 'stage', id: request.id, op: request.op, stage, seconds });
+    const params = request.params || {};
+    const work = () => schedule(request.id, () => op(params, { onStage }));
+    try {
+        const result = await (params.idempotencyKey ? runOnce(`${request.op}:${params.idempotencyKey}`, work) : work());
+        send({ id: request.id, ok: true, result });
+    } catch (error) {
+        log(`Error in ${request.op}:`, error.message);
+        send({ id: request.id, ok: false, error: error.message });
+    }
+}
+
+const rl = readline.createInterface({ input: process.stdin });
+
+rl.on('line', (line) => {
+    if (!line.trim()) {
+        return;
+    }
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (error) {
+        send({ id: null, ok: false, error: 'Invalid JSON request' });
+        return;
+    }
+    handle(request);
+});
+
+// Parent closed stdin: finish in-flight work, then exit
+rl.on('close', () => {
+    closing = true;
+    drain();
+});
+
+process.on('unhandledRejection', (error) => {
+    log('Unhandled rejection:', error && error.message ? error.message : error);
+});
+
+send({ event: 'ready', pid: process.pid });
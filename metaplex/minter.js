@@ -0,0 +1,187 @@
+/**
+ * Metaplex Minter
+ * Shared by the one-shot CLI (mint_nft.js) and the long-lived daemon (mint_daemon.js)
+ */
+
+const { Connection, Keypair, PublicKey } = require('@solana/web3.js');
+const { Metaplex, keypairIdentity, bundlrStorage, toMetaplexFile } = require('@metaplex-foundation/js');
+const fs = require('fs');
+const https = require('https');
+const http = require('http');
+
+function downloadImage(imageUrl) {
+    return new Promise((resolve, reject) => {
+        const protocol = imageUrl.startsWith('https') ? https : http;
+        protocol.get(imageUrl, (response) => {
+            const data = [];
+            response.on('data', (chunk) => data.push(chunk));
+            response.on('end', () => resolve(Buffer.concat(data)));
+            response.on('error', reject);
+        }).on('error', reject);
+    });
+}
+
+/**
+ * Time one stage of a mint and report it through onStage(stage, seconds).
+ * Failed stages are not reported, so timings only describe work that finished.
+ */
+async function timed(onStage, stage, work) {
+    const start = process.hrtime.bigint();
+    const result = await work();
+    if (onStage) {
+        onStage(stage, Number(process.hrtime.bigint() - start) / 1e9);
+    }
+    return result;
+}
+
+/**
+ * Build a minter bound to one connection, identity and Bundlr storage driver.
+ * Everything expensive happens once here, not per mint.
+ *
+ * @param {object} options
+ * @param {string} options.rpcUrl Solana RPC endpoint
+ * @param {string} options.keypairPath Path to the mint authority keypair
+ * @param {function} options.log Logger for progress messages
+ */
+function createMinter({ rpcUrl, keypairPath, log = console.log }) {
+    // Load wallet keypair for mint authority
+    const secretKey = JSON.parse(fs.readFileSync(keypairPath));
+    const wallet = Keypair.fromSecretKey(new Uint8Array(secretKey));
+
+    // Establish connection
+    const connection = new Connection(rpcUrl, 'confirmed');
+
+    const metaplex = Metaplex.make(connection)
+        .use(keypairIdentity(wallet))
+        .use(bundlrStorage({
+            address: 'https://devnet.bundlr.network',
+            providerUrl: rpcUrl,
+            timeout: 60000,
+        }));
+
+    async function uploadImage(imageUrl) {
+        // Download and upload image to Arweave
+        if (!imageUrl || imageUrl.startsWith('http://localhost') || imageUrl.includes('arweave.net') || imageUrl.includes('ipfs.io')) {
+            return imageUrl;
+        }
+        log('Uploading image to Arweave for permanent storage...');
+        try {
+            const buffer = await downloadImage(imageUrl);
+            const metaplexFile = toMetaplexFile(buffer, 'image.png');
+            const imageUri = await metaplex.storage().upload(metaplexFile);
+            log('Image uploaded to Arweave:', imageUri);
+            return imageUri;
+        } catch (imageError) {
+            log('Failed to upload image, using original URL:', imageError.message);
+            // Fall back to original URL
+            return imageUrl;
+        }
+    }
+
+    /**
+     * Upload raw file bytes to Arweave (used by the backend's badge upload cache).
+     *
+     * @param {object} hooks
+     * @param {function} hooks.onStage Receives (stage, seconds) as each stage finishes
+     * @returns {Promise<{uri: string}>}
+     */
+    async function uploadFile({ data, fileName = 'image.png', contentType }, { onStage } = {}) {
+        const buffer = Buffer.from(data, 'base64');
+        const metaplexFile = toMetaplexFile(buffer, fileName, contentType ? { contentType } : {});
+        const uri = await timed(onStage, 'image_upload', () => metaplex.storage().upload(metaplexFile));
+        log('File uploaded to Arweave:', uri);
+        return { uri };
+    }
+
+    /**
+     * Find the NFT an earlier attempt already minted at mintKeypair's address, if any.
+     */
+    async function findMinted(mintKeypair) {
+        try {
+            return await metaplex.nfts().findByMint({ mintAddress: mintKeypair.publicKey, loadJsonMetadata: false });
+        } catch (error) {
+            if (error.name === 'AccountNotFoundError') {
+                return null;
+            }
+            throw error;
+        }
+    }
+
+    /**
+     * Upload image and metadata, then mint the NFT to the recipient.
+     *
+     * Stages reported through hooks.onStage: image_upload (skipped when the
+     * backend passes imageUri), metadata_upload, create (sent and processed)
+     * and confirm (processed until confirmed).
+     *
+     * mintSeed (hex, 32 bytes) derives the mint account's keypair. The backend
+     * keeps it across retries of one winner's mint, so a retry first looks for
+     * the NFT at that address and returns it rather than minting a second one.
+     *
+     * @param {object} hooks
+     * @param {function} hooks.onStage Receives (stage, seconds) as each stage finishes
+     * @returns {Promise<{tokenId: string, metadataUri: string, imageUri: string, signature: string}>}
+     */
+    async function mint({ recipientWallet, name, description, imageUrl, imageUri, attributes = [], mintSeed }, { onStage } = {}) {
+        const mintKeypair = mintSeed ? Keypair.fromSeed(Buffer.from(mintSeed, 'hex')) : undefined;
+        if (mintKeypair) {
+            const existing = await findMinted(mintKeypair);
+            if (existing) {
+                log('NFT already minted by an earlier attempt:', existing.address.toString());
+                return {
+                    tokenId: existing.address.toString(),
+                    metadataUri: existing.uri,
+                    imageUri: imageUri || imageUrl,
+                    signature: '',
+                };
+            }
+        }
+
+        // imageUri is an image the backend already uploaded; skip the download and upload
+        const finalImageUrl = imageUri || await timed(onStage, 'image_upload', () => uploadImage(imageUrl));
+
+        // Create metadata
+        const metadata = {
+            name: name,
+            description: description,
+            image: finalImageUrl,
+            attributes: attributes,
+        };
+
+        // Upload metadata to Arweave via Bundlr
+        log('Uploading metadata...');
+        const { uri: metadataUri } = await timed(onStage, 'metadata_upload', () => metaplex.nfts().uploadMetadata(metadata));
+        log('Metadata URI:', metadataUri);
+
+        // Mint NFT to recipient
+        log('Minting NFT...');
+        // Send and wait for "processed" only, so on-chain creation and confirmation are timed separately
+        const { nft, response } = await timed(onStage, 'create', () => metaplex.nfts().create({
+            uri: metadataUri,
+            name: name,
+            sellerFeeBasisPoints: 0, // No royalties for tournament badges
+            tokenOwner: new PublicKey(recipientWallet),
+            collection: null,
+            useNewMint: mintKeypair,
+        }, { commitment: 'processed', confirmOptions: { commitment: 'processed' } }));
+        await timed(onStage, 'confirm', () => metaplex.rpc().confirmTransaction(
+            response.signature,
+            { blockhash: response.blockhash, lastValidBlockHeight: response.lastValidBlockHeight },
+            'confirmed'
+        ));
+
+        log('NFT minted successfully!');
+        log('Token address:', nft.address.toString());
+
+        return {
+            tokenId: nft.address.toString(),
+            metadataUri: metadataUri,
+            imageUri: finalImageUrl,
+            signature: response && response.signature ? response.signature : '',
+        };
+    }
+
+    return { connection, metaplex, wallet, mint, uploadImage, uploadFile };
+}
+
+module.exports = { createMinter, downloadImage };
@@ -4,17 +4,28 @@ Setup script to initialize the database
 Run this to create all necessary tables
 """
 from backend.app import create_app, db
-from backend.models import Tournament, Team, Match, Winner
+from backend.models import Tournament, Team, Match, Winner, MintJob, BadgeUpload
+from backend.schema import MIGRATIONS_DIRECTORY
+from flask_migrate import Migrate, stamp
 
 app = create_app()
+Migrate(app, db, directory=MIGRATIONS_DIRECTORY)
 
 with app.app_context():
     print("Creating database tables...")
     db.create_all()
+    # Mark the new schema as current, so DB_SCHEMA_MODE=check accepts it
+    stamp()
     print("✓ Database tables created successfully!")
     print("\nTables created:")
     print("  - tournaments")
     print("  - teams")
+    print("  - team_players")
     print("  - matches")
     print("  - winners")
+    print("  - mint_jobs")
+    print("  - badge_uploads")
+    print("  - standings")
+    print("  - cache_versions")
+    print("  - nft_holders")
 
@@ -0,0 +1,79 @@
+"""
+Test fixtures
+Each test gets its own app on fresh SQLite files. Background work (mint
+workers, reconciliation, holder indexing, pre-warm, badge rendering) and
+the response cache are off, so tests only see the queries of the request
+they make.
+"""
+from datetime import datetime
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TEST_ENVIRONMENT = {
+    'MINT_WORKER_CONCURRENCY': '0',
+    'MINT_RECONCILE_INTERVAL': '0',
+    'HOLDER_INDEX_INTERVAL': '0',
+    'MINT_PREWARM': 'false',
+    'SEARCH_PREWARM': 'false',
+    'BADGE_RENDER_ENABLED': 'false',
+    'CACHE_BACKEND': 'none',
+    'DB_SCHEMA_MODE': 'create',
+    'DATABASE_REPLICA_URL': ''
+}
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """
+    Build an app from environment overrides
+
+    Returns:
+        callable: make_app(**env) -> Flask app on tmp_path/app.db unless DATABASE_URL is given
+    """
+    def make(**env):
+        from backend.app import create_app
+        settings = {**TEST_ENVIRONMENT, 'DATABASE_URL': f"sqlite:///{tmp_path / 'app.db'}", **env}
+        for key, value in settings.items():
+            monkeypatch.setenv(key, str(value))
+        return create_app()
+    return make
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def add_tournaments(count, winners=True, teams_per_tournament=2, name='Intramural League'):
+    """
+    Insert tournaments with their teams and, optionally, a champion each (caller is in an app context)
+
+    Returns:
+        list: IDs of the new tournaments
+    """
+    from backend.app import db
+    from backend.models import Team, Tournament, Winner
+
+    tournament_ids = []
+    for i in range(count):
+        tournament = Tournament(name=name, tournament_name=f'Cup {i}', format_type='knockout', month='June',
+                                year=2024, badge_image_url='', badge_metadata_url='',
+                                status='completed' if winners else 'open')
+        db.session.add(tournament)
+        db.session.flush()
+        teams = [Team(tournament_id=tournament.id, team_name=f'Team {i}-{t}', captain_wallet_address=f'wallet{i}-{t}')
+                 for t in range(teams_per_tournament)]
+        db.session.add_all(teams)
+        db.session.flush()
+        if winners:
+            db.session.add(Winner(tournament_id=tournament.id, team_id=teams[0].id,
+                                  wallet_address=teams[0].captain_wallet_address, created_at=datetime.utcnow()))
+        tournament_ids.append(tournament.id)
+    db.session.commit()
+    return tournament_ids
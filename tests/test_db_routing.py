@@ -0,0 +1,79 @@
+"""
+Read replica routing with the primary and the replica on separate SQLite files
+
+Both files get the same schema, then different rows, so each response
+shows which database served it.
+"""
+import shutil
+import time
+
+import pytest
+
+from tests.conftest import add_tournaments
+
+@pytest.fixture
+def routed_app(make_app, tmp_path):
+    from backend.app import db
+    from backend.db_routing import REPLICA_BIND
+    from backend.models import Tournament
+    from sqlalchemy import insert
+
+    replica_path = tmp_path / 'replica.db'
+    app = make_app(DATABASE_REPLICA_URL=f'sqlite:///{replica_path}', DB_REPLICA_STICKY_SECONDS='60')
+    with app.app_context():
+        db.engine.dispose()
+        shutil.copy(tmp_path / 'app.db', replica_path)
+        add_tournaments(1, winners=False, name='Primary League')
+        with db.engines[REPLICA_BIND].begin() as conn:
+            conn.execute(insert(Tournament), [{
+                'name': 'Replica League', 'tournament_name': 'Cup', 'format_type': 'knockout', 'month': 'June',
+                'year': 2024, 'badge_image_url': '', 'badge_metadata_url': '', 'status': 'open'
+            }])
+    yield app
+    # init_app registered a metadata for the bind on the shared db; later apps have no replica
+    db.metadatas.pop(REPLICA_BIND, None)
+
+def available_names(client):
+    response = client.get('/api/tournament/available')
+    assert response.status_code == 200, response.get_json()
+    return sorted(t['name'] for t in response.get_json()['tournaments'])
+
+def create_tournament(client, name):
+    response = client.post('/api/admin/create-tournament', json={
+        'name': name, 'tournament_name': 'Cup', 'format_type': 'knockout', 'month': 'July', 'year': 2024
+    })
+    assert response.status_code == 201, response.get_json()
+    return response
+
+def tournament_names(app, bind=None):
+    from backend.app import db
+    from backend.models import Tournament
+    from sqlalchemy import select
+
+    with app.app_context():
+        engine = db.engines[bind] if bind else db.engine
+        with engine.connect() as conn:
+            return sorted(conn.execute(select(Tournament.name)).scalars())
+
+def test_reads_go_to_the_replica(routed_app):
+    assert available_names(routed_app.test_client()) == ['Replica League']
+
+def test_writes_go_to_the_primary(routed_app):
+    from backend.db_routing import REPLICA_BIND
+
+    create_tournament(routed_app.test_client(), 'New League')
+    assert tournament_names(routed_app) == ['New League', 'Primary League']
+    assert tournament_names(routed_app, REPLICA_BIND) == ['Replica League']
+
+def test_reads_after_a_write_stay_on_the_primary(routed_app):
+    from backend.db_routing import PRIMARY_COOKIE
+
+    client = routed_app.test_client()
+    response = create_tournament(client, 'New League')
+    assert PRIMARY_COOKIE in response.headers.get('Set-Cookie', '')
+    assert available_names(client) == ['New League', 'Primary League']
+
+    # Other clients, and this one once the window has passed, read the replica again
+    assert available_names(routed_app.test_client()) == ['Replica League']
+    client.set_cookie(PRIMARY_COOKIE, str(time.time() - 1))
+    assert available_names(client) == ['Replica League']
@@ -0,0 +1,49 @@
+"""List endpoints run a fixed number of statements however many rows they return"""
+from sqlalchemy import event
+import pytest
+
+from tests.conftest import add_tournaments
+
+LIST_ROUTES = [
+    ('/api/admin/tournaments', 'tournaments'),
+    ('/api/tournament/available', 'tournaments'),
+    ('/api/winner/hall-of-champions', 'winners'),
+    ('/api/winner/by-wallet/wallet0-0', 'wins')
+]
+
+def count_statements(app, client, path):
+    """
+    Returns:
+        tuple: (statements executed, response JSON)
+    """
+    from backend.app import db
+
+    statements = []
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+    assert response.status_code == 200, response.get_json()
+    return len(statements), response.get_json()
+
+@pytest.mark.parametrize('path,key', LIST_ROUTES)
+def test_list_statement_count_does_not_grow_with_rows(app, client, path, key):
+    open_tournaments = path == '/api/tournament/available'
+    with app.app_context():
+        add_tournaments(2, winners=not open_tournaments)
+    few, body = count_statements(app, client, path)
+    rows_few = len(body[key])
+
+    with app.app_context():
+        # One at a time: every batch's first champion has wallet0-0, so by-wallet grows too
+        for _ in range(20):
+            add_tournaments(1, winners=not open_tournaments)
+    many, body = count_statements(app, client, path)
+
+    assert len(body[key]) > rows_few
+    assert many == few
@@ -0,0 +1,87 @@
+"""
+Lookup paths use the indexes the migrations create
+
+The schema is built by running every Alembic migration on an empty SQLite
+file (not create_all), then the SQL each lookup actually runs is captured
+and passed to EXPLAIN QUERY PLAN.
+"""
+from sqlalchemy import event
+import pytest
+
+from tests.conftest import add_tournaments
+
+@pytest.fixture
+def migrated_app(make_app):
+    from backend.app import db
+    from backend.schema import MIGRATIONS_DIRECTORY
+    from flask_migrate import Migrate, upgrade
+
+    app = make_app(DB_SCHEMA_MODE='skip')
+    Migrate(app, db, directory=MIGRATIONS_DIRECTORY)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIRECTORY)
+        add_tournaments(3)
+        add_tournaments(2, winners=False)
+    return app
+
+def query_plan(app, run):
+    """
+    Run a callable and explain every SELECT it executed
+
+    Returns:
+        str: Plan details of all statements, one per line
+    """
+    from backend.app import db
+
+    statements = []
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'cache_versions' not in statement:
+            statements.append((statement, parameters))
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+
+    assert statements, 'nothing was queried'
+    with engine.connect() as conn:
+        return '\n'.join(row[-1] for statement, parameters in statements
+                         for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters))
+
+@pytest.mark.parametrize('path,indexes', [
+    ('/api/winner/by-wallet/wallet0-0', ['ix_winners_wallet_address', 'ix_nft_holders_owner_wallet']),
+    ('/api/tournament/1/teams', ['ix_teams_tournament_id_id']),
+    ('/api/tournament/1/standings', ['ix_teams_tournament_id_id']),
+    ('/api/tournament/available', ['ix_tournaments_status_id']),
+    ('/api/admin/tournaments?year=2024', ['ix_tournaments_year_month'])
+])
+def test_route_uses_index(migrated_app, path, indexes):
+    client = migrated_app.test_client()
+    plan = query_plan(migrated_app, lambda: client.get(path))
+    for index in indexes:
+        assert f'INDEX {index} ' in plan, plan
+
+def test_hall_of_champions_pages_without_sorting(migrated_app):
+    client = migrated_app.test_client()
+    plan = query_plan(migrated_app, lambda: client.get('/api/winner/hall-of-champions'))
+    assert 'TEMP B-TREE' not in plan, plan
+
+def test_mint_claim_uses_status_index(migrated_app):
+    from backend.mint_queue import get_mint_queue
+
+    with migrated_app.app_context():
+        plan = query_plan(migrated_app, get_mint_queue().claim)
+    assert 'INDEX ix_mint_jobs_status_available_at ' in plan, plan
+
+def test_standings_rebuild_uses_match_index(migrated_app):
+    from backend.app import db
+    from backend.standings import rebuild_standings
+
+    def rebuild():
+        rebuild_standings(1)
+        db.session.rollback()
+    with migrated_app.app_context():
+        plan = query_plan(migrated_app, rebuild)
+    assert 'INDEX ix_matches_tournament_id_round ' in plan, plan
@@ -9,6 +9,10 @@ export default defineConfig({
       '/api': {
         target: 'http://localhost:5001',
         changeOrigin: true
+      },
+      '/badges': {
+        target: 'http://localhost:5001',
+        changeOrigin: true
       }
     }
   }